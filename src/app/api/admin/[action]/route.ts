@@ -0,0 +1,44 @@
+export const dynamic = "force-dynamic";
+export const runtime = "nodejs";
+
+import { NextRequest, NextResponse } from "next/server";
+
+const CHAT_URL = process.env.PY_BACKEND_URL ?? "http://127.0.0.1:8001/chat";
+const API_BASE = CHAT_URL.replace(/\/chat\/?$/, "");
+
+const ACTIONS = new Set(["approve", "reject"]);
+
+// Bulk review: body { ids?, filter?: { source?, tier?, tag? }, verify? }.
+export async function POST(
+  req: NextRequest,
+  { params }: { params: Promise<{ action: string }> }
+) {
+  const { action } = await params;
+  if (!ACTIONS.has(action)) {
+    return NextResponse.json({ error: "Unknown action" }, { status: 404 });
+  }
+
+  const key = req.headers.get("x-admin-key");
+  if (!key) {
+    return NextResponse.json({ error: "Missing admin key" }, { status: 401 });
+  }
+
+  const body = await req.json().catch(() => null);
+  if (!body || typeof body !== "object") {
+    return NextResponse.json({ error: "Invalid JSON body" }, { status: 400 });
+  }
+
+  try {
+    const r = await fetch(`${API_BASE}/admin/${action}`, {
+      method: "POST",
+      headers: { "x-admin-key": key, "content-type": "application/json" },
+      body: JSON.stringify(body),
+      cache: "no-store",
+      signal: AbortSignal.timeout(30000),
+    });
+    const data = await r.json().catch(() => ({ error: "Bad response from backend" }));
+    return NextResponse.json(data, { status: r.status });
+  } catch {
+    return NextResponse.json({ error: "Backend unreachable" }, { status: 502 });
+  }
+}
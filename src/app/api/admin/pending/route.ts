@@ -7,14 +7,24 @@ import { NextRequest, NextResponse } from "next/server";
 const CHAT_URL = process.env.PY_BACKEND_URL ?? "http://127.0.0.1:8001/chat";
 const API_BASE = CHAT_URL.replace(/\/chat\/?$/, "");
 
+// Paging and filters the backend understands; anything else is dropped.
+const QUERY_PARAMS = ["limit", "cursor", "source", "tier", "tag"];
+
 export async function GET(req: NextRequest) {
   const key = req.headers.get("x-admin-key");
   if (!key) {
     return NextResponse.json({ error: "Missing admin key" }, { status: 401 });
   }
 
+  const query = new URLSearchParams();
+  for (const name of QUERY_PARAMS) {
+    const value = req.nextUrl.searchParams.get(name);
+    if (value) query.set(name, value);
+  }
+  const qs = query.toString();
+
   try {
-    const r = await fetch(`${API_BASE}/admin/pending`, {
+    const r = await fetch(`${API_BASE}/admin/pending${qs ? `?${qs}` : ""}`, {
       headers: { "x-admin-key": key },
       cache: "no-store",
       signal: AbortSignal.timeout(15000),
@@ -1,14 +1,20 @@
 # agent.py — Simplified CCNY Student Support Agent
 # Single LLM call with pre-curated static context
+#
+# langchain is imported inside Agent, not here: importing this module (the
+# server does, for the closing/residency patterns) must stay cheap.
 
 from __future__ import annotations
 import re
 import json
-from typing import Optional, List, Dict, Any
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional, List, Dict, Any
 from dataclasses import dataclass, field
 
-from langchain_openai import ChatOpenAI
-from langchain_core.messages import HumanMessage, SystemMessage
+from pydantic import BaseModel
+
+if TYPE_CHECKING:
+    from langchain_core.messages import SystemMessage
 
 
 # ---------- Response Models ----------
@@ -26,6 +32,19 @@ class ResourceCard:
     deadline: Optional[str] = None
     authority: Optional[str] = None
 
+class StructuredCard(BaseModel):
+    """A card as the LLM returns it via structured output (see Agent.arun)."""
+    name: str
+    url: str
+    category: str = "benefit"
+    authority: Optional[str] = None
+    deadline: Optional[str] = None
+    why: Optional[str] = None
+
+class StructuredAnswer(BaseModel):
+    answer: str
+    cards: List[StructuredCard]
+
 @dataclass
 class AgentResponse:
     """Response from the agent - either an answer or a clarifying question."""
@@ -213,12 +232,27 @@ Respond in this JSON format:
 
 Return 3-6 relevant resource cards. Prioritize CCNY resources first, then CUNY-wide, then external."""
 
+@lru_cache(maxsize=None)
+def _system_message() -> SystemMessage:
+    from langchain_core.messages import SystemMessage
+
+    return SystemMessage(content=SYSTEM_PROMPT)
+
+# Per-school prompt parts, built once at import: (static context, default cards).
+SCHOOL_PROMPTS = {
+    "ccny": (build_context("ccny"), DEFAULT_CARDS_CCNY),
+    "general": (build_context(None), DEFAULT_CARDS_GENERAL),
+}
+
 
 class Agent:
     """Simple CCNY Student Support Agent with single LLM call."""
     
     def __init__(self):
+        from langchain_openai import ChatOpenAI
+
         self.llm = ChatOpenAI(model="gpt-5.2", temperature=0.1)
+        self.structured_llm = self.llm.with_structured_output(StructuredAnswer)
     
     def needs_residency_check(self, query: str, profile: Optional[Dict[str, Any]] = None) -> bool:
         """Check if user appears undocumented but hasn't mentioned tuition status."""
@@ -232,23 +266,15 @@ class Agent:
         """Check if user is just wrapping up the conversation (thanks, goodbye, etc.)."""
         return bool(CLOSING_PHRASES.match(query.strip()))
     
-    def run(
+    def _prepare(
         self,
         query: str,
-        has_instate: Optional[bool] = None,
-        school_code: Optional[str] = None,
-        profile: Optional[Dict[str, Any]] = None,
-    ) -> AgentResponse:
-        """
-        Process a user query and return a response.
-        
-        Args:
-            query: The user's question
-            has_instate: If known, whether user already has in-state tuition
-        
-        Returns:
-            AgentResponse with answer text, sources, and resource cards
-        """
+        has_instate: Optional[bool],
+        school_code: Optional[str],
+        profile: Optional[Dict[str, Any]],
+    ) -> AgentResponse | tuple[list, List[ResourceCard]]:
+        """Everything before the LLM call, shared by run and arun: either a
+        finished response (closing, residency ask) or (messages, default cards)."""
         # Handle conversational closures - no resources needed
         if self.is_conversational_closing(query):
             return AgentResponse(
@@ -272,8 +298,7 @@ class Agent:
             )
         
         # Build the prompt with context
-        context = build_context(school_key)
-        default_cards = DEFAULT_CARDS_CCNY if school_key == "ccny" else DEFAULT_CARDS_GENERAL
+        context, default_cards = SCHOOL_PROMPTS["ccny" if school_key == "ccny" else "general"]
         context_note = ""
         if has_instate is True:
             context_note = "\n\nNote: User confirms they already have in-state tuition. Focus on scholarships and financial aid."
@@ -303,20 +328,86 @@ User question: {query}{context_note}
 
 Provide a helpful response with relevant resource cards."""
 
+        from langchain_core.messages import HumanMessage
+
+        return [_system_message(), HumanMessage(content=user_message)], default_cards
+
+    def run(
+        self,
+        query: str,
+        has_instate: Optional[bool] = None,
+        school_code: Optional[str] = None,
+        profile: Optional[Dict[str, Any]] = None,
+    ) -> AgentResponse:
+        """
+        Process a user query and return a response.
+        
+        Args:
+            query: The user's question
+            has_instate: If known, whether user already has in-state tuition
+        
+        Returns:
+            AgentResponse with answer text, sources, and resource cards
+        """
+        prepared = self._prepare(query, has_instate, school_code, profile)
+        if isinstance(prepared, AgentResponse):
+            return prepared
+        messages, default_cards = prepared
+
         try:
-            response = self.llm.invoke([
-                SystemMessage(content=SYSTEM_PROMPT),
-                HumanMessage(content=user_message)
-            ])
+            response = self.llm.invoke(messages)
             
             return self._parse_response(response.content or "", default_cards)
         except Exception as e:
             # Fallback response if LLM fails
-            return AgentResponse(
-                text="I'm having trouble connecting right now. Here are key resources to get started:",
-                sources=[SourceLink(url=c.url, title=c.name) for c in default_cards],
-                cards=default_cards
+            return self._fallback(default_cards)
+
+    async def arun(
+        self,
+        query: str,
+        has_instate: Optional[bool] = None,
+        school_code: Optional[str] = None,
+        profile: Optional[Dict[str, Any]] = None,
+    ) -> AgentResponse:
+        """
+        Async version of run for the server: awaits the LLM instead of holding
+        a thread, and uses structured output instead of parsing JSON from text.
+        """
+        prepared = self._prepare(query, has_instate, school_code, profile)
+        if isinstance(prepared, AgentResponse):
+            return prepared
+        messages, default_cards = prepared
+
+        try:
+            result = await self.structured_llm.ainvoke(messages)
+            return self._from_structured(result, default_cards)
+        except Exception:
+            return self._fallback(default_cards)
+
+    def _fallback(self, default_cards: List[ResourceCard]) -> AgentResponse:
+        return AgentResponse(
+            text="I'm having trouble connecting right now. Here are key resources to get started:",
+            sources=[SourceLink(url=c.url, title=c.name) for c in default_cards],
+            cards=default_cards
+        )
+
+    def _from_structured(self, result: StructuredAnswer, default_cards: List[ResourceCard]) -> AgentResponse:
+        """Same card rules as _parse_response: at most 6, defaults if none."""
+        cards = [
+            ResourceCard(
+                name=c.name, url=c.url, category=c.category,
+                authority=c.authority, deadline=c.deadline, why=c.why,
             )
+            for c in result.cards[:6]
+            if c.name and c.url
+        ]
+        if not cards:
+            cards = default_cards
+        return AgentResponse(
+            text=result.answer,
+            sources=[SourceLink(url=c.url, title=c.name) for c in cards],
+            cards=cards,
+        )
     
     def _parse_response(self, content: str, default_cards: List[ResourceCard]) -> AgentResponse:
         """Parse LLM response into structured AgentResponse."""
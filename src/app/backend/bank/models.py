@@ -27,3 +27,25 @@ class Resource(BaseModel):
     added_by: str = "seed"
     created_at: datetime
     updated_at: datetime
+
+
+class PendingResource(BaseModel):
+    """The review queue's list-view projection: no verification jsonb, no
+    timestamps the console doesn't show."""
+
+    id: UUID
+    name: str
+    description: str | None = None
+    url: str
+    category: str = "benefit"
+    authority: str | None = None
+    source_tier: int = 2
+    tags: list[str] = []
+    added_by: str = "seed"
+    created_at: datetime
+
+
+class PendingPage(BaseModel):
+    items: list[PendingResource]
+    next_cursor: str | None = None
+    total_estimate: int
@@ -0,0 +1,56 @@
+# bank/ranking.py — the serving order for tag retrieval, as one score.
+#
+# A row scores for every routed tag it carries, loses a step per source tier
+# and gains a little for being recent. Rows with no routed tag still score, so
+# one query returns the tag matches first and backfills with the rest of the
+# servable set (instead of a tagged query, then an untagged one when it came
+# back empty). With the default weights the order is lexicographic: overlap
+# count, then tier, then recency. repository.ranked_resources computes the
+# same score in SQL; this is the in-memory twin the snapshot uses. Pure code.
+
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Iterable
+
+from bank.models import Resource
+
+
+@dataclass(frozen=True)
+class RankWeights:
+    overlap: float = 10.0          # x routed tags the row carries
+    tier: float = 1.0              # x source_tier (0 official ... 2 web-discovered), subtracted
+    recency: float = 0.5           # x 0.5 ** (age in days / half_life_days)
+    half_life_days: float = 180.0
+
+
+def score(
+    r: Resource, tags: list[str] | None, weights: RankWeights, now: datetime
+) -> float:
+    overlap = len(set(tags or ()) & set(r.tags))
+    age_days = max(0.0, (now - r.created_at).total_seconds() / 86400)
+    return (
+        weights.overlap * overlap
+        - weights.tier * r.source_tier
+        + weights.recency * 0.5 ** (age_days / weights.half_life_days)
+    )
+
+
+def rank(
+    rows: Iterable[Resource],
+    tags: list[str] | None,
+    limit: int,
+    weights: RankWeights = RankWeights(),
+    now: datetime | None = None,
+) -> list[Resource]:
+    """Top `limit` rows by score; ties in serving order (tier, newest, id)."""
+    now = now or datetime.now(timezone.utc)
+    return heapq.nsmallest(
+        limit,
+        rows,
+        key=lambda r: (
+            -score(r, tags, weights, now), r.source_tier, -r.created_at.timestamp(), str(r.id)
+        ),
+    )
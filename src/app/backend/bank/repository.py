@@ -3,16 +3,31 @@
 
 from __future__ import annotations
 
+import asyncio
+import base64
+import binascii
 import json
 from datetime import date, datetime
 from uuid import UUID
 
 import asyncpg
 
-from bank.models import Resource
+from bank.models import PendingResource, Resource
+from bank.ranking import RankWeights
+from bank.snapshot import ResourceSnapshot
 
 _pool: asyncpg.Pool | None = None
 
+# Serving snapshot (see bank/snapshot.py). _listener is a dedicated
+# connection outside the pool because LISTEN holds it for the process lifetime.
+SNAPSHOT_CHANNEL = "resource_bank_changed"
+SNAPSHOT_RETRY_SECONDS = 30
+_snapshot: ResourceSnapshot | None = None
+_snapshot_dsn: str | None = None
+_listener: asyncpg.Connection | None = None
+_snapshot_lock = asyncio.Lock()
+_snapshot_tasks: set[asyncio.Task] = set()
+
 
 async def _init_connection(conn: asyncpg.Connection) -> None:
     # jsonb round-trips as dicts instead of strings.
@@ -38,6 +53,7 @@ async def init_pool(dsn: str) -> None:
 
 async def close_pool() -> None:
     global _pool
+    await stop_snapshot()
     if _pool is not None:
         await _pool.close()
         _pool = None
@@ -47,6 +63,17 @@ def pool_ready() -> bool:
     return _pool is not None
 
 
+def pool_stats() -> dict:
+    """Connection counts for /metrics; empty while the pool is down."""
+    if _pool is None:
+        return {}
+    return {
+        "size": _pool.get_size(),
+        "idle": _pool.get_idle_size(),
+        "max": _pool.get_max_size(),
+    }
+
+
 _COLUMNS = (
     "id, name, description, url, category, authority, source_tier, tags, "
     "deadline, deadline_type, status, last_verified_at, verification, "
@@ -82,7 +109,10 @@ async def get_active_resources(
 
     && is array overlap; the `is null or` makes the tag filter optional.
     $1/$2/$3 are parameterized placeholders — user input never lands in SQL.
+    The servable set is answered from the in-memory snapshot when it is live.
     """
+    if _snapshot is not None and tuple(status_in) == ("valid",):
+        return _snapshot.query(tags, limit)
     sql = f"""
         select {_COLUMNS} from resource_bank
         where status = any($1)
@@ -96,6 +126,181 @@ async def get_active_resources(
     return [_to_resource(r) for r in rows]
 
 
+async def ranked_resources(
+    tags: list[str] | None = None,
+    limit: int = 8,
+    weights: RankWeights = RankWeights(),
+) -> list[Resource]:
+    """The top `limit` servable rows by bank/ranking.py's score: rows sharing
+    the most routed tags first, backfilled with the rest of the servable set,
+    all in one round trip (or none, from the snapshot). The servable set is
+    small, so scoring every valid row is cheaper than a second query."""
+    if _snapshot is not None:
+        return _snapshot.ranked(tags, limit, weights)
+    sql = f"""
+        select {_COLUMNS} from resource_bank
+        where status = 'valid'
+          and nullif(trim(url), '') is not null
+        order by
+            $2::float8 * (select count(distinct t) from unnest(tags) t where t = any($1::text[]))
+            - $3::float8 * source_tier
+            + $4::float8 * power(
+                0.5::float8,
+                greatest(0, extract(epoch from now() - created_at)::float8) / 86400 / $5::float8
+              )
+            desc,
+            source_tier asc, created_at desc, id asc
+        limit $6
+    """
+    async with _pool.acquire() as conn:
+        rows = await conn.fetch(
+            sql, tags, weights.overlap, weights.tier, weights.recency,
+            weights.half_life_days, limit,
+        )
+    return [_to_resource(r) for r in rows]
+
+
+async def hybrid_candidates(
+    embedding: list[float], tags: list[str] | None = None, k: int = 24
+) -> list[tuple[Resource, float | None]]:
+    """Servable rows that are either among the k nearest to the query
+    embedding or share a tag with it, each with its cosine distance (None for
+    rows not embedded yet). Ranking is serving's job (serving/hybrid.py)."""
+    sql = f"""
+        with candidates as (
+            (select id from resource_bank
+              where status = 'valid' and embedding is not null
+              order by embedding <=> $1
+              limit $3)
+            union
+            (select id from resource_bank
+              where status = 'valid' and $2::text[] is not null and tags && $2
+              order by source_tier asc, created_at desc
+              limit $3)
+        )
+        select {_COLUMNS}, embedding <=> $1 as distance
+        from resource_bank join candidates using (id)
+        where nullif(trim(url), '') is not null
+    """
+    async with _pool.acquire() as conn:
+        rows = await conn.fetch(sql, embedding, tags, k)
+    return [
+        (Resource(**{key: row[key] for key in row.keys() if key != "distance"}), row["distance"])
+        for row in rows
+    ]
+
+
+async def _fetch_servable() -> list[Resource]:
+    sql = f"""
+        select {_COLUMNS} from resource_bank
+        where status = 'valid' and nullif(trim(url), '') is not null
+    """
+    async with _pool.acquire() as conn:
+        rows = await conn.fetch(sql)
+    return [_to_resource(r) for r in rows]
+
+
+async def _apply_change(payload: str) -> None:
+    """One NOTIFY from the trigger: re-read that row (or drop it) in the snapshot."""
+    change = json.loads(payload)
+    resource_id = UUID(change["id"])
+    async with _snapshot_lock:
+        if _snapshot is None:
+            return
+        if change.get("op") == "DELETE":
+            _snapshot.remove(resource_id)
+            return
+        try:
+            async with _pool.acquire() as conn:
+                row = await conn.fetchrow(
+                    f"select {_COLUMNS} from resource_bank where id = $1", resource_id
+                )
+        except Exception as e:
+            # Hiding a row until its next change beats serving a stale one.
+            print(f"[repository] snapshot refresh failed for {resource_id}: {e}")
+            row = None
+        if row is None:
+            _snapshot.remove(resource_id)
+        else:
+            _snapshot.upsert(_to_resource(row))
+
+
+def _track(coro) -> None:
+    task = asyncio.get_running_loop().create_task(coro)
+    _snapshot_tasks.add(task)
+    task.add_done_callback(_snapshot_tasks.discard)
+
+
+def _on_notify(conn, pid, channel, payload) -> None:
+    _track(_apply_change(payload))
+
+
+async def _restart_snapshot(dsn: str) -> None:
+    while _snapshot_dsn == dsn and _snapshot is None:
+        await asyncio.sleep(SNAPSHOT_RETRY_SECONDS)
+        try:
+            await start_snapshot(dsn)
+            print("[repository] snapshot listener restored")
+        except Exception as e:
+            print(f"[repository] snapshot restart failed: {e}")
+
+
+def _on_listener_lost(conn) -> None:
+    # Without notifications the snapshot can silently go stale; serve from
+    # Postgres until a fresh listener and full reload succeed.
+    global _snapshot, _listener
+    print("[repository] snapshot listener lost; serving from Postgres")
+    _snapshot = None
+    _listener = None
+    if _snapshot_dsn and _pool is not None:
+        _track(_restart_snapshot(_snapshot_dsn))
+
+
+async def start_snapshot(dsn: str) -> None:
+    """Load the servable rows into memory and keep them fresh via LISTEN/NOTIFY
+    (trigger in 20261017000000_resource_bank_notify.sql). LISTEN starts before
+    the load so no change can slip between the two."""
+    global _snapshot, _snapshot_dsn, _listener
+    await stop_snapshot()
+    _snapshot_dsn = dsn
+    listener = await asyncpg.connect(dsn)
+    try:
+        await listener.add_listener(SNAPSHOT_CHANNEL, _on_notify)
+        listener.add_termination_listener(_on_listener_lost)
+        async with _snapshot_lock:
+            _snapshot = ResourceSnapshot(await _fetch_servable())
+    except Exception:
+        await listener.close()
+        raise
+    _listener = listener
+
+
+async def stop_snapshot() -> None:
+    global _snapshot, _snapshot_dsn, _listener
+    _snapshot_dsn = None
+    listener, _listener, _snapshot = _listener, None, None
+    if listener is not None:
+        listener.remove_termination_listener(_on_listener_lost)
+        await listener.close()
+
+
+def snapshot_version() -> int | None:
+    """Changes on every applied notification; None when the snapshot is off."""
+    return _snapshot.version if _snapshot is not None else None
+
+
+async def bank_version() -> str:
+    """A stamp that changes whenever any row is inserted, updated or deleted
+    (updated_at is bumped by trigger; deletes lower the count). Serving uses
+    it to expire answers built from an older bank."""
+    async with _pool.acquire() as conn:
+        row = await conn.fetchrow(
+            "select count(*) as n, max(updated_at) as touched from resource_bank"
+        )
+    touched = row["touched"].isoformat() if row["touched"] else ""
+    return f"{row['n']}:{touched}"
+
+
 # ---------- Verifier (Layer 3) ----------
 
 async def set_status(
@@ -153,6 +358,23 @@ async def resources_due_for_verification(
 
 # ---------- Discovery (Layer 4) ----------
 
+async def resources_missing_embedding(limit: int = 200) -> list[Resource]:
+    """Seed and imported rows were inserted without embeddings."""
+    async with _pool.acquire() as conn:
+        rows = await conn.fetch(
+            f"select {_COLUMNS} from resource_bank where embedding is null order by created_at asc limit $1",
+            limit,
+        )
+    return [_to_resource(r) for r in rows]
+
+
+async def set_embedding(resource_id: UUID, embedding: list[float]) -> None:
+    async with _pool.acquire() as conn:
+        await conn.execute(
+            "update resource_bank set embedding = $2 where id = $1", resource_id, embedding
+        )
+
+
 async def url_exists(url: str) -> bool:
     async with _pool.acquire() as conn:
         return await conn.fetchval(
@@ -205,12 +427,95 @@ async def insert_candidate(
         )
 
 
-async def list_pending() -> list[Resource]:
+_PENDING_COLUMNS = (
+    "id, name, description, url, category, authority, source_tier, tags, "
+    "added_by, created_at"
+)
+
+
+def encode_cursor(created_at: datetime, resource_id: UUID) -> str:
+    """Opaque keyset cursor for the review queue: the last row's (created_at, id)."""
+    raw = json.dumps([created_at.isoformat(), str(resource_id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Raises ValueError for anything encode_cursor didn't produce."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, resource_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), UUID(resource_id)
+    except (binascii.Error, TypeError, UnicodeDecodeError, ValueError) as e:
+        raise ValueError(f"invalid cursor: {cursor!r}") from e
+
+
+def _pending_filters(
+    added_by: str | None, tier: int | None, tag: str | None
+) -> tuple[list[str], list]:
+    """Only the filters actually set become predicates, so the planner's
+    estimate (estimate_pending) sees the real query shape."""
+    where, args = ["status = 'pending_review'"], []
+    if added_by is not None:
+        args.append(added_by)
+        where.append(f"added_by = ${len(args)}")
+    if tier is not None:
+        args.append(tier)
+        where.append(f"source_tier = ${len(args)}")
+    if tag is not None:
+        args.append([tag])
+        # @> (contains) rather than = any() so resource_bank_tags_idx applies.
+        where.append(f"tags @> ${len(args)}::text[]")
+    return where, args
+
+
+async def list_pending(
+    limit: int = 50,
+    cursor: str | None = None,
+    added_by: str | None = None,
+    tier: int | None = None,
+    tag: str | None = None,
+) -> tuple[list[PendingResource], str | None]:
+    """One page of the review queue, oldest first, and the cursor of the next
+    page (None on the last one). Keyset pagination on (created_at, id) walks
+    resource_bank_pending_idx, so page 500 costs the same as page 1."""
+    where, args = _pending_filters(added_by, tier, tag)
+    if cursor is not None:
+        args.extend(decode_cursor(cursor))
+        where.append(f"(created_at, id) > (${len(args) - 1}, ${len(args)})")
+    args.append(limit + 1)
+    sql = f"""
+        select {_PENDING_COLUMNS} from resource_bank
+        where {" and ".join(where)}
+        order by created_at asc, id asc
+        limit ${len(args)}
+    """
     async with _pool.acquire() as conn:
-        rows = await conn.fetch(
-            f"select {_COLUMNS} from resource_bank where status = 'pending_review' order by created_at asc"
-        )
-    return [_to_resource(r) for r in rows]
+        rows = await conn.fetch(sql, *args)
+    items = [PendingResource(**dict(r)) for r in rows[:limit]]
+    next_cursor = (
+        encode_cursor(items[-1].created_at, items[-1].id) if len(rows) > limit else None
+    )
+    return items, next_cursor
+
+
+async def estimate_pending(
+    added_by: str | None = None, tier: int | None = None, tag: str | None = None
+) -> int:
+    """The planner's row estimate for the filtered queue: no scan, so it stays
+    cheap however long the queue gets. Accurate to table statistics, i.e.
+    good for "about 1,200 pending", not for exact totals."""
+    where, args = _pending_filters(added_by, tier, tag)
+    sql = f"explain (format json) select 1 from resource_bank where {' and '.join(where)}"
+    async with _pool.acquire() as conn:
+        plan = await conn.fetchval(sql, *args)
+    return plan_rows(plan)
+
+
+def plan_rows(plan) -> int:
+    """Top-level "Plan Rows" of EXPLAIN (FORMAT JSON) output (text or parsed)."""
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
 
 
 async def approve(resource_id: UUID) -> None:
@@ -228,3 +533,96 @@ async def reject(resource_id: UUID) -> None:
             "delete from resource_bank where id = $1 and status = 'pending_review'",
             resource_id,
         )
+
+
+def _bulk_filters(
+    ids: list[UUID] | None,
+    added_by: str | None,
+    tier: int | None,
+    tag: str | None,
+    limit: int | None = None,
+) -> tuple[str, list]:
+    where, args = _pending_filters(added_by, tier, tag)
+    if ids is not None:
+        args.append(list(ids))
+        where.append(f"id = any(${len(args)}::uuid[])")
+    if limit is None:
+        return " and ".join(where), args
+    # A filter alone can match the whole queue: take the oldest `limit` rows
+    # (resource_bank_pending_idx order) and leave the rest for the next call.
+    args.append(limit)
+    return (
+        f"id in (select id from resource_bank where {' and '.join(where)}"
+        f" order by created_at, id limit ${len(args)} for update)"
+    ), args
+
+
+async def approve_many(
+    ids: list[UUID] | None = None,
+    added_by: str | None = None,
+    tier: int | None = None,
+    tag: str | None = None,
+    limit: int | None = None,
+) -> list[Resource]:
+    """approve() for every pending row matching the ids and/or filters (at
+    most `limit`, oldest first), in one statement. Returns the rows that moved
+    to unverified; requested ids that are missing or no longer pending are
+    simply absent."""
+    where, args = _bulk_filters(ids, added_by, tier, tag, limit)
+    sql = f"update resource_bank set status = 'unverified' where {where} returning {_COLUMNS}"
+    async with _pool.acquire() as conn:
+        rows = await conn.fetch(sql, *args)
+    return [_to_resource(r) for r in rows]
+
+
+async def reject_many(
+    ids: list[UUID] | None = None,
+    added_by: str | None = None,
+    tier: int | None = None,
+    tag: str | None = None,
+    limit: int | None = None,
+) -> list[UUID]:
+    """reject() in one statement; returns the ids actually deleted."""
+    where, args = _bulk_filters(ids, added_by, tier, tag, limit)
+    async with _pool.acquire() as conn:
+        rows = await conn.fetch(f"delete from resource_bank where {where} returning id", *args)
+    return [r["id"] for r in rows]
+
+
+# ---------- Chat sessions (Layer 2) ----------
+
+async def load_session(session_id: str) -> dict | None:
+    async with _pool.acquire() as conn:
+        return await conn.fetchval(
+            "select state from chat_sessions where id = $1 and expires_at > now()",
+            session_id,
+        )
+
+
+async def save_session(session_id: str, state: dict, ttl_seconds: float) -> None:
+    """Upsert; every save slides the expiry forward."""
+    sql = """
+        insert into chat_sessions (id, state, expires_at)
+        values ($1, $2, now() + make_interval(secs => $3))
+        on conflict (id) do update
+           set state = excluded.state, expires_at = excluded.expires_at
+    """
+    async with _pool.acquire() as conn:
+        await conn.execute(sql, session_id, _strip_nul(state), float(ttl_seconds))
+
+
+async def delete_session(session_id: str) -> None:
+    async with _pool.acquire() as conn:
+        await conn.execute("delete from chat_sessions where id = $1", session_id)
+
+
+async def purge_sessions(max_rows: int) -> int:
+    """Drop expired sessions, then the soonest-to-expire beyond max_rows."""
+    sql = """
+        delete from chat_sessions
+         where expires_at <= now()
+            or id in (select id from chat_sessions order by expires_at desc offset $1)
+    """
+    async with _pool.acquire() as conn:
+        status = await conn.execute(sql, max_rows)
+    return int(status.split()[-1])
@@ -0,0 +1,87 @@
+# bank/snapshot.py — in-process copy of the servable rows (status 'valid',
+# non-empty url) with a per-tag inverted index. The servable set is small and
+# changes only when the verifier or an admin writes, so serving reads it from
+# memory; repository.py keeps it fresh from LISTEN/NOTIFY.
+#
+# Every list is pre-sorted in the serving order (source_tier asc, created_at
+# desc), so a tag query is a k-way merge of the tag lists — no sorting per
+# request. Pure data structure: no I/O here.
+
+from __future__ import annotations
+
+import heapq
+import itertools
+from uuid import UUID
+
+from bank.models import Resource
+from bank.ranking import RankWeights, rank
+
+# Process-wide, so a rebuilt snapshot never reuses an old version number.
+_versions = itertools.count(1)
+
+
+def is_servable(r: Resource) -> bool:
+    return r.status == "valid" and bool(r.url.strip())
+
+
+def _order(r: Resource) -> tuple:
+    return (r.source_tier, -r.created_at.timestamp(), str(r.id))
+
+
+class ResourceSnapshot:
+    def __init__(self, resources: list[Resource] | None = None) -> None:
+        self._by_id: dict[UUID, Resource] = {}
+        self._ordered: list[Resource] = []
+        self._by_tag: dict[str, list[Resource]] = {}
+        self.version = next(_versions)
+        self.replace(resources or [])
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def replace(self, resources: list[Resource]) -> None:
+        self._by_id = {r.id: r for r in resources if is_servable(r)}
+        self._reindex()
+
+    def upsert(self, resource: Resource) -> None:
+        """Apply one changed row; a row that stopped being servable leaves."""
+        if is_servable(resource):
+            self._by_id[resource.id] = resource
+        else:
+            self._by_id.pop(resource.id, None)
+        self._reindex()
+
+    def remove(self, resource_id: UUID) -> None:
+        self._by_id.pop(resource_id, None)
+        self._reindex()
+
+    def _reindex(self) -> None:
+        self._ordered = sorted(self._by_id.values(), key=_order)
+        by_tag: dict[str, list[Resource]] = {}
+        for r in self._ordered:
+            for tag in set(r.tags):
+                by_tag.setdefault(tag, []).append(r)
+        self._by_tag = by_tag
+        self.version = next(_versions)
+
+    def query(self, tags: list[str] | None = None, limit: int = 8) -> list[Resource]:
+        """Same contract as repository.get_active_resources for status 'valid'."""
+        if tags is None:
+            return self._ordered[:limit]
+        lists = [self._by_tag[t] for t in set(tags) if t in self._by_tag]
+        out: list[Resource] = []
+        seen: set[UUID] = set()
+        for r in heapq.merge(*lists, key=_order):
+            if r.id in seen:
+                continue
+            seen.add(r.id)
+            out.append(r)
+            if len(out) >= limit:
+                break
+        return out
+
+    def ranked(
+        self, tags: list[str] | None, limit: int = 8, weights: RankWeights = RankWeights()
+    ) -> list[Resource]:
+        """Same contract as repository.ranked_resources."""
+        return rank(self._ordered, tags, limit, weights)
@@ -0,0 +1,3 @@
+# Offline load testing: boots server.app in-process with stand-ins for the
+# LLM calls, the legacy agent and the resource bank, so /chat throughput can
+# be measured without an API key or a database.
@@ -0,0 +1,75 @@
+# bench/__main__.py — entrypoint. Run with `python -m bench` from
+# src/app/backend; no API key or database needed.
+#
+#   python -m bench --requests 500 --concurrency 32
+#   python -m bench --pipeline single --endpoint stream --scale 0.1
+#   python -m bench --record fixtures.jsonl     # live run, real services
+#   python -m bench --replay fixtures.jsonl     # offline, recorded answers
+#
+# Server flags (PIPELINE_MODE, HYBRID_RETRIEVAL, ANSWER_CACHE_SIZE, ...) are
+# read when server.py is imported, so they are set here before importing it.
+
+import argparse
+import asyncio
+import json
+import os
+from dataclasses import asdict
+
+
+def _parse() -> argparse.Namespace:
+    p = argparse.ArgumentParser(prog="python -m bench", description="Offline /chat load test.")
+    p.add_argument("--requests", type=int, default=200)
+    p.add_argument("--concurrency", type=int, default=16)
+    p.add_argument("--endpoint", choices=["chat", "stream"], default="chat")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--pipeline", choices=["two_call", "single"], help="sets PIPELINE_MODE")
+    p.add_argument("--legacy", action="store_true", help="serve every turn through the legacy agent")
+    p.add_argument("--no-cache", action="store_true", help="disable the route and answer caches")
+    p.add_argument("--env", action="append", default=[], metavar="KEY=VALUE", help="extra server env")
+    p.add_argument("--scale", type=float, default=1.0, help="multiply every synthetic latency")
+    for name in ("route", "synth", "embed", "db", "agent"):
+        p.add_argument(f"--{name}-ms", type=float, help=f"mean synthetic {name} latency")
+    p.add_argument("--replay", metavar="FIXTURES", help="answer from recorded fixtures")
+    p.add_argument("--record", metavar="FIXTURES", help="live run against real services, saving fixtures")
+    p.add_argument("--json", action="store_true", help="print the report as JSON")
+    return p.parse_args()
+
+
+def main() -> None:
+    args = _parse()
+    if args.pipeline:
+        os.environ["PIPELINE_MODE"] = args.pipeline
+    if args.no_cache:
+        os.environ["ROUTE_CACHE_SIZE"] = "0"
+        os.environ["ANSWER_CACHE_SIZE"] = "0"
+    for item in args.env:
+        key, _, value = item.partition("=")
+        os.environ[key] = value
+
+    from bench.standins import Fixtures, Latencies, Latency, Recorder, StandIns
+    from bench.workload import run_workload
+
+    def run():
+        return run_workload(args.requests, args.concurrency, args.endpoint, args.seed)
+
+    if args.record:
+        recorder = Recorder()
+        with recorder.install():
+            report = asyncio.run(run())
+        recorder.fixtures.save(args.record)
+    else:
+        latency = Latencies(scale=args.scale)
+        for name in ("route", "synth", "embed", "db", "agent"):
+            mean = getattr(args, f"{name}_ms")
+            if mean is not None:
+                setattr(latency, name, Latency(mean, mean / 4))
+        fixtures = Fixtures.load(args.replay) if args.replay else None
+        stand_ins = StandIns(latency, fixtures, seed=args.seed)
+        with stand_ins.install(legacy=args.legacy):
+            report = asyncio.run(run())
+
+    print(json.dumps(asdict(report), indent=2) if args.json else report.format())
+
+
+if __name__ == "__main__":
+    main()
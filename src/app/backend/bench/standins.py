@@ -0,0 +1,363 @@
+# bench/standins.py — stand-ins for everything /chat calls out to.
+#
+# Each stand-in sleeps for a configurable synthetic latency and answers either
+# from recorded fixtures (replay) or synthetically: routing by the keyword
+# pre-classifier, synthesis citing the first resources it was given, embeddings
+# hashed from the words of the text. Recorder goes the other way: it wraps the
+# real calls during a live run and writes what they returned as fixtures.
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import math
+import os
+import random
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, AsyncIterator, Iterator, Optional, Sequence
+
+from agent import AgentResponse, ResourceCard
+from bank import repository
+from bank.models import Resource
+from bank.ranking import RankWeights, rank
+from serving.cache import normalize_message
+from serving.keywords import guess_tags
+from serving.schema import TAGS, QueryRoute, RoutedSynthesis, Synthesis
+
+EMBED_DIM = 64
+
+
+@dataclass
+class Latency:
+    """Synthetic latency of one dependency, in milliseconds."""
+    mean_ms: float = 0.0
+    jitter_ms: float = 0.0
+
+    async def sleep(self, rng: random.Random, scale: float = 1.0) -> None:
+        ms = max(0.0, rng.gauss(self.mean_ms, self.jitter_ms)) * scale
+        await asyncio.sleep(ms / 1000)
+
+
+@dataclass
+class Latencies:
+    # Defaults are rough production medians for gpt-5.2 and Supabase.
+    route: Latency = field(default_factory=lambda: Latency(600, 150))
+    synth: Latency = field(default_factory=lambda: Latency(2500, 600))
+    embed: Latency = field(default_factory=lambda: Latency(150, 40))
+    db: Latency = field(default_factory=lambda: Latency(8, 3))
+    agent: Latency = field(default_factory=lambda: Latency(4000, 900))
+    scale: float = 1.0
+
+
+def embed_text(text: str, dim: int = EMBED_DIM) -> list[float]:
+    """Deterministic unit vector from the words of `text`: the same question
+    always embeds the same, and questions sharing words land close together."""
+    vec = [0.0] * dim
+    for word in normalize_message(text).split():
+        digest = hashlib.blake2b(word.encode(), digest_size=4).digest()
+        vec[int.from_bytes(digest, "big") % dim] += 1.0
+    norm = math.sqrt(sum(v * v for v in vec)) or 1.0
+    return [v / norm for v in vec]
+
+
+def synthetic_bank(n: int = 60, seed: int = 0) -> list[Resource]:
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    rows = []
+    for i in range(n):
+        tags = rng.sample(TAGS, k=rng.randint(1, 3))
+        rows.append(Resource(
+            id=uuid.UUID(int=rng.getrandbits(128)),
+            name=f"{tags[0].replace('-', ' ').title()} resource {i}",
+            description=f"Help with {', '.join(tags)} for CUNY students. " * 3,
+            url=f"https://example.edu/resources/{i}",
+            category="scholarship" if "scholarship" in tags else "benefit",
+            authority="Example Authority",
+            source_tier=rng.randint(0, 2),
+            tags=tags,
+            status="valid",
+            created_at=now,
+            updated_at=now,
+        ))
+    return rows
+
+
+class Fixtures:
+    """Recorded call results, one JSON object per line:
+    {"kind": "route" | "synth" | "routed" | "agent", "key": <normalized message>, "value": {...}}."""
+
+    def __init__(self, entries: Optional[dict[tuple[str, str], dict]] = None) -> None:
+        self.entries = entries or {}
+
+    @classmethod
+    def load(cls, path: str | Path) -> "Fixtures":
+        entries = {}
+        for line in Path(path).read_text().splitlines():
+            if line.strip():
+                row = json.loads(line)
+                entries[(row["kind"], row["key"])] = row["value"]
+        return cls(entries)
+
+    def save(self, path: str | Path) -> None:
+        lines = [
+            json.dumps({"kind": kind, "key": key, "value": value})
+            for (kind, key), value in sorted(self.entries.items())
+        ]
+        Path(path).write_text("\n".join(lines) + "\n")
+
+    def get(self, kind: str, message: str) -> Optional[dict]:
+        return self.entries.get((kind, normalize_message(message)))
+
+    def put(self, kind: str, message: str, value: dict) -> None:
+        self.entries[(kind, normalize_message(message))] = value
+
+
+def _cite_positions(cite_ids: Sequence[str], resources: Sequence[Resource]) -> list[int]:
+    # Fixtures store which of the given resources were cited, by position, so
+    # a replay against a different bank still cites rows that exist.
+    position = {str(r.id): i for i, r in enumerate(resources)}
+    return [position[c] for c in cite_ids if c in position]
+
+
+def _cite_ids(positions: Sequence[int], resources: Sequence[Resource]) -> list[str]:
+    return [str(resources[i].id) for i in positions if 0 <= i < len(resources)]
+
+
+class _StandInAgent:
+    def __init__(self, stand_ins: "StandIns") -> None:
+        self._stand_ins = stand_ins
+
+    async def arun(self, message, has_instate=None, school_code=None, profile=None) -> AgentResponse:
+        s = self._stand_ins
+        s.calls["agent"] += 1
+        await s.latency.agent.sleep(s.rng, s.latency.scale)
+        recorded = s.fixtures.get("agent", message)
+        text = recorded["text"] if recorded else f"(legacy) Here is what I found about: {message}"
+        card = ResourceCard(name="NYS Dream Act (HESC)", url="https://www.hesc.ny.gov/", category="grant")
+        return AgentResponse(text=text, cards=[card])
+
+
+def _set_env(values: dict[str, Optional[str]]) -> None:
+    for key, value in values.items():
+        if value is None:
+            os.environ.pop(key, None)
+        else:
+            os.environ[key] = value
+
+
+class StandIns:
+    """Replacements for the network-bound calls /chat makes. `install()`
+    patches them into server/repository for the duration of a run."""
+
+    def __init__(
+        self,
+        latency: Optional[Latencies] = None,
+        fixtures: Optional[Fixtures] = None,
+        bank: Optional[list[Resource]] = None,
+        seed: int = 0,
+    ) -> None:
+        self.latency = latency or Latencies()
+        self.fixtures = fixtures or Fixtures()
+        self.bank = bank if bank is not None else synthetic_bank(seed=seed)
+        self.rng = random.Random(seed)
+        self.calls = {k: 0 for k in ("route", "synth", "embed", "db", "agent")}
+        self._bank_vectors = {r.id: embed_text(f"{r.name} {r.description or ''}") for r in self.bank}
+        self.agent = _StandInAgent(self)
+
+    async def _sleep(self, name: str) -> None:
+        self.calls[name] += 1
+        await getattr(self.latency, name).sleep(self.rng, self.latency.scale)
+
+    # -- LLM --
+    async def route_query(self, message: str) -> QueryRoute:
+        await self._sleep("route")
+        recorded = self.fixtures.get("route", message)
+        if recorded:
+            return QueryRoute(**recorded)
+        tags = guess_tags(message)
+        return QueryRoute(tags=tags or ["general"], needs_resources=True)
+
+    def _synthesis(self, kind: str, message: str, resources: list[Resource]) -> dict:
+        recorded = self.fixtures.get(kind, message)
+        if recorded:
+            return {
+                **recorded,
+                "cite_ids": _cite_ids(recorded.get("cite", []), resources),
+            }
+        return {
+            "answer_text": f"Here are a few options for: {message}\n\n"
+            + "\n".join(f"- **{r.name}**" for r in resources[:3]),
+            "cite_ids": [str(r.id) for r in resources[:3]],
+            "needs_resources": True,
+            "tags": guess_tags(message),
+        }
+
+    async def synthesize(self, message, resources, context_note="", tags=None) -> Synthesis:
+        await self._sleep("synth")
+        out = self._synthesis("synth", message, resources)
+        return Synthesis(answer_text=out["answer_text"], cite_ids=out["cite_ids"])
+
+    async def route_and_synthesize(self, message, resources, context_note="", tags=None) -> RoutedSynthesis:
+        await self._sleep("synth")
+        out = self._synthesis("routed", message, resources)
+        return RoutedSynthesis(
+            needs_resources=out.get("needs_resources", True),
+            tags=out.get("tags", []),
+            answer_text=out["answer_text"],
+            cite_ids=out["cite_ids"],
+        )
+
+    async def synthesize_stream(
+        self, message, resources, context_note="", tags=None, *, routed=False
+    ) -> AsyncIterator[dict]:
+        # Same total latency as synthesize, spread over the streamed words.
+        self.calls["synth"] += 1
+        out = self._synthesis("routed" if routed else "synth", message, resources)
+        words = out["answer_text"].split(" ")
+        total = max(0.0, self.rng.gauss(self.latency.synth.mean_ms, self.latency.synth.jitter_ms))
+        step = total * self.latency.scale / 1000 / max(len(words), 1)
+        text = ""
+        for word in words:
+            await asyncio.sleep(step)
+            text = f"{text} {word}" if text else word
+            yield {"answer_text": text}
+        yield {**out, "answer_text": text}
+
+    async def embed(self, text: str) -> list[float]:
+        await self._sleep("embed")
+        return embed_text(text)
+
+    # -- Resource bank --
+    async def get_active_resources(self, tags=None, status_in=("valid",), limit=8) -> list[Resource]:
+        await self._sleep("db")
+        rows = [
+            r for r in self.bank
+            if r.status in status_in and (not tags or set(r.tags) & set(tags))
+        ]
+        rows.sort(key=lambda r: (r.source_tier, -r.created_at.timestamp(), str(r.id)))
+        return rows[:limit]
+
+    async def ranked_resources(self, tags=None, limit=8, weights=RankWeights()) -> list[Resource]:
+        await self._sleep("db")
+        return rank([r for r in self.bank if r.status == "valid"], tags, limit, weights)
+
+    async def hybrid_candidates(self, embedding, tags=None, k=24) -> list[tuple[Resource, float]]:
+        await self._sleep("db")
+        scored = []
+        for r in self.bank:
+            similarity = sum(a * b for a, b in zip(embedding, self._bank_vectors[r.id]))
+            scored.append((r, 1.0 - similarity))
+        scored.sort(key=lambda pair: pair[1])
+        nearest = scored[:k]
+        tagged = [p for p in scored[k:] if tags and set(p[0].tags) & set(tags)]
+        return nearest + tagged
+
+    async def bank_version(self) -> str:
+        return f"bench:{len(self.bank)}"
+
+    @contextmanager
+    def install(self, *, legacy: bool = False) -> Iterator["StandIns"]:
+        """Patch the stand-ins in. `legacy=True` serves every turn through the
+        legacy agent, as when DATABASE_URL is unset."""
+        import server
+        from serving import answer_cache, router
+
+        patches: list[tuple[Any, str, Any]] = [
+            (server, "route_query", self.route_query),
+            (server, "synthesize", self.synthesize),
+            (server, "route_and_synthesize", self.route_and_synthesize),
+            (server, "synthesize_stream", self.synthesize_stream),
+            (server, "embed", self.embed),
+            (server, "_agent", self.agent),
+            (server, "AGENT_ERROR", None),
+            (repository, "pool_ready", lambda: not legacy),
+            (repository, "get_active_resources", self.get_active_resources),
+            (repository, "ranked_resources", self.ranked_resources),
+            (repository, "hybrid_candidates", self.hybrid_candidates),
+            (repository, "bank_version", self.bank_version),
+            (repository, "snapshot_version", lambda: None),
+        ]
+        # No real pool at boot, no chat_sessions table, and no LLM client
+        # imports competing with the workload.
+        env = {"DATABASE_URL": None, "SESSION_STORE": "memory", "PRELOAD_LLM": "0"}
+        saved = [(obj, name, getattr(obj, name)) for obj, name, _ in patches]
+        saved_env = {k: os.environ.get(k) for k in env}
+        for obj, name, value in patches:
+            setattr(obj, name, value)
+        _set_env(env)
+        router.route_cache.clear()
+        answer_cache.invalidate()
+        try:
+            yield self
+        finally:
+            for obj, name, value in saved:
+                setattr(obj, name, value)
+            _set_env(saved_env)
+            router.route_cache.clear()
+            answer_cache.invalidate()
+
+
+class Recorder:
+    """Wraps the real router, synthesis and legacy agent during a live run
+    (real OPENAI_API_KEY and DATABASE_URL) and keeps what they returned."""
+
+    def __init__(self, fixtures: Optional[Fixtures] = None) -> None:
+        self.fixtures = fixtures or Fixtures()
+
+    @contextmanager
+    def install(self) -> Iterator["Recorder"]:
+        import server
+
+        real_route = server.route_query
+        real_synth = server.synthesize
+        real_routed = server.route_and_synthesize
+        real_agent = server._get_agent()
+        fixtures = self.fixtures
+
+        async def route_query(message):
+            route = await real_route(message)
+            fixtures.put("route", message, route.model_dump())
+            return route
+
+        async def synthesize(message, resources, context_note="", tags=None):
+            synth = await real_synth(message, resources, context_note, tags)
+            fixtures.put("synth", message, {
+                "answer_text": synth.answer_text,
+                "cite": _cite_positions(synth.cite_ids, resources),
+            })
+            return synth
+
+        async def route_and_synthesize(message, resources, context_note="", tags=None):
+            routed = await real_routed(message, resources, context_note, tags)
+            fixtures.put("routed", message, {
+                "answer_text": routed.answer_text,
+                "cite": _cite_positions(routed.cite_ids, resources),
+                "needs_resources": routed.needs_resources,
+                "tags": routed.tags,
+            })
+            return routed
+
+        class _RecordingAgent:
+            async def arun(self, message, **kwargs):
+                result = await real_agent.arun(message, **kwargs)
+                if result.text:
+                    fixtures.put("agent", message, {"text": result.text})
+                return result
+
+        server.route_query = route_query
+        server.synthesize = synthesize
+        server.route_and_synthesize = route_and_synthesize
+        if real_agent is not None:
+            server._agent = _RecordingAgent()
+        try:
+            yield self
+        finally:
+            server.route_query = real_route
+            server.synthesize = real_synth
+            server.route_and_synthesize = real_routed
+            server._agent = real_agent
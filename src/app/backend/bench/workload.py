@@ -0,0 +1,169 @@
+# bench/workload.py — drive server.app with concurrent chat turns and report
+# req/s and latency percentiles per pipeline path.
+#
+# The path of every turn comes from serving.metrics (a listener receives the
+# same endpoint/path/cache labels /metrics exports), so the report splits
+# exactly where production dashboards do: closing, triage, legacy, bank with
+# an answer-cache hit or miss, coalesced, ...
+
+from __future__ import annotations
+
+import asyncio
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Optional, Sequence
+
+import httpx
+
+from serving import metrics
+
+# (weight, message, profile). Most traffic is resource questions from students
+# whose residency is known; the rest exercises the short-circuit paths.
+QUESTIONS: list[tuple[int, str, Optional[dict]]] = [
+    (6, "What scholarships can undocumented students apply for?", {"has_instate": True}),
+    (5, "How do I apply for the NYS Dream Act?", {"has_instate": True}),
+    (4, "Can I get in-state tuition at CCNY without a green card?", {"has_instate": False}),
+    (4, "Where can I renew DACA and get legal help?", {"has_instate": True}),
+    (3, "Is there financial aid if I can't file the FAFSA?", {"has_instate": True}),
+    (3, "Can I work on campus with a work permit?", {"has_instate": True}),
+    (2, "Which fellowships accept DACA recipients?", {"has_instate": True}),
+    (2, "I'm undocumented, what help is there for me?", None),
+    (2, "thanks!", None),
+    (1, "Who can I talk to about my immigration status and tuition?", {"has_instate": True}),
+]
+
+
+@dataclass
+class Sample:
+    label: str
+    seconds: float
+    ok: bool
+
+
+@dataclass
+class PathStats:
+    count: int
+    errors: int
+    rps: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+
+@dataclass
+class Report:
+    requests: int
+    concurrency: int
+    wall_seconds: float
+    rps: float
+    paths: dict[str, PathStats] = field(default_factory=dict)
+
+    def format(self) -> str:
+        lines = [
+            f"{self.requests} requests, concurrency {self.concurrency}, "
+            f"{self.wall_seconds:.2f}s wall, {self.rps:.1f} req/s",
+            f"{'path':<32}{'count':>7}{'err':>5}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}",
+        ]
+        for label, s in sorted(self.paths.items()):
+            lines.append(
+                f"{label:<32}{s.count:>7}{s.errors:>5}{s.rps:>9.1f}"
+                f"{s.p50_ms:>10.1f}{s.p95_ms:>10.1f}{s.p99_ms:>10.1f}"
+            )
+        return "\n".join(lines)
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0..100) of unsorted `values`."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, min(len(ordered), math.ceil(q / 100 * len(ordered))))
+    return ordered[rank - 1]
+
+
+def summarize(samples: Sequence[Sample], wall: float, concurrency: int) -> Report:
+    by_path: dict[str, list[Sample]] = {}
+    for s in samples:
+        by_path.setdefault(s.label, []).append(s)
+    wall = max(wall, 1e-9)
+    report = Report(
+        requests=len(samples), concurrency=concurrency, wall_seconds=wall, rps=len(samples) / wall
+    )
+    for label, group in by_path.items():
+        ms = [s.seconds * 1000 for s in group]
+        report.paths[label] = PathStats(
+            count=len(group),
+            errors=sum(not s.ok for s in group),
+            rps=len(group) / wall,
+            p50_ms=percentile(ms, 50),
+            p95_ms=percentile(ms, 95),
+            p99_ms=percentile(ms, 99),
+        )
+    return report
+
+
+def make_turns(n: int, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    weights = [w for w, _, _ in QUESTIONS]
+    picks = rng.choices(QUESTIONS, weights=weights, k=n)
+    return [{"message": m, "profile": p} if p else {"message": m} for _, m, p in picks]
+
+
+async def _send(client: httpx.AsyncClient, endpoint: str, body: dict) -> None:
+    if endpoint == "stream":
+        async with client.stream("POST", "/chat/stream", json=body) as resp:
+            async for _ in resp.aiter_bytes():
+                pass
+    else:
+        await client.post("/chat", json=body)
+
+
+async def run_workload(
+    requests: int = 200,
+    concurrency: int = 16,
+    endpoint: str = "chat",
+    seed: int = 0,
+) -> Report:
+    """Boot server.app in-process (lifespan included) and send `requests`
+    turns from `concurrency` concurrent clients. Stand-ins, if any, must
+    already be installed."""
+    import server
+
+    turns = make_turns(requests, seed)
+    samples: list[Sample] = []
+
+    def record(labels: dict, seconds: float) -> None:
+        label = f"{labels['endpoint']}:{labels['path']}"
+        if labels["cache"] != "none":
+            label += f"/{labels['cache']}"
+        samples.append(Sample(label, seconds, labels.get("outcome") == "ok"))
+
+    queue: asyncio.Queue = asyncio.Queue()
+    for body in turns:
+        queue.put_nowait(body)
+
+    async def client_loop(client: httpx.AsyncClient) -> None:
+        while True:
+            try:
+                body = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            # Failures are counted from the turn's metrics outcome label.
+            try:
+                await _send(client, endpoint, body)
+            except Exception as e:
+                print(f"[bench] request failed: {e}")
+
+    metrics.add_listener(record)
+    try:
+        async with server.app.router.lifespan_context(server.app):
+            transport = httpx.ASGITransport(app=server.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+                start = time.perf_counter()
+                await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+                wall = time.perf_counter() - start
+    finally:
+        metrics.remove_listener(record)
+    return summarize(samples, wall, concurrency)
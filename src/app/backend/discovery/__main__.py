@@ -10,14 +10,17 @@ from dotenv import load_dotenv
 load_dotenv(dotenv_path=Path(__file__).resolve().parent.parent / ".env")
 
 from bank import repository
+from verifier import http_client
 from discovery.batch import run_discovery
 
 
 async def main():
     await repository.init_pool(os.environ["DATABASE_URL"])
+    http_client.init_client()
     try:
         await run_discovery()
     finally:
+        await http_client.close_client()
         await repository.close_pool()
 
 
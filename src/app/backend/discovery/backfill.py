@@ -0,0 +1,23 @@
+# discovery/backfill.py — embed rows that were inserted without an embedding
+# (the seed migration and the directory import). Discovery embeds what it
+# inserts; this catches everything else so hybrid retrieval sees the whole bank.
+
+from __future__ import annotations
+
+from bank import repository
+from discovery.embed import embed_many, resource_text
+
+
+async def backfill_embeddings(batch_size: int = 64, max_rows: int = 1000) -> int:
+    done = 0
+    while done < max_rows:
+        rows = await repository.resources_missing_embedding(limit=min(batch_size, max_rows - done))
+        if not rows:
+            break
+        vectors = await embed_many([resource_text(r.name, r.description) for r in rows])
+        for r, vector in zip(rows, vectors):
+            await repository.set_embedding(r.id, vector)
+        done += len(rows)
+    if done:
+        print(f"[discovery] backfilled embeddings for {done} resources")
+    return done
@@ -11,7 +11,8 @@ from datetime import date
 from urllib.parse import urljoin, urlparse
 
 from bank import repository
-from discovery.embed import embed
+from discovery.backfill import backfill_embeddings
+from discovery.embed import embed, resource_text
 from discovery.extract import extract_candidates
 from discovery.schema import Candidate
 from discovery.search import SearchResult, brave_search_configured, search_web
@@ -131,7 +132,7 @@ async def _queue_candidate(candidate: Candidate, *, source: str, base_url: str |
     if not v.relevant or v.scam_risk:
         print(f"[discovery] dropped {normalized.name}: {v.reason}")
         return False
-    emb = await embed(f"{normalized.name} {normalized.description}")
+    emb = await embed(resource_text(normalized.name, normalized.description))
     if await repository.find_similar(emb):
         print(f"[discovery] duplicate {normalized.name}")
         return False
@@ -190,6 +191,11 @@ async def discover_from_search_query(query: str, semaphore: asyncio.Semaphore) -
 
 
 async def run_discovery() -> None:
+    try:
+        await backfill_embeddings()
+    except Exception as e:
+        print(f"[discovery] embedding backfill failed — {e}")
+
     tasks = [discover_from_hub(hub) for hub in HUBS]
     if brave_search_configured():
         search_semaphore = asyncio.Semaphore(_search_result_concurrency())
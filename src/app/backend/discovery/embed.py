@@ -1,15 +1,22 @@
-# discovery/embed.py — embeddings for dedup (and, later, semantic retrieval).
+# discovery/embed.py — embeddings for dedup and serving's hybrid retrieval.
 
 from __future__ import annotations
 
-from openai import AsyncOpenAI
+from typing import TYPE_CHECKING
 
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+# The server imports this module for query embeddings; openai is imported on
+# first use so server startup doesn't pay for it.
 _client: AsyncOpenAI | None = None
 
 
 def _get_client() -> AsyncOpenAI:
     global _client
     if _client is None:
+        from openai import AsyncOpenAI
+
         _client = AsyncOpenAI()
     return _client
 
@@ -17,3 +24,16 @@ def _get_client() -> AsyncOpenAI:
 async def embed(text: str) -> list[float]:
     resp = await _get_client().embeddings.create(model="text-embedding-3-small", input=text)
     return resp.data[0].embedding  # 1536 floats — matches vector(1536)
+
+
+async def embed_many(texts: list[str]) -> list[list[float]]:
+    """One API call for a batch (the backfill); same model as embed."""
+    if not texts:
+        return []
+    resp = await _get_client().embeddings.create(model="text-embedding-3-small", input=texts)
+    return [item.embedding for item in sorted(resp.data, key=lambda d: d.index)]
+
+
+def resource_text(name: str, description: str | None) -> str:
+    """What a resource is embedded as — shared by discovery and the backfill."""
+    return f"{name} {description or ''}".strip()
@@ -5,7 +5,7 @@ from __future__ import annotations
 import os
 from dataclasses import dataclass
 
-import httpx
+from verifier import http_client
 
 BRAVE_SEARCH_URL = "https://api.search.brave.com/res/v1/web/search"
 
@@ -40,8 +40,9 @@ async def search_web(query: str, *, count: int = 5) -> list[SearchResult]:
         "X-Subscription-Token": api_key,
     }
 
-    async with httpx.AsyncClient(timeout=20, follow_redirects=True) as client:
-        response = await client.get(BRAVE_SEARCH_URL, params=params, headers=headers)
+    response = await http_client.request(
+        "GET", BRAVE_SEARCH_URL, params=params, headers=headers, timeout=20
+    )
     response.raise_for_status()
     payload = response.json()
 
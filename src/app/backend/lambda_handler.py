@@ -17,13 +17,17 @@ import os
 def _run_job(job) -> None:
     async def main():
         from bank import repository
+        from verifier import http_client
 
         await repository.init_pool(os.environ["DATABASE_URL"])
+        http_client.init_client()
         try:
             await job()
         finally:
-            # The pool must close every invocation: Lambda may freeze the
-            # execution environment between runs and kill idle TCP connections.
+            # The pool and the HTTP client must close every invocation: Lambda
+            # may freeze the execution environment between runs and kill idle
+            # TCP connections, and both are bound to this invocation's loop.
+            await http_client.close_client()
             await repository.close_pool()
 
     asyncio.run(main())
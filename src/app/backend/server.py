@@ -10,34 +10,88 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import os
+import threading
+import time
 import uuid
-from contextlib import asynccontextmanager
+from contextlib import aclosing, asynccontextmanager
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple, Union
 from uuid import UUID
 
-from fastapi import FastAPI, Header, HTTPException
-from pydantic import BaseModel, Field
+from fastapi import BackgroundTasks, FastAPI, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field, PrivateAttr
 from dotenv import load_dotenv
 
 # Load environment variables
 BASE_DIR = Path(__file__).resolve().parent
 load_dotenv(dotenv_path=BASE_DIR / ".env")
 
-from agent import Agent, AgentResponse, CLOSING_PHRASES, UNDOC_PATTERN, INSTATE_PATTERN
+from agent import (
+    Agent, AgentResponse, CLOSING_PHRASES, INSTATE_PATTERN, SCHOOL_PROMPTS, UNDOC_PATTERN,
+)
 from bank import repository
-from serving.router import route_query
-from serving.synthesize import synthesize, to_card
+from bank.models import PendingPage, Resource
+from discovery.embed import embed
+from serving import answer_cache as answers
+from serving import deadline as budget
+from serving import metrics
+from serving import retrieval
+from serving import sessions
+from serving.batch import BATCH_CONCURRENCY, BATCH_MAX, SharedRetrieval
+from serving.config import env_flag, env_float, env_int
+from serving.router import route_cache, route_query
+from serving.hybrid import hybrid_retrieve
+from serving.keywords import guess_tags
+from serving.cache import TTLCache, normalize_message
+from serving.schema import RoutedSynthesis, Synthesis
+from serving.singleflight import SingleFlight
+from serving.speculative import SpeculativeRetrieval
+from serving.synthesize import route_and_synthesize, synthesize, synthesize_stream, to_card
 
-# Initialize legacy agent (fallback when the bank is unavailable;
-# may fail if the OpenAI key is missing)
+# Legacy agent (fallback when the bank is unavailable), built on first use so
+# importing this module doesn't load langchain. Building it may fail if the
+# OpenAI key is missing; the error is kept for /health and the build is tried
+# again after AGENT_RETRY_SECONDS. The preload thread and the event loop can
+# both get here, so the build holds a lock.
 AGENT_ERROR: Optional[Exception] = None
-try:
-    _agent = Agent()
-except Exception as e:
-    AGENT_ERROR = e
-    _agent = None
+AGENT_RETRY_SECONDS = env_float("AGENT_RETRY_SECONDS", 60.0, minimum=0.0, maximum=3600.0)
+_agent: Optional[Agent] = None
+_agent_failed_at = 0.0
+_agent_lock = threading.Lock()
+
+
+def _get_agent() -> Optional[Agent]:
+    global _agent, AGENT_ERROR, _agent_failed_at
+    if _agent is not None:
+        return _agent
+    with _agent_lock:
+        retry = AGENT_ERROR is None or time.monotonic() - _agent_failed_at >= AGENT_RETRY_SECONDS
+        if _agent is None and retry:
+            try:
+                _agent = Agent()
+                AGENT_ERROR = None
+            except Exception as e:
+                AGENT_ERROR = e
+                _agent_failed_at = time.monotonic()
+    return _agent
+
+
+def _preload_llm() -> None:
+    # Runs in a worker thread after startup: pay for the LLM client imports
+    # (and the legacy agent, if it will be needed) before the first question
+    # instead of before the first /health.
+    try:
+        import langchain_openai  # noqa: F401
+        import openai  # noqa: F401
+    except Exception as e:
+        print(f"[server] LLM preload failed: {e}")
+        return
+    if not repository.pool_ready():
+        _get_agent()
 
 
 @asynccontextmanager
@@ -49,8 +103,23 @@ async def lifespan(app: FastAPI):
             await repository.init_pool(dsn)
         except Exception as e:
             print(f"[server] resource bank unavailable, using legacy context: {e}")
+        # Servable rows in memory, refreshed by LISTEN/NOTIFY; RESOURCE_SNAPSHOT=0
+        # keeps every retrieval on Postgres.
+        if repository.pool_ready() and env_flag("RESOURCE_SNAPSHOT", True):
+            try:
+                await repository.start_snapshot(dsn)
+                await _warm_cards()
+            except Exception as e:
+                print(f"[server] resource snapshot unavailable, querying Postgres: {e}")
+    # PRELOAD_LLM=0 defers the LLM imports to the first turn that needs them.
+    if env_flag("PRELOAD_LLM", True):
+        app.state.preload = asyncio.create_task(asyncio.to_thread(_preload_llm))
     yield
     await repository.close_pool()
+    # Opened only if an admin approve asked for immediate verification.
+    from verifier import http_client
+
+    await http_client.close_client()
 
 
 app = FastAPI(title="CCNY Student Agent API", lifespan=lifespan)
@@ -84,11 +153,44 @@ class ChatResponse(BaseModel):
     answer_text: Optional[str] = None
     sources: List[Source] = Field(default_factory=list)
     cards: List[ResourceCardOut] = Field(default_factory=list)
+    # Pre-serialized cards/sources, when every card came from the bank (see
+    # _card_fragment); lets /chat skip re-serializing them.
+    _fragments: List[Any] = PrivateAttr(default_factory=list)
+
+class ChatBatchRequest(BaseModel):
+    requests: List[ChatRequest] = Field(..., min_length=1, max_length=BATCH_MAX)
+
+class ChatBatchItem(BaseModel):
+    response: Optional[ChatResponse] = None
+    error: Optional[str] = None
+
+class ChatBatchResponse(BaseModel):
+    results: List[ChatBatchItem]
+
+# Bulk review: explicit ids and/or a filter over the pending queue. One call
+# touches at most ADMIN_BULK_MAX rows; verify=true runs the verifier (LLM
+# calls) inside this process, so it takes at most ADMIN_VERIFY_MAX.
+ADMIN_BULK_MAX = 1000
+ADMIN_VERIFY_MAX = env_int("ADMIN_VERIFY_MAX", 20, minimum=1, maximum=ADMIN_BULK_MAX)
 
+class PendingFilter(BaseModel):
+    source: Optional[str] = None
+    tier: Optional[int] = None
+    tag: Optional[str] = None
 
-# ---------- Session State ----------
-# Simple in-memory sessions (for residency question flow)
-SESSIONS: Dict[str, Dict[str, Any]] = {}
+class AdminBulkRequest(BaseModel):
+    ids: Optional[List[UUID]] = Field(default=None, max_length=ADMIN_BULK_MAX)
+    filter: Optional[PendingFilter] = None
+    verify: bool = False  # approve only: verify the approved rows right away
+
+class AdminBulkOutcome(BaseModel):
+    id: UUID
+    outcome: str  # approved | rejected | not_pending
+
+class AdminBulkResponse(BaseModel):
+    results: List[AdminBulkOutcome]
+    count: int
+    verifying: int = 0
 
 
 # ---------- Helpers ----------
@@ -149,16 +251,84 @@ def _from_agent_response(session_id: str, result: AgentResponse) -> ChatResponse
     )
 
 
+# PIPELINE_MODE=single skips the router: a local keyword guess pre-filters the
+# bank and one structured call returns the route and the answer together.
+SINGLE_CALL = os.environ.get("PIPELINE_MODE", "two_call").strip().lower() == "single"
+
+# Rank by embedding similarity + tag overlap + tier (serving/hybrid.py)
+# instead of tag filter + tier order. Shares the answer cache's query embedding.
+HYBRID_RETRIEVAL = env_flag("HYBRID_RETRIEVAL")
+
+# Overlap retrieval with the router call. Pointless (and skipped) while the
+# in-memory snapshot is live, since retrieval then costs no I/O.
+SPECULATIVE_RETRIEVAL = env_flag("SPECULATIVE_RETRIEVAL")
+
+
+def _speculate(message: str) -> Optional[SpeculativeRetrieval]:
+    if (
+        SPECULATIVE_RETRIEVAL
+        and not SINGLE_CALL
+        and not HYBRID_RETRIEVAL
+        and repository.snapshot_version() is None
+    ):
+        return SpeculativeRetrieval(message)
+    return None
+
+
+async def _embed_query(message: str) -> Optional[List[float]]:
+    # The answer cache is an optimization: if embedding fails, answer normally.
+    try:
+        return await embed(message)
+    except Exception as e:
+        print(f"[server] query embedding failed, skipping answer cache: {e}")
+        return None
+
+
 # ---------- Core pipeline ----------
-async def _answer(
+FetchResources = Callable[[Optional[List[str]]], Awaitable[List[Resource]]]
+
+
+@dataclass
+class _Grounding:
+    """Where the pipeline stands once routing and retrieval are done: the
+    resources synthesis must ground on, plus what the answer cache needs."""
+    resources: List[Resource]
+    note: str
+    cache_key: Hashable
+    tags: List[str]
+    embedding: Optional[List[float]] = None
+    version: Optional[str] = None
+    cached: Optional[Synthesis] = None
+    single_call: bool = False
+    school_key: str = "ccny"
+    deadline: Optional[budget.Deadline] = None
+
+    def remember(self, synth: Synthesis) -> None:
+        if self.embedding and self.version is not None:
+            answers.answer_cache.store(
+                self.embedding, self.cache_key, self.version, synth, self.resources
+            )
+
+
+async def _prepare(
     session_id: str,
     message: str,
     has_instate: Optional[bool],
     school_code: Optional[str],
     profile: Optional[Dict[str, Any]],
-) -> ChatResponse:
+    fetch_resources: Optional[FetchResources] = None,
+    deadline: Optional[budget.Deadline] = None,
+) -> Union[ChatResponse, _Grounding]:
+    """Steps 1-4. Returns a finished ChatResponse for every short-circuit
+    (closing, residency ask, legacy fallback, out of time), otherwise what to
+    synthesize from. `fetch_resources` replaces the per-turn tag query (e.g. a
+    batch's shared one); every slow stage is bounded by `deadline`."""
+    deadline = deadline or budget.Deadline()
     # 1. Conversational closure — no resources needed.
-    if _is_closing(message):
+    with metrics.stage("closing"):
+        closing = _is_closing(message)
+    if closing:
+        metrics.tag(path="closing")
         return ChatResponse(session_id=session_id, answer_text=_friendly_closing())
 
     school_key = (
@@ -168,7 +338,10 @@ async def _answer(
     ).lower()
 
     # 2. Residency triage — ask before answering if status is unknown.
-    if has_instate is None and _needs_residency_check(message, profile):
+    with metrics.stage("triage"):
+        ask = has_instate is None and _needs_residency_check(message, profile)
+    if ask:
+        metrics.tag(path="triage")
         campus_label = "CCNY" if school_key == "ccny" else "your campus"
         return ChatResponse(
             session_id=session_id,
@@ -177,39 +350,358 @@ async def _answer(
 
     # Fallback: bank not configured/reachable -> legacy static-context agent.
     if not repository.pool_ready():
-        if _agent is None:
+        agent = _get_agent()
+        if agent is None:
             raise HTTPException(status_code=500, detail=f"Agent not available: {AGENT_ERROR}")
-        result = await asyncio.to_thread(
-            _agent.run, message,
-            has_instate=has_instate, school_code=school_key, profile=profile,
-        )
+        metrics.tag(path="legacy")
+        with metrics.stage("legacy"):
+            try:
+                result = await budget.call("agent", lambda: agent.arun(
+                    message, has_instate=has_instate, school_code=school_key, profile=profile,
+                ), deadline)
+            except TimeoutError:
+                budget.fallback("agent")
+                return _fallback_answer(session_id, school_key, [])
         return _from_agent_response(session_id, result)
 
-    # 3. Route: which tags, and does this even need resources?
-    route = await route_query(message)
-    if not route.needs_resources:
-        return ChatResponse(session_id=session_id, answer_text=_friendly_closing())
+    # 3. Route: which tags, and does this even need resources? The query
+    #    embedding (answer cache, hybrid retrieval) is computed behind the
+    #    router call. Retrieval may also start here, speculatively (see
+    #    serving/speculative.py).
+    metrics.tag(path="bank")
+    embedding_task = (
+        asyncio.create_task(_embed_query(message))
+        if answers.answer_cache.enabled or HYBRID_RETRIEVAL
+        else None
+    )
+    speculative = None if fetch_resources else _speculate(message)
+    try:
+        if SINGLE_CALL:
+            # No router call: the keyword guess pre-filters the bank and the
+            # model routes while it answers (step 5). The guess is also the
+            # answer-cache key, for lookup and store alike: the model's route
+            # only arrives with the answer, too late to look anything up by.
+            tags = guess_tags(message)
+        else:
+            try:
+                with metrics.stage("route"):
+                    route = await budget.call("route", lambda: route_query(message), deadline)
+                if not route.needs_resources:
+                    return _no_resources(session_id)
+                tags = route.tags
+            except TimeoutError:
+                # Slow router: the keyword guess is a good enough route.
+                budget.fallback("route")
+                tags = guess_tags(message)
+
+        # 3b. Near-identical question already answered against this bank version?
+        note = _context_note(has_instate, school_key, profile)
+        embedding = None
+        if embedding_task:
+            with metrics.stage("embed"):
+                try:
+                    embedding = await asyncio.wait_for(embedding_task, deadline.timeout("embed"))
+                except TimeoutError:
+                    budget.fallback("embed")
+        grounding = _Grounding(
+            resources=[],
+            note=note,
+            cache_key=answers.AnswerCache.key(tags, school_key, has_instate, note),
+            tags=tags,
+            embedding=embedding,
+            single_call=SINGLE_CALL,
+            school_key=school_key,
+            deadline=deadline,
+        )
+        if grounding.embedding and answers.answer_cache.enabled:
+            with metrics.stage("answer_cache"):
+                grounding.version = await answers.bank_version()
+                cached = answers.answer_cache.lookup(grounding.embedding, grounding.cache_key, grounding.version)
+            if cached:
+                metrics.tag(cache="hit")
+                grounding.cached, grounding.resources = cached
+                return grounding
+            metrics.tag(cache="miss")
+
+        # 4. Retrieve only from the canonical AI resource bank. Legacy directory
+        #    rows are imported into this table before they can be served.
+        async def retrieve() -> List[Resource]:
+            resources: List[Resource] = []
+            if HYBRID_RETRIEVAL and grounding.embedding:
+                resources = await hybrid_retrieve(grounding.embedding, tags or None)
+            if not resources:
+                # One ranked query: tag matches first, backfilled with the rest.
+                fetch = speculative.fetch if speculative else (fetch_resources or retrieval.retrieve)
+                resources = await fetch(tags or None)
+            return resources
+
+        with metrics.stage("retrieve"):
+            try:
+                grounding.resources = await asyncio.wait_for(retrieve(), deadline.timeout("retrieve"))
+            except TimeoutError:
+                budget.fallback("retrieve")
+                return _fallback_answer(session_id, school_key, [])
+        return grounding
+    finally:
+        if embedding_task:
+            embedding_task.cancel()
+        if speculative:
+            speculative.cancel()
+
+
+@dataclass(frozen=True)
+class _CardFragment:
+    """A cited resource as it goes out: models plus their JSON, built once
+    per row version. Rows change about once a day; answers cite them all day."""
+    card: ResourceCardOut
+    source: Source
+    card_json: str
+    source_json: str
+
+
+# Keyed by (id, updated_at): every write to a row bumps updated_at (trigger),
+# so a re-verified or edited resource gets a fresh card. CARD_CACHE_SIZE=0 disables.
+_card_cache = TTLCache(env_int("CARD_CACHE_SIZE", 2048, minimum=0, maximum=100_000), ttl=24 * 3600)
+
 
-    # 4. Retrieve only from the canonical AI resource bank. Legacy directory
-    #    rows are imported into this table before they can be served.
-    resources = await repository.get_active_resources(tags=route.tags or None)
-    if not resources:
-        resources = await repository.get_active_resources(tags=None)
+def _card_fragment(r: Resource) -> _CardFragment:
+    key = (r.id, r.updated_at)
+    fragment = _card_cache.get(key)
+    if fragment is None:
+        card = ResourceCardOut(**to_card(r))
+        source = Source(url=card.url, title=card.name)
+        fragment = _CardFragment(card, source, card.model_dump_json(), source.model_dump_json())
+        _card_cache.set(key, fragment)
+    return fragment
 
-    # 5. Grounded synthesis: answer from these resources only.
-    synth = await synthesize(message, resources, _context_note(has_instate, school_key, profile))
 
+async def _warm_cards() -> None:
+    # With the snapshot live every servable row is already in memory, so
+    # build their cards at boot instead of on first citation.
+    if _card_cache.maxsize > 0:
+        for r in await repository.get_active_resources(limit=_card_cache.maxsize):
+            _card_fragment(r)
+
+
+def _cited_cards(cite_ids: List[str], resources: List[Resource]) -> List[_CardFragment]:
     # 6. Cards only for ids the model cited that actually exist
     #    (`if cid in by_id` drops any hallucinated id).
     by_id = {str(r.id): r for r in resources}
-    cards = [to_card(by_id[cid]) for cid in synth.cite_ids if cid in by_id]
+    return [_card_fragment(by_id[cid]) for cid in cite_ids if cid in by_id]
 
-    return ChatResponse(
+
+def _finish(session_id: str, synth: Synthesis, resources: List[Resource]) -> ChatResponse:
+    with metrics.stage("cards"):
+        fragments = _cited_cards(synth.cite_ids, resources)
+    resp = ChatResponse(
         session_id=session_id,
         answer_text=synth.answer_text,
-        sources=[Source(url=c["url"], title=c["name"]) for c in cards],
-        cards=[ResourceCardOut(**c) for c in cards],
+        sources=[f.source for f in fragments],
+        cards=[f.card for f in fragments],
+    )
+    resp._fragments = fragments
+    return resp
+
+
+def _render(resp: ChatResponse) -> Response:
+    """JSON for /chat: the small envelope is serialized per turn, the cards
+    and sources are spliced in from their cached fragments."""
+    fragments = resp._fragments
+    if not fragments or len(fragments) != len(resp.cards):
+        return Response(resp.model_dump_json(), media_type="application/json")
+    head = resp.model_dump_json(exclude={"sources", "cards"})
+    body = (
+        f'{head[:-1]},"sources":[{",".join(f.source_json for f in fragments)}],'
+        f'"cards":[{",".join(f.card_json for f in fragments)}]}}'
     )
+    return Response(body, media_type="application/json")
+
+
+FALLBACK_TEXT = (
+    "I couldn't put a full answer together in time, but these resources match "
+    "your question. Check each official source to confirm eligibility and deadlines."
+)
+FALLBACK_CARDS = 3
+
+
+def _fallback_answer(session_id: str, school_key: str, resources: List[Resource]) -> ChatResponse:
+    """Deterministic answer for a turn that ran out of time: cards for the top
+    retrieved rows (built from the rows, as always) or, with none, the
+    school's default cards. Never cached."""
+    if resources:
+        cite_ids = [str(r.id) for r in resources[:FALLBACK_CARDS]]
+        return _finish(session_id, Synthesis(answer_text=FALLBACK_TEXT, cite_ids=cite_ids), resources)
+    _, default_cards = SCHOOL_PROMPTS["ccny" if school_key == "ccny" else "general"]
+    return _from_agent_response(session_id, AgentResponse(text=FALLBACK_TEXT, cards=list(default_cards)))
+
+
+def _from_routed(partial: Dict[str, Any]) -> Synthesis:
+    # A (possibly partial) RoutedSynthesis/Synthesis dict -> Synthesis.
+    cite_ids = [c for c in partial.get("cite_ids") or [] if isinstance(c, str)]
+    return Synthesis(answer_text=partial.get("answer_text") or "", cite_ids=cite_ids)
+
+
+def _no_resources(session_id: str) -> ChatResponse:
+    # A greeting or thanks, however it was routed: the same reply in both modes.
+    metrics.tag(path="no_resources")
+    return ChatResponse(session_id=session_id, answer_text=_friendly_closing())
+
+
+async def _answer_once(
+    session_id: str,
+    message: str,
+    has_instate: Optional[bool],
+    school_code: Optional[str],
+    profile: Optional[Dict[str, Any]],
+    fetch_resources: Optional[FetchResources] = None,
+) -> ChatResponse:
+    prepared = await _prepare(
+        session_id, message, has_instate, school_code, profile, fetch_resources
+    )
+    if isinstance(prepared, ChatResponse):
+        return prepared
+    synth = prepared.cached
+    if synth is None:
+        # 5. Grounded synthesis: answer from these resources only.
+        async def generate() -> Union[Synthesis, RoutedSynthesis]:
+            if prepared.single_call:
+                return await route_and_synthesize(
+                    message, prepared.resources, prepared.note, prepared.tags
+                )
+            return await synthesize(message, prepared.resources, prepared.note, prepared.tags)
+
+        with metrics.stage("synth"):
+            try:
+                synth = await budget.call("synth", generate, prepared.deadline)
+            except TimeoutError:
+                budget.fallback("synth")
+                return _fallback_answer(session_id, prepared.school_key, prepared.resources)
+        if isinstance(synth, RoutedSynthesis):
+            if not synth.needs_resources:
+                return _no_resources(session_id)
+            synth = _from_routed(synth.model_dump())
+        prepared.remember(synth)
+    return _finish(session_id, synth, prepared.resources)
+
+
+# Identical concurrent turns share one pipeline run (serving/singleflight.py).
+# The key holds everything that can change the answer; SINGLE_FLIGHT=0 disables.
+SINGLE_FLIGHT = env_flag("SINGLE_FLIGHT", True)
+_inflight = SingleFlight()
+
+
+def _flight_key(
+    message: str,
+    has_instate: Optional[bool],
+    school_code: Optional[str],
+    profile: Optional[Dict[str, Any]],
+) -> Hashable:
+    profile = profile if isinstance(profile, dict) else {}
+    school_key = (school_code or profile.get("school_code") or "ccny").lower()
+    return (
+        normalize_message(message),
+        school_key,
+        has_instate,
+        str(profile.get("status") or ""),
+        str(profile.get("goal") or ""),
+    )
+
+
+async def _answer(
+    session_id: str,
+    message: str,
+    has_instate: Optional[bool],
+    school_code: Optional[str],
+    profile: Optional[Dict[str, Any]],
+    fetch_resources: Optional[FetchResources] = None,
+) -> ChatResponse:
+    if not SINGLE_FLIGHT:
+        return await _answer_once(
+            session_id, message, has_instate, school_code, profile, fetch_resources
+        )
+    # The shared run is session-agnostic; each waiter gets its own session_id.
+    key = _flight_key(message, has_instate, school_code, profile)
+    if key in _inflight:
+        metrics.tag(path="coalesced")
+    resp = await _inflight.do(
+        key,
+        lambda: _answer_once("", message, has_instate, school_code, profile, fetch_resources),
+    )
+    return resp.model_copy(update={"session_id": session_id})
+
+
+async def _answer_events(
+    session_id: str,
+    message: str,
+    has_instate: Optional[bool],
+    school_code: Optional[str],
+    profile: Optional[Dict[str, Any]],
+) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """_answer as a sequence of (event, data) pairs for /chat/stream.
+    Short-circuits arrive as one `ask` or `answer` event; a synthesized answer
+    arrives as `token` deltas and a `card` per cited resource as soon as its id
+    is complete. Every stream ends with `done` carrying the full ChatResponse."""
+    prepared = await _prepare(session_id, message, has_instate, school_code, profile)
+    if isinstance(prepared, ChatResponse):
+        if prepared.ask:
+            yield "ask", {"ask": prepared.ask}
+        else:
+            yield "answer", prepared.model_dump()
+        yield "done", prepared.model_dump()
+        return
+
+    if prepared.cached is not None:
+        resp = _finish(session_id, prepared.cached, prepared.resources)
+        yield "answer", resp.model_dump()
+        yield "done", resp.model_dump()
+        return
+
+    by_id = {str(r.id): r for r in prepared.resources}
+    sent_text = ""
+    sent_cards: set = set()
+    partial: Dict[str, Any] = {}
+    started = time.perf_counter()
+    chunks = synthesize_stream(
+        message, prepared.resources, prepared.note, prepared.tags, routed=prepared.single_call
+    )
+    timed_out = greeting = False
+    try:
+        async with aclosing(budget.stream("synth", chunks, prepared.deadline)) as stream:
+            async for partial in stream:
+                # needs_resources is generated first: a greeting stops here,
+                # before any of the model's own reply goes out.
+                if partial.get("needs_resources") is False:
+                    greeting = True
+                    break
+                text = partial.get("answer_text") or ""
+                if len(text) > len(sent_text) and text.startswith(sent_text):
+                    yield "token", {"text": text[len(sent_text):]}
+                    sent_text = text
+                for cid in partial.get("cite_ids") or []:
+                    if cid in by_id and cid not in sent_cards:
+                        sent_cards.add(cid)
+                        yield "card", _card_fragment(by_id[cid]).card.model_dump()
+    except TimeoutError:
+        budget.fallback("synth")
+        timed_out = True
+    metrics.STAGE_SECONDS.observe(time.perf_counter() - started, stage="synth")
+
+    if greeting:
+        resp = _no_resources(session_id)
+        yield "answer", resp.model_dump()
+        yield "done", resp.model_dump()
+        return
+
+    if timed_out and not sent_text:
+        resp = _fallback_answer(session_id, prepared.school_key, prepared.resources)
+        yield "answer", resp.model_dump()
+        yield "done", resp.model_dump()
+        return
+    # Out of time mid-answer: keep what was streamed, but don't cache it.
+    synth = _from_routed({**partial, "answer_text": sent_text}) if timed_out else _from_routed(partial)
+    if not timed_out:
+        prepared.remember(synth)
+    yield "done", _finish(session_id, synth, prepared.resources).model_dump()
 
 
 # ---------- Routes ----------
@@ -219,33 +711,60 @@ def root():
 
 @app.get("/health")
 def health():
+    if _agent is not None:
+        legacy = "loaded"
+    elif AGENT_ERROR is not None:
+        legacy = "failed"
+    else:
+        legacy = "not_loaded"
     return {
-        "ok": AGENT_ERROR is None or repository.pool_ready(),
+        "ok": repository.pool_ready() or _agent is not None,
         "resource_bank": repository.pool_ready(),
+        "legacy_agent": legacy,
         "legacy_agent_error": str(AGENT_ERROR) if AGENT_ERROR else None,
     }
 
-@app.post("/chat", response_model=ChatResponse)
-async def chat(req: ChatRequest):
-    sid = req.session_id or str(uuid.uuid4())
-    sess = SESSIONS.setdefault(sid, {"pending_residency": False, "orig_query": None, "school_code": None})
-    if req.school_code:
-        sess["school_code"] = req.school_code
 
+def _profile_has_instate(profile: Optional[Dict[str, Any]]) -> Optional[bool]:
     profile_has_instate = None
-    if isinstance(req.profile, dict) and "has_instate" in req.profile:
-        profile_has_instate = req.profile.get("has_instate")
+    if isinstance(profile, dict) and "has_instate" in profile:
+        profile_has_instate = profile.get("has_instate")
         if isinstance(profile_has_instate, str):
             val = profile_has_instate.strip().lower()
             if val in ["yes", "true", "1"]:
                 profile_has_instate = True
             elif val in ["no", "false", "0"]:
                 profile_has_instate = False
-    has_instate = profile_has_instate if isinstance(profile_has_instate, bool) else None
+    return profile_has_instate if isinstance(profile_has_instate, bool) else None
+
+
+@dataclass
+class _Turn:
+    """One /chat turn's session bookkeeping (shared by /chat and /chat/stream)."""
+    session_id: str
+    state: Dict[str, Any]
+    loaded: Dict[str, Any]
+    message: str
+    has_instate: Optional[bool] = None
+    early: Optional[ChatResponse] = None  # re-ask while residency is still unanswered
+
+
+async def _start_turn(req: ChatRequest) -> _Turn:
+    if req.session_id:
+        sid = req.session_id
+        sess = await sessions.load_state(sid)
+    else:
+        sid = str(uuid.uuid4())
+        sess = dict(sessions.DEFAULT_STATE)
+    turn = _Turn(session_id=sid, state=sess, loaded=dict(sess), message=req.message)
+    if req.school_code:
+        sess["school_code"] = req.school_code
+
+    has_instate = _profile_has_instate(req.profile)
 
     # Handle pending residency question
     if sess.get("pending_residency"):
-        orig_query = sess.get("orig_query", req.message)
+        orig_query = sess.get("orig_query") or req.message
 
         if has_instate is None:
             # Check NO first — "I do not have in-state" contains "i do" and
@@ -256,27 +775,182 @@ async def chat(req: ChatRequest):
                 has_instate = True
             else:
                 campus_label = "CCNY" if (sess.get("school_code") or "").lower() == "ccny" else "your campus"
-                return ChatResponse(
+                turn.early = ChatResponse(
                     session_id=sid,
                     ask=f"Just to confirm: do you already pay **in-state (resident) tuition** at {campus_label}?",
                 )
+                return turn
 
         sess["pending_residency"] = False
         sess["orig_query"] = None
-        return await _answer(sid, orig_query, has_instate, sess.get("school_code"), req.profile)
+        turn.message = orig_query
+
+    turn.has_instate = has_instate
+    return turn
 
-    # Normal flow
-    resp = await _answer(sid, req.message, has_instate, sess.get("school_code"), req.profile)
 
+async def _end_turn(turn: _Turn, ask: Optional[str]) -> None:
     # If we asked about residency, save state for the follow-up turn.
-    if resp.ask:
-        sess["pending_residency"] = True
-        sess["orig_query"] = req.message
+    if ask:
+        turn.state["pending_residency"] = True
+        turn.state["orig_query"] = turn.message
+    await sessions.save_state(turn.session_id, turn.state, turn.loaded)
+
+
+@app.post("/chat", response_model=ChatResponse)
+async def chat(req: ChatRequest):
+    with metrics.request("chat"):
+        turn = await _start_turn(req)
+        ask = None
+        try:
+            if turn.early:
+                metrics.tag(path="triage")
+                return _render(turn.early)
+            resp = await _answer(
+                turn.session_id, turn.message, turn.has_instate, turn.state.get("school_code"), req.profile
+            )
+            ask = resp.ask
+            return _render(resp)
+        finally:
+            await _end_turn(turn, ask)
 
-    return resp
+
+BATCH_ITEM_ERROR = "Something went wrong. Please try again."
+
+
+@app.post("/chat/batch", response_model=ChatBatchResponse)
+async def chat_batch(req: ChatBatchRequest):
+    """Many independent /chat turns in one call (FAQ refreshes, kiosks).
+    Identical questions are answered once, each distinct tag set is fetched
+    once (serving/batch.py), at most BATCH_CONCURRENCY pipelines run at a
+    time, and results come back in request order."""
+    with metrics.request("batch") as labels:
+        turns = await asyncio.gather(*(_start_turn(r) for r in req.requests))
+        shared = SharedRetrieval()
+        limit = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+        async def run(turn: _Turn, profile: Optional[Dict[str, Any]]) -> ChatResponse:
+            # Not through _inflight: the batch dedupes its own keys, and a
+            # /chat turn must never wait on this batch's fetch (cancelled
+            # with the batch).
+            async with limit:
+                return await _answer_once(
+                    "", turn.message, turn.has_instate, turn.state.get("school_code"),
+                    profile, shared.fetch,
+                )
+
+        keys: List[Optional[Hashable]] = []
+        runs: Dict[Hashable, asyncio.Task] = {}
+        for turn, r in zip(turns, req.requests):
+            key = None
+            if not turn.early:
+                key = _flight_key(turn.message, turn.has_instate, turn.state.get("school_code"), r.profile)
+                if key not in runs:
+                    runs[key] = asyncio.ensure_future(run(turn, r.profile))
+            keys.append(key)
+
+        results: List[ChatBatchItem] = []
+        try:
+            await asyncio.gather(*runs.values(), return_exceptions=True)
+            for turn, key in zip(turns, keys):
+                if key is None:
+                    results.append(ChatBatchItem(response=turn.early))
+                    continue
+                task = runs[key]
+                if task.cancelled():
+                    # .exception() would raise CancelledError and fail the batch.
+                    results.append(ChatBatchItem(error=BATCH_ITEM_ERROR))
+                    continue
+                error = task.exception()
+                if error is None:
+                    resp = task.result().model_copy(update={"session_id": turn.session_id})
+                    results.append(ChatBatchItem(response=resp))
+                elif isinstance(error, HTTPException):
+                    results.append(ChatBatchItem(error=str(error.detail)))
+                else:
+                    print(f"[server] batch item failed: {error}")
+                    results.append(ChatBatchItem(error=BATCH_ITEM_ERROR))
+        finally:
+            for task in runs.values():
+                task.cancel()
+            shared.cancel()
+            asks = [item.response.ask if item.response else None for item in results]
+            asks += [None] * (len(turns) - len(asks))
+            await asyncio.gather(*(_end_turn(t, a) for t, a in zip(turns, asks)))
+            labels.update(path="batch", cache="none")
+        return ChatBatchResponse(results=results)
+
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.post("/chat/stream")
+async def chat_stream(req: ChatRequest):
+    """Server-Sent Events version of /chat (see _answer_events for the events)."""
+    turn = await _start_turn(req)
+
+    async def events() -> AsyncIterator[str]:
+        ask = None
+        with metrics.request("stream"):
+            try:
+                # First byte goes out before any LLM work starts.
+                yield _sse("session", {"session_id": turn.session_id})
+                if turn.early:
+                    metrics.tag(path="triage")
+                    yield _sse("ask", {"ask": turn.early.ask})
+                    yield _sse("done", turn.early.model_dump())
+                    return
+                async for event, data in _answer_events(
+                    turn.session_id, turn.message, turn.has_instate,
+                    turn.state.get("school_code"), req.profile,
+                ):
+                    if event == "ask":
+                        ask = data["ask"]
+                    yield _sse(event, data)
+            except HTTPException as e:
+                metrics.tag(outcome="error")
+                yield _sse("error", {"detail": e.detail})
+            except Exception as e:
+                metrics.tag(outcome="error")
+                print(f"[server] stream failed: {e}")
+                yield _sse("error", {"detail": "Something went wrong. Please try again."})
+            finally:
+                await _end_turn(turn, ask)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# ---------- Metrics ----------
+def _stats_gauge(name: str, help: str, read) -> None:
+    # One gauge per stats() dict: {"hits": 3, ...} -> name{stat="hits"} 3.
+    metrics.REGISTRY.register(metrics.Gauge(
+        name, help, lambda: {(k,): v for k, v in read().items()}, ("stat",),
+    ))
+
+
+_stats_gauge("db_pool_connections", "asyncpg pool connections (size, idle, max).", repository.pool_stats)
+_stats_gauge("route_cache", "Router decision cache (size, hits, misses).", route_cache.stats)
+_stats_gauge("answer_cache", "Semantic answer cache (keys, entries, hits, misses).", answers.answer_cache.stats)
+_stats_gauge("chat_single_flight", "Single-flight runs started and turns coalesced.",
+             lambda: {"started": _inflight.started, "coalesced": _inflight.coalesced, "in_flight": len(_inflight)})
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics_endpoint():
+    """Prometheus text exposition for this worker process."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
 
 
 # ---------- Admin (Layer 4 review queue) ----------
+# Largest review-queue page; the console pages with next_cursor beyond it.
+ADMIN_PAGE_MAX = 200
+
+
 def _check_admin(x_admin_key: Optional[str]) -> None:
     expected = os.environ.get("ADMIN_API_KEY")
     if not expected or x_admin_key != expected:
@@ -285,21 +959,108 @@ def _check_admin(x_admin_key: Optional[str]) -> None:
         raise HTTPException(status_code=503, detail="Resource bank not configured")
 
 
-@app.get("/admin/pending")
-async def admin_pending(x_admin_key: Optional[str] = Header(default=None)):
+@app.get("/admin/pending", response_model=PendingPage)
+async def admin_pending(
+    limit: int = Query(default=50, ge=1, le=ADMIN_PAGE_MAX),
+    cursor: Optional[str] = None,
+    source: Optional[str] = None,
+    tier: Optional[int] = None,
+    tag: Optional[str] = None,
+    x_admin_key: Optional[str] = Header(default=None),
+):
+    """One page of the review queue in the slim list projection. Pass
+    `next_cursor` back as `cursor` for the following page; `source` filters
+    on added_by."""
     _check_admin(x_admin_key)
-    return [r.model_dump(mode="json") for r in await repository.list_pending()]
+    try:
+        items, next_cursor = await repository.list_pending(
+            limit=limit, cursor=cursor, added_by=source, tier=tier, tag=tag
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    total = await repository.estimate_pending(added_by=source, tier=tier, tag=tag)
+    return PendingPage(items=items, next_cursor=next_cursor, total_estimate=total)
 
 
 @app.post("/admin/approve/{resource_id}")
 async def admin_approve(resource_id: UUID, x_admin_key: Optional[str] = Header(default=None)):
     _check_admin(x_admin_key)
     await repository.approve(resource_id)
+    answers.invalidate()
     return {"ok": True}
 
 
+def _bulk_args(body: AdminBulkRequest, limit: int = ADMIN_BULK_MAX) -> dict:
+    f = body.filter or PendingFilter()
+    if body.ids is None and f.source is None and f.tier is None and f.tag is None:
+        # An empty selection would match the whole queue.
+        raise HTTPException(status_code=400, detail="Give ids, a filter, or both")
+    if body.ids is not None and len(set(body.ids)) > limit:
+        raise HTTPException(status_code=400, detail=f"At most {limit} ids per call")
+    # A filter beyond `limit` rows: the oldest are taken, call again for more.
+    return {"ids": body.ids, "added_by": f.source, "tier": f.tier, "tag": f.tag, "limit": limit}
+
+
+def _bulk_outcomes(body: AdminBulkRequest, done: List[UUID], outcome: str) -> List[AdminBulkOutcome]:
+    """Requested ids in request order (not_pending if the statement skipped
+    them), then whatever a filter matched beyond them."""
+    hit = set(done)
+    results = [
+        AdminBulkOutcome(id=i, outcome=outcome if i in hit else "not_pending")
+        for i in dict.fromkeys(body.ids or [])
+    ]
+    requested = {r.id for r in results}
+    results.extend(AdminBulkOutcome(id=i, outcome=outcome) for i in done if i not in requested)
+    return results
+
+
+async def _verify_approved(resources: List[Resource]) -> None:
+    # Imported here: the verifier pulls in the LLM client (see test_startup).
+    from verifier.batch import verify_resources
+
+    try:
+        await verify_resources(resources)
+    except Exception as e:
+        print(f"[server] immediate verification failed: {e}")
+    answers.invalidate()
+
+
+@app.post("/admin/approve", response_model=AdminBulkResponse)
+async def admin_approve_many(
+    body: AdminBulkRequest,
+    background: BackgroundTasks,
+    x_admin_key: Optional[str] = Header(default=None),
+):
+    """Approve many candidates in one statement; with verify=true (at most
+    ADMIN_VERIFY_MAX) they are verified after the response instead of waiting
+    for the nightly run."""
+    _check_admin(x_admin_key)
+    args = _bulk_args(body, ADMIN_VERIFY_MAX if body.verify else ADMIN_BULK_MAX)
+    approved = await repository.approve_many(**args) if body.ids != [] else []
+    answers.invalidate()
+    if body.verify and approved:
+        background.add_task(_verify_approved, approved)
+    return AdminBulkResponse(
+        results=_bulk_outcomes(body, [r.id for r in approved], "approved"),
+        count=len(approved),
+        verifying=len(approved) if body.verify else 0,
+    )
+
+
+@app.post("/admin/reject", response_model=AdminBulkResponse)
+async def admin_reject_many(body: AdminBulkRequest, x_admin_key: Optional[str] = Header(default=None)):
+    _check_admin(x_admin_key)
+    if body.verify:
+        raise HTTPException(status_code=400, detail="verify only applies to approve")
+    args = _bulk_args(body)
+    rejected = await repository.reject_many(**args) if body.ids != [] else []
+    answers.invalidate()
+    return AdminBulkResponse(results=_bulk_outcomes(body, rejected, "rejected"), count=len(rejected))
+
+
 @app.post("/admin/reject/{resource_id}")
 async def admin_reject(resource_id: UUID, x_admin_key: Optional[str] = Header(default=None)):
     _check_admin(x_admin_key)
     await repository.reject(resource_id)
+    answers.invalidate()
     return {"ok": True}
@@ -0,0 +1,153 @@
+# serving/answer_cache.py — reuse a prior grounded answer for a near-identical
+# question ("in-state tuition at CCNY?" vs "ccny in state tuition how").
+#
+# An entry is only reusable when everything else that shaped the answer is
+# identical: same routed tags, school, residency flag and context note (the
+# exact-match key), and the same bank version — so a verifier run or an admin
+# approve/reject invalidates every answer built on the old bank. Within a key
+# the question embedding must sit within `threshold` cosine similarity.
+
+from __future__ import annotations
+
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Hashable
+
+from bank import repository
+from bank.models import Resource
+from serving.config import env_float, env_int
+from serving.schema import Synthesis
+
+
+def _unit(vector: list[float]) -> list[float]:
+    norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+    return [x / norm for x in vector]
+
+
+def _dot(a: list[float], b: list[float]) -> float:
+    return sum(x * y for x, y in zip(a, b))
+
+
+@dataclass
+class _Entry:
+    embedding: list[float]  # unit length, so cosine similarity is a dot product
+    version: str
+    expires_at: float
+    synthesis: Synthesis
+    resources: list[Resource]
+
+
+class AnswerCache:
+    def __init__(
+        self,
+        maxsize: int = 512,
+        ttl: float = 6 * 3600.0,
+        threshold: float = 0.93,
+        per_key: int = 32,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.threshold = threshold
+        self.per_key = per_key
+        self._clock = clock
+        self._buckets: OrderedDict[Hashable, list[_Entry]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0
+
+    @staticmethod
+    def key(
+        tags: list[str], school_key: str, has_instate: bool | None, context_note: str
+    ) -> Hashable:
+        return (tuple(sorted(set(tags))), school_key, has_instate, context_note)
+
+    def lookup(
+        self, embedding: list[float], key: Hashable, version: str
+    ) -> tuple[Synthesis, list[Resource]] | None:
+        now = self._clock()
+        bucket = [
+            e for e in self._buckets.get(key, []) if e.version == version and e.expires_at > now
+        ]
+        if bucket:
+            self._buckets[key] = bucket
+            self._buckets.move_to_end(key)
+        else:
+            self._buckets.pop(key, None)
+
+        query = _unit(embedding)
+        best = max(bucket, key=lambda e: _dot(query, e.embedding), default=None)
+        if best is None or _dot(query, best.embedding) < self.threshold:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return best.synthesis.model_copy(deep=True), list(best.resources)
+
+    def store(
+        self,
+        embedding: list[float],
+        key: Hashable,
+        version: str,
+        synthesis: Synthesis,
+        resources: list[Resource],
+    ) -> None:
+        if not self.enabled:
+            return
+        bucket = self._buckets.setdefault(key, [])
+        bucket.append(_Entry(_unit(embedding), version, self._clock() + self.ttl, synthesis, resources))
+        del bucket[:-self.per_key]
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.maxsize:
+            self._buckets.popitem(last=False)
+
+    def clear(self) -> None:
+        self._buckets.clear()
+
+    def stats(self) -> dict:
+        return {
+            "keys": len(self._buckets),
+            "entries": sum(len(b) for b in self._buckets.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+# ANSWER_CACHE_SIZE=0 disables the cache (and the query embedding it needs).
+answer_cache = AnswerCache(
+    maxsize=env_int("ANSWER_CACHE_SIZE", 512, minimum=0, maximum=100_000),
+    ttl=env_float("ANSWER_CACHE_TTL_SECONDS", 6 * 3600, minimum=1, maximum=7 * 24 * 3600),
+    threshold=env_float("ANSWER_CACHE_THRESHOLD", 0.93, minimum=0.5, maximum=1.0),
+)
+
+# The bank version is one cheap aggregate query; re-check it at most every
+# VERSION_TTL seconds so it stays off the hot path. The verifier runs in a
+# separate process, so that short window is the worst-case staleness.
+_VERSION_TTL = env_float("ANSWER_CACHE_VERSION_TTL_SECONDS", 30, minimum=0, maximum=3600)
+_version: str | None = None
+_version_checked_at = 0.0
+
+
+async def bank_version() -> str:
+    global _version, _version_checked_at
+    # A live snapshot is pushed every change, so its version is exact and free.
+    live = repository.snapshot_version()
+    if live is not None:
+        return f"snapshot:{live}"
+    now = time.monotonic()
+    if _version is None or now - _version_checked_at >= _VERSION_TTL:
+        _version = await repository.bank_version()
+        _version_checked_at = now
+    return _version
+
+
+def invalidate() -> None:
+    """Called on in-process bank writes (admin approve/reject): forget the
+    memoized version and every cached answer right away."""
+    global _version
+    _version = None
+    answer_cache.clear()
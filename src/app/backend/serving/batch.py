@@ -0,0 +1,44 @@
+# serving/batch.py — shared state for one /chat/batch call.
+#
+# A batch replays many questions at once (FAQ refreshes, orientation kiosks).
+# Identical questions are answered once (server.py dedupes on the single-flight
+# key); SharedRetrieval makes every distinct tag set hit the bank once for the
+# whole batch; BATCH_CONCURRENCY bounds how many pipelines (router + synthesis
+# calls) run at the same time.
+
+from __future__ import annotations
+
+import asyncio
+
+from bank.models import Resource
+from serving import retrieval
+from serving.config import env_int
+from serving.singleflight import observe, tag_key
+
+BATCH_MAX = env_int("BATCH_MAX_REQUESTS", 100, minimum=1, maximum=1000)
+BATCH_CONCURRENCY = env_int("BATCH_CONCURRENCY", 8, minimum=1, maximum=64)
+
+
+class SharedRetrieval:
+    """retrieval.retrieve, memoized per tag set for one batch.
+    Unlike SpeculativeRetrieval a result is kept, not handed out once."""
+
+    def __init__(self) -> None:
+        self._tasks: dict[tuple[str, ...] | None, asyncio.Task] = {}
+
+    async def fetch(self, tags: list[str] | None) -> list[Resource]:
+        key = tag_key(tags)
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(retrieval.retrieve(tags))
+            task.add_done_callback(observe)
+            self._tasks[key] = task
+        return list(await asyncio.shield(task))
+
+    @property
+    def fetches(self) -> int:
+        return len(self._tasks)
+
+    def cancel(self) -> None:
+        for task in self._tasks.values():
+            task.cancel()
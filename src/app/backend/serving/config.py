@@ -0,0 +1,9 @@
+# serving/config.py — env-driven knobs for the serving hot path.
+# The readers live in the top-level settings.py so the verifier can use them
+# without importing the serving layer; they are re-exported here for serving.
+
+from __future__ import annotations
+
+from settings import env_flag, env_float, env_int
+
+__all__ = ["env_flag", "env_float", "env_int"]
@@ -0,0 +1,141 @@
+# serving/deadline.py — latency budget for one chat turn.
+#
+# Every turn gets a Deadline (CHAT_BUDGET_SECONDS); each stage runs under
+# min(its own cap, what is left of the budget). A stage that runs out raises
+# TimeoutError and server.py answers deterministically instead (keyword tags
+# for a slow router, cards from the retrieved rows for slow synthesis, the
+# school's default cards for the legacy agent), so a slow provider bounds the
+# tail instead of holding the request open.
+#
+# HEDGE_REQUESTS=1 adds hedging: once a call has taken longer than the recent
+# HEDGE_PERCENTILE latency of its stage, a second identical call starts and the
+# first to succeed wins. It trades extra tokens for a shorter tail.
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import defaultdict, deque
+from typing import AsyncIterator, Awaitable, Callable, Optional, TypeVar
+
+from serving import metrics
+from serving.config import env_flag, env_float, env_int
+
+T = TypeVar("T")
+
+CHAT_BUDGET = env_float("CHAT_BUDGET_SECONDS", 20.0, minimum=1.0, maximum=300.0)
+STAGE_TIMEOUTS = {
+    "route": env_float("ROUTE_TIMEOUT_SECONDS", 6.0, minimum=0.1, maximum=120.0),
+    "embed": env_float("EMBED_TIMEOUT_SECONDS", 2.0, minimum=0.1, maximum=60.0),
+    "retrieve": env_float("RETRIEVE_TIMEOUT_SECONDS", 3.0, minimum=0.1, maximum=60.0),
+    "synth": env_float("SYNTH_TIMEOUT_SECONDS", 15.0, minimum=0.1, maximum=300.0),
+    "agent": env_float("AGENT_TIMEOUT_SECONDS", 15.0, minimum=0.1, maximum=300.0),
+}
+HEDGE_REQUESTS = env_flag("HEDGE_REQUESTS")
+HEDGE_PERCENTILE = env_float("HEDGE_PERCENTILE", 95.0, minimum=50.0, maximum=99.9)
+HEDGE_MIN_SAMPLES = env_int("HEDGE_MIN_SAMPLES", 20, minimum=1, maximum=10_000)
+
+FALLBACKS = metrics.REGISTRY.register(metrics.Counter(
+    "chat_deadline_fallbacks_total",
+    "Stages that ran out of time and were answered deterministically.",
+    ("stage",),
+))
+HEDGES = metrics.REGISTRY.register(metrics.Counter(
+    "chat_hedged_requests_total",
+    "Second requests started because the first exceeded the hedge threshold.",
+    ("stage",),
+))
+
+
+class Deadline:
+    def __init__(self, budget: float = CHAT_BUDGET, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self.expires_at = clock() + budget
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - self._clock())
+
+    def timeout(self, stage: str) -> float:
+        return min(STAGE_TIMEOUTS[stage], self.remaining())
+
+
+class LatencyWindow:
+    """Recent successful latencies of one stage, for the hedge threshold."""
+
+    def __init__(self, size: int = 200) -> None:
+        self._samples: deque[float] = deque(maxlen=size)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, q: float, min_samples: int = HEDGE_MIN_SAMPLES) -> Optional[float]:
+        if len(self._samples) < min_samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+windows: defaultdict[str, LatencyWindow] = defaultdict(LatencyWindow)
+
+
+def fallback(stage: str) -> None:
+    FALLBACKS.inc(stage=stage)
+
+
+async def _hedged(stage: str, fn: Callable[[], Awaitable[T]], after: float) -> T:
+    tasks = [asyncio.ensure_future(fn())]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=after)
+        if not done:
+            HEDGES.inc(stage=stage)
+            tasks.append(asyncio.ensure_future(fn()))
+        pending = set(tasks)
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = error or task.exception()
+        raise error
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def call(stage: str, fn: Callable[[], Awaitable[T]], deadline: Deadline) -> T:
+    """await fn() within the stage's timeout and the turn's deadline, hedged
+    when enabled. Raises TimeoutError when out of time."""
+    timeout = deadline.timeout(stage)
+    if timeout <= 0:
+        raise TimeoutError(f"no time left for {stage}")
+    hedge_after = windows[stage].percentile(HEDGE_PERCENTILE) if HEDGE_REQUESTS else None
+    start = time.monotonic()
+    if hedge_after is not None and hedge_after < timeout:
+        result = await asyncio.wait_for(_hedged(stage, fn, hedge_after), timeout)
+    else:
+        result = await asyncio.wait_for(fn(), timeout)
+    windows[stage].record(time.monotonic() - start)
+    return result
+
+
+async def stream(stage: str, chunks: AsyncIterator[T], deadline: Deadline) -> AsyncIterator[T]:
+    """Re-yield `chunks` until the stage timeout or the deadline runs out,
+    then raise TimeoutError. Streams aren't hedged: the client already has
+    the first tokens."""
+    stop_at = time.monotonic() + deadline.timeout(stage)
+    iterator = chunks.__aiter__()
+    try:
+        while True:
+            left = stop_at - time.monotonic()
+            if left <= 0:
+                raise TimeoutError(f"{stage} stream ran out of time")
+            try:
+                yield await asyncio.wait_for(iterator.__anext__(), left)
+            except StopAsyncIteration:
+                return
+    finally:
+        aclose = getattr(iterator, "aclose", None)
+        if aclose is not None:
+            await aclose()
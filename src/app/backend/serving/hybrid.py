@@ -0,0 +1,60 @@
+# serving/hybrid.py — hybrid retrieval: semantic similarity to the question,
+# blended with tag overlap and source tier, so synthesis gets fewer, better
+# resources instead of the first 8 rows in tier order.
+#
+# Candidates come from repository.hybrid_candidates (vector top-k ∪ tag
+# matches); ranking is pure so it can be tested without a database.
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from bank import repository
+from bank.models import Resource
+from serving.config import env_float, env_int
+
+
+@dataclass(frozen=True)
+class HybridWeights:
+    semantic: float = 1.0        # x cosine similarity (1 - distance)
+    tags: float = 0.5            # x share of the routed tags the row carries
+    tier: float = 0.1            # x (2 - source_tier) / 2: official beats web-discovered
+    min_similarity: float = 0.2  # below this, a row needs a tag match to stay
+
+
+WEIGHTS = HybridWeights(
+    semantic=env_float("HYBRID_WEIGHT_SEMANTIC", 1.0, minimum=0, maximum=10),
+    tags=env_float("HYBRID_WEIGHT_TAGS", 0.5, minimum=0, maximum=10),
+    tier=env_float("HYBRID_WEIGHT_TIER", 0.1, minimum=0, maximum=10),
+    min_similarity=env_float("HYBRID_MIN_SIMILARITY", 0.2, minimum=0, maximum=1),
+)
+HYBRID_LIMIT = env_int("HYBRID_LIMIT", 5, minimum=1, maximum=50)
+HYBRID_CANDIDATES = env_int("HYBRID_CANDIDATES", 24, minimum=1, maximum=500)
+
+
+def rank(
+    candidates: list[tuple[Resource, float | None]],
+    tags: list[str] | None,
+    limit: int = HYBRID_LIMIT,
+    weights: HybridWeights = WEIGHTS,
+) -> list[Resource]:
+    wanted = set(tags or [])
+    scored = []
+    for r, distance in candidates:
+        similarity = 1.0 - distance if distance is not None else 0.0
+        overlap = len(wanted & set(r.tags)) / len(wanted) if wanted else 0.0
+        if overlap == 0 and similarity < weights.min_similarity:
+            continue
+        score = (
+            weights.semantic * similarity
+            + weights.tags * overlap
+            + weights.tier * (2 - min(max(r.source_tier, 0), 2)) / 2
+        )
+        scored.append((-score, r.source_tier, -r.created_at.timestamp(), r))
+    scored.sort(key=lambda item: item[:3])
+    return [item[3] for item in scored[:limit]]
+
+
+async def hybrid_retrieve(embedding: list[float], tags: list[str] | None) -> list[Resource]:
+    candidates = await repository.hybrid_candidates(embedding, tags, k=HYBRID_CANDIDATES)
+    return rank(candidates, tags)
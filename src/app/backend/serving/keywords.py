@@ -0,0 +1,39 @@
+# serving/keywords.py — a cheap, local guess at the router's tags.
+# Word-boundary keyword rules over the fixed TAGS vocabulary. Never the final
+# word (the router is); used only to start work before the route arrives.
+
+from __future__ import annotations
+
+import re
+
+from serving.schema import TAGS
+
+TAG_KEYWORDS: dict[str, tuple[str, ...]] = {
+    "scholarship": ("scholarships?", "fellowships?", "awards?", "thedream ?us", "golden door"),
+    "in-state-tuition": (
+        r"in[- ]?state", "resident tuition", "residency", "tuition", "affidavit",
+    ),
+    "daca": ("daca", "dreamers?", "deferred action"),
+    "undocumented": (
+        "undocumented", "undoc", "non[- ]?citizens?", r"no (?:ssn|social security|green ?card)",
+        "without (?:papers|status)", "tps", "asylee", "asylum", "sijs",
+    ),
+    "financial-aid": (
+        "financial aid", "fafsa", "tap", "dream act", "nysda", "grants?", "excelsior",
+        "aid", "loans?", "pay for (?:college|school)",
+    ),
+    "work-authorization": (
+        "work permit", "work authori[sz]ation", "ead", "itin", "jobs?", "employment",
+        "internships?", "work[- ]study",
+    ),
+}
+
+_PATTERNS = {
+    tag: re.compile(r"\b(?:" + "|".join(words) + r")\b", re.IGNORECASE)
+    for tag, words in TAG_KEYWORDS.items()
+}
+
+
+def guess_tags(message: str) -> list[str]:
+    """Tags whose keywords appear in the message, in TAGS order; [] if none."""
+    return [tag for tag in TAGS if tag in _PATTERNS and _PATTERNS[tag].search(message)]
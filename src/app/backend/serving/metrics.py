@@ -0,0 +1,238 @@
+# serving/metrics.py — latency and path metrics for /chat, Prometheus text format.
+#
+# A deliberately small in-house registry (counters, histograms and gauges read
+# at scrape time) so the serving image takes no new dependency. Metrics are
+# per process: with several uvicorn workers, scrape each or aggregate upstream.
+#
+# Usage in the pipeline:
+#   with metrics.request("chat"):        # one per HTTP turn
+#       with metrics.stage("route"): ...  # one per pipeline step
+#       metrics.tag(path="bank", cache="hit")
+
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _num(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, help, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{_labels(self.labelnames, key)} {_num(v)}"
+            for key, v in sorted(self._values.items())
+        ]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> (per-bucket counts, sum, count)
+        self._series: Dict[LabelValues, Tuple[List[int], float, int]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        counts, total, n = self._series.get(key) or ([0] * len(self.buckets), 0.0, 0)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[i] += 1
+        self._series[key] = (counts, total + value, n + 1)
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(self._key(labels))
+        return series[2] if series else 0
+
+    def samples(self) -> List[str]:
+        lines: List[str] = []
+        for key, (counts, total, n) in sorted(self._series.items()):
+            for bound, c in zip(self.buckets, counts):
+                le = _labels(self.labelnames, key, f'le="{_num(bound)}"')
+                lines.append(f"{self.name}_bucket{le} {c}")
+            inf = _labels(self.labelnames, key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{inf} {n}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_num(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {n}")
+        return lines
+
+
+class Gauge(_Metric):
+    """Read at scrape time: `read()` returns {label values: value}."""
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        read: Callable[[], Dict[LabelValues, float]],
+        labelnames: Sequence[str] = (),
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self._read = read
+
+    def samples(self) -> List[str]:
+        try:
+            values = self._read()
+        except Exception as e:
+            print(f"[metrics] gauge {self.name} failed: {e}")
+            return []
+        return [
+            f"{self.name}{_labels(self.labelnames, key)} {_num(v)}"
+            for key, v in sorted(values.items())
+        ]
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        blocks = [m.render() for m in self._metrics.values()]
+        return "\n".join(blocks) + "\n"
+
+
+REGISTRY = Registry()
+
+REQUEST_SECONDS = REGISTRY.register(Histogram(
+    "chat_request_seconds",
+    "End-to-end chat turn latency by endpoint, path taken and answer-cache outcome.",
+    ("endpoint", "path", "cache"),
+))
+REQUESTS = REGISTRY.register(Counter(
+    "chat_requests_total",
+    "Chat turns by endpoint, path taken, answer-cache outcome and result.",
+    ("endpoint", "path", "cache", "outcome"),
+))
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    "chat_stage_seconds",
+    "Latency of each serving pipeline stage.",
+    ("stage",),
+))
+
+# Labels of the turn being served. The dict is shared, not copied, so tags set
+# inside a task started from the turn (e.g. a single-flight run) still land.
+_current: ContextVar[Optional[Dict[str, str]]] = ContextVar("chat_metrics_labels", default=None)
+
+# Called with (labels, seconds) after every turn; the load-test harness
+# (bench/) uses this to keep raw samples for percentiles.
+Listener = Callable[[Dict[str, str], float], None]
+_listeners: List[Listener] = []
+
+
+def add_listener(fn: Listener) -> None:
+    _listeners.append(fn)
+
+
+def remove_listener(fn: Listener) -> None:
+    if fn in _listeners:
+        _listeners.remove(fn)
+
+
+def tag(**labels: str) -> None:
+    current = _current.get()
+    if current is not None:
+        current.update(labels)
+
+
+@contextmanager
+def request(endpoint: str) -> Iterator[Dict[str, str]]:
+    labels = {"endpoint": endpoint, "path": "unknown", "cache": "none", "outcome": "ok"}
+    token = _current.set(labels)
+    start = time.perf_counter()
+    try:
+        yield labels
+    except Exception:
+        labels["outcome"] = "error"
+        raise
+    finally:
+        try:
+            _current.reset(token)
+        except ValueError:
+            # An abandoned stream is finalized from another context.
+            pass
+        elapsed = time.perf_counter() - start
+        REQUEST_SECONDS.observe(elapsed, **labels)
+        REQUESTS.inc(**labels)
+        for fn in _listeners:
+            fn(dict(labels), elapsed)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.observe(time.perf_counter() - start, stage=name)
+
+
+def render() -> str:
+    return REGISTRY.render()
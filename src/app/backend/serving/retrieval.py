@@ -0,0 +1,26 @@
+# serving/retrieval.py — the per-turn bank query: one ranked round trip.
+#
+# repository.ranked_resources returns the rows sharing the most routed tags
+# first and backfills with the rest of the servable set (bank/ranking.py), so
+# a turn whose tags match nothing still gets resources without a second query.
+# The weights and limit are env knobs; the defaults rank by overlap count,
+# then tier, then recency.
+
+from __future__ import annotations
+
+from bank import repository
+from bank.models import Resource
+from bank.ranking import RankWeights
+from serving.config import env_float, env_int
+
+WEIGHTS = RankWeights(
+    overlap=env_float("RANK_WEIGHT_OVERLAP", 10.0, minimum=0, maximum=100),
+    tier=env_float("RANK_WEIGHT_TIER", 1.0, minimum=0, maximum=100),
+    recency=env_float("RANK_WEIGHT_RECENCY", 0.5, minimum=0, maximum=100),
+    half_life_days=env_float("RANK_RECENCY_HALF_LIFE_DAYS", 180.0, minimum=1, maximum=3650),
+)
+RETRIEVE_LIMIT = env_int("RETRIEVE_LIMIT", 8, minimum=1, maximum=50)
+
+
+async def retrieve(tags: list[str] | None) -> list[Resource]:
+    return await repository.ranked_resources(tags, limit=RETRIEVE_LIMIT, weights=WEIGHTS)
@@ -2,18 +2,26 @@
 
 from __future__ import annotations
 
-from langchain_openai import ChatOpenAI
+from typing import TYPE_CHECKING
 
+from serving.cache import TTLCache, normalize_message
+from serving.config import env_float, env_int
 from serving.schema import TAGS, QueryRoute
 
+if TYPE_CHECKING:
+    from langchain_openai import ChatOpenAI
+
 # temperature=0 for consistency: same question -> same tags.
-# Lazy init so the server can import (and fall back) without an API key.
+# Lazy init (and a lazy langchain import) so the server imports fast and can
+# fall back without an API key.
 _llm: ChatOpenAI | None = None
 
 
 def _get_llm() -> ChatOpenAI:
     global _llm
     if _llm is None:
+        from langchain_openai import ChatOpenAI
+
         _llm = ChatOpenAI(model="gpt-5.2", temperature=0)
     return _llm
 
@@ -26,8 +34,23 @@ ROUTER_SYSTEM = (
 )
 
 
+# The router is deterministic over a fixed vocabulary, so a repeat question
+# (after folding case/punctuation/whitespace) gets the same route back
+# without another LLM round trip. ROUTE_CACHE_SIZE=0 disables the cache.
+route_cache = TTLCache(
+    maxsize=env_int("ROUTE_CACHE_SIZE", 1024, minimum=0, maximum=100_000),
+    ttl=env_float("ROUTE_CACHE_TTL_SECONDS", 3600, minimum=1, maximum=7 * 24 * 3600),
+)
+
+
 async def route_query(message: str) -> QueryRoute:
+    key = normalize_message(message)
+    cached = route_cache.get(key)
+    if cached is not None:
+        return cached.model_copy(deep=True)
     # with_structured_output(QueryRoute) forces a validated QueryRoute back —
     # no JSON parsing, no "hope the model formatted it right".
     model = _get_llm().with_structured_output(QueryRoute)
-    return await model.ainvoke([("system", ROUTER_SYSTEM), ("user", message)])
+    route = await model.ainvoke([("system", ROUTER_SYSTEM), ("user", message)])
+    route_cache.set(key, route)
+    return route.model_copy(deep=True)
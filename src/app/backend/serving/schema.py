@@ -1,4 +1,4 @@
-# serving/schema.py — QueryRoute, Synthesis, and the fixed tag list.
+# serving/schema.py — QueryRoute, Synthesis, RoutedSynthesis, and the fixed tag list.
 
 from __future__ import annotations
 
@@ -25,3 +25,11 @@ class QueryRoute(BaseModel):
 class Synthesis(BaseModel):
     answer_text: str
     cite_ids: list[str]
+
+
+class RoutedSynthesis(BaseModel):
+    """Single-call pipeline mode: the route and the grounded answer together."""
+    needs_resources: bool
+    tags: list[str]
+    answer_text: str
+    cite_ids: list[str]
@@ -0,0 +1,113 @@
+# serving/sessions.py — where the residency follow-up state lives between turns.
+#
+# Two interchangeable stores: an in-process LRU with TTL (single worker, or no
+# database), and the UNLOGGED chat_sessions table (shared by every worker, so
+# a follow-up turn can land anywhere). SESSION_STORE picks one; "auto" uses
+# Postgres whenever the bank pool is up. Only sessions that carry state are
+# stored at all — a plain question-and-answer turn never writes.
+
+from __future__ import annotations
+
+import copy
+import os
+import time
+
+from bank import repository
+from serving.cache import TTLCache
+from serving.config import env_float, env_int
+
+DEFAULT_STATE = {"pending_residency": False, "orig_query": None, "school_code": None}
+
+SESSION_TTL = env_float("SESSION_TTL_SECONDS", 3600, minimum=60, maximum=7 * 24 * 3600)
+SESSION_MAX = env_int("SESSION_MAX", 10_000, minimum=1, maximum=10_000_000)
+
+
+class MemorySessionStore:
+    def __init__(self, maxsize: int = SESSION_MAX, ttl: float = SESSION_TTL) -> None:
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    async def load(self, session_id: str) -> dict | None:
+        state = self._cache.get(session_id)
+        return copy.deepcopy(state) if state is not None else None
+
+    async def save(self, session_id: str, state: dict) -> None:
+        self._cache.set(session_id, copy.deepcopy(state))
+
+    async def delete(self, session_id: str) -> None:
+        self._cache.pop(session_id)
+
+
+class PostgresSessionStore:
+    """chat_sessions table. If the table is unreachable, degrades to the
+    in-process store rather than failing the chat turn."""
+
+    def __init__(
+        self,
+        fallback: MemorySessionStore,
+        ttl: float = SESSION_TTL,
+        max_rows: int = SESSION_MAX,
+        purge_interval: float = 300.0,
+    ) -> None:
+        self.fallback = fallback
+        self.ttl = ttl
+        self.max_rows = max_rows
+        self.purge_interval = purge_interval
+        self._last_purge = time.monotonic()
+
+    async def load(self, session_id: str) -> dict | None:
+        try:
+            return await repository.load_session(session_id)
+        except Exception as e:
+            print(f"[sessions] load failed, using in-process store: {e}")
+            return await self.fallback.load(session_id)
+
+    async def save(self, session_id: str, state: dict) -> None:
+        try:
+            await repository.save_session(session_id, state, self.ttl)
+        except Exception as e:
+            print(f"[sessions] save failed, using in-process store: {e}")
+            await self.fallback.save(session_id, state)
+            return
+        if time.monotonic() - self._last_purge >= self.purge_interval:
+            self._last_purge = time.monotonic()
+            try:
+                await repository.purge_sessions(self.max_rows)
+            except Exception as e:
+                print(f"[sessions] purge failed: {e}")
+
+    async def delete(self, session_id: str) -> None:
+        try:
+            await repository.delete_session(session_id)
+        except Exception as e:
+            print(f"[sessions] delete failed: {e}")
+        await self.fallback.delete(session_id)
+
+
+memory_store = MemorySessionStore()
+postgres_store = PostgresSessionStore(fallback=memory_store)
+
+
+def store() -> MemorySessionStore | PostgresSessionStore:
+    kind = os.environ.get("SESSION_STORE", "auto").strip().lower()
+    if kind == "postgres" or (kind == "auto" and repository.pool_ready()):
+        return postgres_store
+    return memory_store
+
+
+async def load_state(session_id: str) -> dict:
+    state = await store().load(session_id)
+    return {**DEFAULT_STATE, **(state or {})}
+
+
+async def save_state(session_id: str, state: dict, previous: dict) -> None:
+    """Write only when the turn changed something; a session back at its
+    defaults is deleted instead of kept."""
+    if state == previous:
+        return
+    if not state.get("pending_residency") and not state.get("school_code"):
+        await store().delete(session_id)
+    else:
+        await store().save(session_id, state)
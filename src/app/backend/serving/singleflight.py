@@ -0,0 +1,58 @@
+# serving/singleflight.py — coalesce identical concurrent work.
+#
+# When a class is told to "ask the agent about the Dream Act", the same
+# question arrives dozens of times within seconds. The first caller for a key
+# starts the work; everyone else arriving while it is in flight awaits the
+# same task. Nothing is cached: once the task finishes the key is released.
+# tag_key and observe are shared with the other per-tag-set task maps
+# (serving/batch.py, serving/speculative.py).
+
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+def tag_key(tags: list[str] | None) -> tuple[str, ...] | None:
+    """Order- and duplicate-insensitive key for a retrieval tag set."""
+    return tuple(sorted(set(tags))) if tags else None
+
+
+def observe(task: asyncio.Task) -> None:
+    # If every waiter went away (or the task was never used), nobody reads a
+    # failure; read it here so it isn't reported as "exception was never
+    # retrieved".
+    if not task.cancelled():
+        task.exception()
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._inflight
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._release(key, t))
+            task.add_done_callback(observe)
+            self.started += 1
+        else:
+            self.coalesced += 1
+        # shield: one waiter disconnecting must not cancel everyone's answer.
+        return await asyncio.shield(task)
+
+    def _release(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
@@ -0,0 +1,41 @@
+# serving/speculative.py — retrieval started while the router is still running.
+#
+# The router call is the slow step; retrieval only needs its tags. So before
+# routing we start the ranked fetch (serving/retrieval.py) for the tag set the
+# keyword pre-classifier guesses. When the route arrives, a fetch for the same
+# tag set reuses the speculative result; a wrong guess costs one wasted query
+# and the correct one runs as usual. Leftovers are cancelled.
+
+from __future__ import annotations
+
+import asyncio
+
+from bank.models import Resource
+from serving import retrieval
+from serving.keywords import guess_tags
+from serving.singleflight import observe, tag_key
+
+
+class SpeculativeRetrieval:
+    def __init__(self, message: str) -> None:
+        self._tasks: dict[tuple[str, ...] | None, asyncio.Task] = {}
+        self._start(guess_tags(message) or None)
+
+    def _start(self, tags: list[str] | None) -> None:
+        key = tag_key(tags)
+        if key not in self._tasks:
+            task = asyncio.create_task(retrieval.retrieve(tags))
+            task.add_done_callback(observe)
+            self._tasks[key] = task
+
+    async def fetch(self, tags: list[str] | None) -> list[Resource]:
+        """Same contract as retrieval.retrieve."""
+        task = self._tasks.pop(tag_key(tags), None)
+        if task is not None:
+            return await task
+        return await retrieval.retrieve(tags)
+
+    def cancel(self) -> None:
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks.clear()
@@ -4,19 +4,28 @@
 
 from __future__ import annotations
 
-from langchain_openai import ChatOpenAI
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, AsyncIterator, Optional, Sequence
 
 from bank.models import Resource
-from serving.schema import Synthesis
+from serving import metrics
+from serving.config import env_int
+from serving.schema import TAGS, RoutedSynthesis, Synthesis
+
+if TYPE_CHECKING:
+    from langchain_openai import ChatOpenAI
 
 # Slightly higher temperature for natural answer prose (still grounded).
-# Lazy init so the server can import (and fall back) without an API key.
+# Lazy init (and a lazy langchain import) so the server imports fast and can
+# fall back without an API key.
 _llm: ChatOpenAI | None = None
 
 
 def _get_llm() -> ChatOpenAI:
     global _llm
     if _llm is None:
+        from langchain_openai import ChatOpenAI
+
         _llm = ChatOpenAI(model="gpt-5.2", temperature=0.3)
     return _llm
 
@@ -30,25 +39,167 @@ SYNTH_SYSTEM = (
 )
 
 
-def _format_resources(resources: list[Resource]) -> str:
-    return "\n".join(
-        f"[{r.id}] {r.name} — {r.description or ''} "
-        f"(url: {r.url}; category: {r.category}; authority: {r.authority or 'n/a'}; "
-        f"deadline: {r.deadline.isoformat() if r.deadline else 'unknown'}; "
-        f"tags: {', '.join(r.tags)})"
-        for r in resources
+# Prompt budget for the resource list. Tokens are estimated as chars / 4,
+# which is close enough for English prose to keep the prompt bounded.
+RESOURCE_TOKEN_BUDGET = env_int("SYNTH_RESOURCE_TOKENS", 1500, minimum=100, maximum=32000)
+DESCRIPTION_CHARS = env_int("SYNTH_DESCRIPTION_CHARS", 280, minimum=40, maximum=4000)
+
+PROMPT_TOKENS = metrics.REGISTRY.register(metrics.Histogram(
+    "synth_resource_tokens",
+    "Estimated tokens of the resource list sent to synthesis.",
+    buckets=(100, 250, 500, 1000, 1500, 2000, 4000, 8000),
+))
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + 3) // 4
+
+
+def _truncate(text: str, limit: int) -> str:
+    text = " ".join(text.split())
+    if len(text) <= limit:
+        return text
+    cut = text[:limit].rsplit(" ", 1)[0] or text[:limit]
+    return cut.rstrip(" ,.;:—-") + "…"
+
+
+@dataclass
+class ResourceBlock:
+    """The resource list as the model sees it. Rows are cited by short local
+    aliases (r1, r2, … zero-padded to one width, so a half-streamed alias
+    never matches a complete one); `resolve` maps them back to resource ids
+    before the server's cite_ids guard runs."""
+    text: str
+    aliases: dict[str, str] = field(default_factory=dict)
+    tokens: int = 0
+    dropped: int = 0
+
+    def resolve(self, cite_ids: Sequence) -> list[str]:
+        # Unknown aliases pass through unchanged; the by_id guard drops them.
+        return [self.aliases.get(c, c) for c in cite_ids if isinstance(c, str)]
+
+
+def _format_resources(
+    resources: list[Resource],
+    tags: Optional[Sequence[str]] = None,
+    budget: int = RESOURCE_TOKEN_BUDGET,
+) -> ResourceBlock:
+    """Compact, budgeted resource list. The url never reaches the prompt
+    (cards are built from DB rows), tags are shown only where they match the
+    route, and rows past the budget — the lowest ranked — are left out."""
+    width = len(str(len(resources)))
+    focus = set(tags or ())
+    lines: list[str] = []
+    aliases: dict[str, str] = {}
+    tokens = 0
+    for i, r in enumerate(resources, start=1):
+        alias = f"r{i:0{width}d}"
+        facts = [r.category]
+        if r.authority:
+            facts.append(r.authority)
+        if r.deadline:
+            facts.append(f"deadline {r.deadline.isoformat()}")
+        elif r.deadline_type == "rolling":
+            facts.append("rolling deadline")
+        shown = [t for t in r.tags if t in focus]
+        if shown:
+            facts.append(", ".join(shown))
+        line = f"[{alias}] {r.name}"
+        if r.description:
+            line += f" — {_truncate(r.description, DESCRIPTION_CHARS)}"
+        line += f" ({'; '.join(facts)})"
+        cost = estimate_tokens(line) + 1
+        if lines and tokens + cost > budget:
+            break
+        lines.append(line)
+        aliases[alias] = str(r.id)
+        tokens += cost
+    return ResourceBlock(
+        text="\n".join(lines),
+        aliases=aliases,
+        tokens=tokens,
+        dropped=len(resources) - len(lines),
     )
 
 
-async def synthesize(
-    message: str, resources: list[Resource], context_note: str = ""
-) -> Synthesis:
-    model = _get_llm().with_structured_output(Synthesis)
+# Single-call mode: the router's instructions folded into synthesis.
+ROUTED_SYNTH_SYSTEM = SYNTH_SYSTEM + (
+    f" Also classify the question: tags are any that apply from this exact list: {', '.join(TAGS)}. "
+    "Set needs_resources to false only for greetings or thanks — then reply briefly "
+    "and return an empty cite_ids list."
+)
+
+
+def _messages(
+    message: str,
+    resources: list[Resource],
+    context_note: str,
+    system: str = SYNTH_SYSTEM,
+    tags: Optional[Sequence[str]] = None,
+) -> tuple[list[tuple[str, str]], ResourceBlock]:
+    block = _format_resources(resources, tags)
+    PROMPT_TOKENS.observe(block.tokens)
     user = f"Question: {message}\n"
     if context_note:
         user += f"\nContext about the student:\n{context_note}\n"
-    user += f"\nResources:\n{_format_resources(resources)}"
-    return await model.ainvoke([("system", SYNTH_SYSTEM), ("user", user)])
+    user += f"\nResources:\n{block.text}"
+    return [("system", system), ("user", user)], block
+
+
+async def synthesize(
+    message: str,
+    resources: list[Resource],
+    context_note: str = "",
+    tags: Optional[Sequence[str]] = None,
+) -> Synthesis:
+    model = _get_llm().with_structured_output(Synthesis)
+    messages, block = _messages(message, resources, context_note, tags=tags)
+    synth = await model.ainvoke(messages)
+    return synth.model_copy(update={"cite_ids": block.resolve(synth.cite_ids)})
+
+
+async def route_and_synthesize(
+    message: str,
+    resources: list[Resource],
+    context_note: str = "",
+    tags: Optional[Sequence[str]] = None,
+) -> RoutedSynthesis:
+    """Route and answer in one structured call (PIPELINE_MODE=single).
+    `resources` are pre-filtered locally since the route isn't known yet."""
+    model = _get_llm().with_structured_output(RoutedSynthesis)
+    messages, block = _messages(message, resources, context_note, ROUTED_SYNTH_SYSTEM, tags)
+    routed = await model.ainvoke(messages)
+    return routed.model_copy(update={"cite_ids": block.resolve(routed.cite_ids)})
+
+
+# A plain JSON schema (not the Pydantic class) makes langchain parse the
+# stream as partial JSON, so each chunk is a progressively fuller dict.
+_SYNTHESIS_SCHEMA = Synthesis.model_json_schema()
+_ROUTED_SYNTHESIS_SCHEMA = RoutedSynthesis.model_json_schema()
+
+
+async def synthesize_stream(
+    message: str,
+    resources: list[Resource],
+    context_note: str = "",
+    tags: Optional[Sequence[str]] = None,
+    *,
+    routed: bool = False,
+) -> AsyncIterator[dict]:
+    """The same call as synthesize (or route_and_synthesize when `routed`),
+    streamed: yields partial dicts whose answer_text grows token by token;
+    cite_ids fill in as generated, already mapped back to resource ids."""
+    if routed:
+        schema, system = _ROUTED_SYNTHESIS_SCHEMA, ROUTED_SYNTH_SYSTEM
+    else:
+        schema, system = _SYNTHESIS_SCHEMA, SYNTH_SYSTEM
+    model = _get_llm().with_structured_output(schema)
+    messages, block = _messages(message, resources, context_note, system, tags)
+    async for partial in model.astream(messages):
+        if isinstance(partial, dict):
+            if isinstance(partial.get("cite_ids"), list):
+                partial = {**partial, "cite_ids": block.resolve(partial["cite_ids"])}
+            yield partial
 
 
 def to_card(r: Resource) -> dict:
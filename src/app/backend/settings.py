@@ -0,0 +1,31 @@
+# settings.py — env readers shared by every layer (serving, verifier,
+# discovery's jobs). A bad or out-of-range value falls back to something safe
+# instead of crashing the process at import. Each module reads its own knobs
+# with these at import time; none of them depends on another layer for it.
+
+from __future__ import annotations
+
+import os
+
+
+def env_int(name: str, default: int, *, minimum: int, maximum: int) -> int:
+    try:
+        value = int(os.environ.get(name, default))
+    except ValueError:
+        return default
+    return max(minimum, min(value, maximum))
+
+
+def env_float(name: str, default: float, *, minimum: float, maximum: float) -> float:
+    try:
+        value = float(os.environ.get(name, default))
+    except ValueError:
+        return default
+    return max(minimum, min(value, maximum))
+
+
+def env_flag(name: str, default: bool = False) -> bool:
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in {"1", "true", "yes", "on"}
@@ -0,0 +1,26 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+
+from bank.models import Resource
+
+NOW = datetime(2026, 6, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def make_resource():
+    """Resource factory: a servable row named "resource", created at NOW.
+    Any field can be overridden; `age_days` backdates created/updated_at and
+    the url follows the name unless given."""
+
+    def make(age_days: float = 0, **overrides) -> Resource:
+        created = NOW - timedelta(days=age_days)
+        name = overrides.setdefault("name", "resource")
+        fields = {
+            "id": uuid4(), "url": f"https://example.edu/{name}", "status": "valid",
+            "created_at": created, "updated_at": created,
+        }
+        return Resource(**{**fields, **overrides})
+
+    return make
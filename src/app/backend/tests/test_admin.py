@@ -0,0 +1,82 @@
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+
+import server
+from bank import repository
+
+HEADERS = {"x-admin-key": "secret"}
+
+
+def _admin(monkeypatch):
+    monkeypatch.setenv("ADMIN_API_KEY", "secret")
+    monkeypatch.setattr(repository, "pool_ready", lambda: True)
+    return TestClient(server.app)
+
+
+def test_bulk_approve_reports_per_id_outcomes_and_verifies_after_response(monkeypatch, make_resource):
+    rows = [make_resource(name=n, status="unverified", added_by="discovery") for n in "ab"]
+    missing = uuid4()
+    calls, verified = [], []
+
+    async def approve_many(**kwargs):
+        calls.append(kwargs)
+        return rows
+
+    async def verify_resources(resources, concurrency=5):
+        verified.extend(r.id for r in resources)
+
+    monkeypatch.setattr(repository, "approve_many", approve_many)
+    monkeypatch.setattr("verifier.batch.verify_resources", verify_resources)
+    client = _admin(monkeypatch)
+
+    resp = client.post("/admin/approve", headers=HEADERS, json={
+        "ids": [str(rows[1].id), str(missing)], "filter": {"source": "discovery"}, "verify": True,
+    })
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert [(r["id"], r["outcome"]) for r in body["results"]] == [
+        (str(rows[1].id), "approved"), (str(missing), "not_pending"), (str(rows[0].id), "approved"),
+    ]
+    assert body["count"] == 2 and body["verifying"] == 2
+    assert calls == [{
+        "ids": [rows[1].id, missing], "added_by": "discovery", "tier": None, "tag": None,
+        "limit": server.ADMIN_VERIFY_MAX,
+    }]
+    assert verified == [rows[0].id, rows[1].id]
+
+
+def test_bulk_reject_refuses_an_empty_selection(monkeypatch):
+    async def reject_many(**kwargs):
+        raise AssertionError("must not touch the queue")
+
+    monkeypatch.setattr(repository, "reject_many", reject_many)
+    client = _admin(monkeypatch)
+
+    assert client.post("/admin/reject", headers=HEADERS, json={"filter": {}}).status_code == 400
+    assert client.post("/admin/reject", headers={"x-admin-key": "wrong"}, json={"ids": []}).status_code == 401
+    empty = client.post("/admin/reject", headers=HEADERS, json={"ids": []}).json()
+    assert empty == {"results": [], "count": 0, "verifying": 0}
+
+
+def test_bulk_approve_caps_filters_and_immediate_verification(monkeypatch):
+    calls = []
+
+    async def approve_many(**kwargs):
+        calls.append(kwargs["limit"])
+        return []
+
+    monkeypatch.setattr(repository, "approve_many", approve_many)
+    monkeypatch.setattr(server, "ADMIN_VERIFY_MAX", 2)
+    client = _admin(monkeypatch)
+
+    for verify in (False, True):
+        resp = client.post("/admin/approve", headers=HEADERS, json={"filter": {"tier": 2}, "verify": verify})
+        assert resp.status_code == 200
+    too_many = client.post("/admin/approve", headers=HEADERS, json={
+        "ids": [str(uuid4()) for _ in range(3)], "verify": True,
+    })
+
+    assert too_many.status_code == 400
+    assert calls == [server.ADMIN_BULK_MAX, 2]
@@ -0,0 +1,50 @@
+import asyncio
+
+from agent import DEFAULT_CARDS_CCNY, DEFAULT_CARDS_GENERAL, Agent, StructuredAnswer, StructuredCard
+
+
+class FakeStructured:
+    def __init__(self, result):
+        self.result = result
+        self.messages = None
+
+    async def ainvoke(self, messages):
+        self.messages = messages
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+def _agent(result):
+    # Skip __init__: no API key or network needed for the structured path.
+    agent = Agent.__new__(Agent)
+    agent.structured_llm = FakeStructured(result)
+    return agent
+
+
+def test_arun_builds_cards_from_structured_output():
+    cards = [StructuredCard(name=f"Card {i}", url=f"https://example.edu/{i}") for i in range(8)]
+    agent = _agent(StructuredAnswer(answer="Here is how.", cards=cards))
+
+    result = asyncio.run(agent.arun("scholarships?", has_instate=True, school_code="ccny"))
+
+    assert result.text == "Here is how."
+    assert [c.name for c in result.cards] == [f"Card {i}" for i in range(6)]
+    assert [s.url for s in result.sources] == [c.url for c in result.cards]
+    assert "CCNY Immigrant Student Center" in agent.structured_llm.messages[1].content
+
+
+def test_arun_falls_back_to_school_defaults():
+    empty = _agent(StructuredAnswer(answer="Nothing specific.", cards=[]))
+    assert asyncio.run(empty.arun("aid?", has_instate=True, school_code="bmcc")).cards == DEFAULT_CARDS_GENERAL
+
+    failing = _agent(RuntimeError("provider down"))
+    assert asyncio.run(failing.arun("aid?", has_instate=True, school_code="ccny")).cards == DEFAULT_CARDS_CCNY
+
+
+def test_arun_short_circuits_without_llm():
+    agent = _agent(RuntimeError("should not be called"))
+
+    assert asyncio.run(agent.arun("thanks!")).text.startswith("Of course!")
+    assert asyncio.run(agent.arun("I'm undocumented, any aid?")).ask
+    assert agent.structured_llm.messages is None
@@ -0,0 +1,86 @@
+import asyncio
+
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+import server
+from bank import repository
+from serving import sessions
+from serving.batch import SharedRetrieval
+
+
+def test_shared_retrieval_fetches_each_tag_set_once(monkeypatch):
+    calls = []
+
+    async def fake_ranked_resources(tags=None, limit=8, weights=None):
+        calls.append(tags)
+        await asyncio.sleep(0)
+        return [f"rows for {tags}"]
+
+    monkeypatch.setattr(repository, "ranked_resources", fake_ranked_resources)
+
+    async def run():
+        shared = SharedRetrieval()
+        first = await asyncio.gather(
+            shared.fetch(["daca", "scholarship"]),
+            shared.fetch(["scholarship", "daca"]),
+            shared.fetch(None),
+        )
+        later = await shared.fetch(["daca", "scholarship"])
+        return first, later, shared.fetches
+
+    (same, reordered, fallback), later, fetches = asyncio.run(run())
+
+    assert same == reordered == later == ["rows for ['daca', 'scholarship']"]
+    assert fallback == ["rows for None"]
+    assert calls == [["daca", "scholarship"], None]
+    assert fetches == 2
+
+
+def test_batch_endpoint_dedupes_keeps_order_and_reports_item_errors(monkeypatch):
+    runs = []
+
+    async def fake_answer_once(session_id, message, has_instate, school_code, profile, fetch_resources=None):
+        runs.append((message, fetch_resources))
+        await asyncio.sleep(0)
+        if message == "forbidden":
+            raise HTTPException(status_code=500, detail="Agent not available")
+        if message == "dropped":
+            raise asyncio.CancelledError()
+        return server.ChatResponse(session_id=session_id, answer_text=f"answer to {message}")
+
+    async def load_state(session_id):
+        return {**sessions.DEFAULT_STATE, "pending_residency": session_id == "pending"}
+
+    saved = {}
+
+    async def save_state(session_id, state, previous):
+        saved[session_id] = state
+
+    monkeypatch.setattr(server, "_answer_once", fake_answer_once)
+    monkeypatch.setattr(sessions, "load_state", load_state)
+    monkeypatch.setattr(sessions, "save_state", save_state)
+    client = TestClient(server.app)
+    flights = server._inflight.started
+
+    resp = client.post("/chat/batch", json={"requests": [
+        {"session_id": "a", "message": "How do I get in-state tuition?"},
+        {"session_id": "pending", "message": "maybe later"},
+        {"session_id": "b", "message": "forbidden"},
+        {"session_id": "c", "message": "how do i get in-state tuition"},
+        {"session_id": "d", "message": "dropped"},
+    ]})
+
+    assert resp.status_code == 200
+    items = resp.json()["results"]
+    # Same single-flight key: one pipeline run, each item keeps its own session.
+    assert [m for m, _ in runs] == ["How do I get in-state tuition?", "forbidden", "dropped"]
+    assert items[0]["response"]["answer_text"] == items[3]["response"]["answer_text"]
+    assert [items[0]["response"]["session_id"], items[3]["response"]["session_id"]] == ["a", "c"]
+    # An unanswered residency question re-asks without running the pipeline.
+    assert "in-state" in items[1]["response"]["ask"] and saved["pending"]["pending_residency"]
+    assert items[2] == {"response": None, "error": "Agent not available"}
+    assert items[4] == {"response": None, "error": server.BATCH_ITEM_ERROR}
+    # Retrieval is batch-scoped and the /chat single flight is never joined.
+    assert all(isinstance(fetch.__self__, SharedRetrieval) for _, fetch in runs)
+    assert server._inflight.started == flights
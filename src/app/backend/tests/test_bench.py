@@ -0,0 +1,30 @@
+import asyncio
+
+from bench.standins import Fixtures, Latencies, Latency, StandIns
+from bench.workload import percentile, run_workload
+
+
+def test_percentile_is_nearest_rank():
+    values = list(range(1, 101))
+    assert (percentile(values, 50), percentile(values, 95), percentile(values, 99)) == (50, 95, 99)
+    assert percentile([], 99) == 0.0
+
+
+def test_bench_smoke_reports_every_turn_by_path():
+    fixtures = Fixtures()
+    fixtures.put("synth", "How do I apply for the NYS Dream Act?", {"answer_text": "Use HESC.", "cite": [0]})
+    stand_ins = StandIns(Latencies(synth=Latency(5, 0), scale=0.1), fixtures)
+
+    with stand_ins.install():
+        report = asyncio.run(run_workload(requests=40, concurrency=8))
+
+    assert report.requests == 40
+    assert sum(p.count for p in report.paths.values()) == 40
+    assert not any(p.errors for p in report.paths.values())
+    assert {"chat:closing", "chat:triage"} <= set(report.paths)
+    assert any(label.startswith("chat:bank") for label in report.paths)
+    assert stand_ins.calls["synth"] >= 1 and stand_ins.calls["agent"] == 0
+    assert "req/s" in report.format()
+
+    replayed = asyncio.run(stand_ins.synthesize("how do i apply for the nys dream act", stand_ins.bank))
+    assert (replayed.answer_text, replayed.cite_ids) == ("Use HESC.", [str(stand_ins.bank[0].id)])
@@ -0,0 +1,82 @@
+import asyncio
+
+from serving import router
+from serving.answer_cache import AnswerCache
+from serving.cache import TTLCache, normalize_message
+from serving.schema import QueryRoute, Synthesis
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_normalize_message_folds_case_punctuation_and_whitespace():
+    assert normalize_message("  How do I get IN-STATE tuition?? ") == "how do i get in state tuition"
+    assert normalize_message("how do i get in state tuition") == normalize_message("How do I get in-state tuition!")
+
+
+def test_ttl_cache_expires_entries_and_counts():
+    clock = FakeClock()
+    cache = TTLCache(maxsize=4, ttl=10, clock=clock)
+    cache.set("a", 1)
+
+    assert cache.get("a") == 1
+    clock.now = 10
+    assert cache.get("a") is None
+    assert cache.stats() == {"size": 0, "hits": 1, "misses": 1}
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_route_query_skips_llm_for_repeat_questions(monkeypatch):
+    calls = []
+
+    class FakeModel:
+        async def ainvoke(self, messages):
+            calls.append(messages)
+            return QueryRoute(tags=["in-state-tuition"], needs_resources=True)
+
+    class FakeLLM:
+        def with_structured_output(self, schema):
+            return FakeModel()
+
+    monkeypatch.setattr(router, "_get_llm", lambda: FakeLLM())
+    monkeypatch.setattr(router, "route_cache", TTLCache(maxsize=8, ttl=60))
+
+    first = asyncio.run(router.route_query("How do I get in-state tuition?"))
+    first.tags.append("mutated")
+    second = asyncio.run(router.route_query("how do i get IN STATE tuition"))
+
+    assert len(calls) == 1
+    assert second.tags == ["in-state-tuition"]
+    assert router.route_cache.stats()["hits"] == 1
+
+
+def test_answer_cache_reuses_only_close_matches_with_same_key_and_version():
+    cache = AnswerCache(maxsize=8, ttl=60, threshold=0.95)
+    key = AnswerCache.key(["in-state-tuition"], "ccny", None, "")
+    synth = Synthesis(answer_text="Sign the affidavit.", cite_ids=["abc"])
+    cache.store([1.0, 0.0, 0.0], key, "v1", synth, [])
+
+    hit = cache.lookup([0.99, 0.05, 0.0], key, "v1")
+    assert hit is not None and hit[0].answer_text == "Sign the affidavit."
+
+    assert cache.lookup([0.0, 1.0, 0.0], key, "v1") is None
+    assert cache.lookup([1.0, 0.0, 0.0], AnswerCache.key(["in-state-tuition"], "bmcc", None, ""), "v1") is None
+    # A new bank version expires everything built on the old one.
+    assert cache.lookup([1.0, 0.0, 0.0], key, "v2") is None
+    assert cache.lookup([1.0, 0.0, 0.0], key, "v1") is None
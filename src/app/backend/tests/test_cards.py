@@ -0,0 +1,32 @@
+import json
+from datetime import timedelta
+
+import server
+from serving.schema import Synthesis
+
+
+def test_card_fragments_are_reused_per_row_version(make_resource):
+    row = make_resource(name="renewal", tags=["daca"])
+
+    first = server._card_fragment(row)
+    again = server._card_fragment(row.model_copy())
+    edited = server._card_fragment(
+        row.model_copy(update={"status": "stale", "updated_at": row.updated_at + timedelta(days=1)})
+    )
+
+    assert again is first
+    assert edited is not first and edited.card.verified is False
+    assert json.loads(first.card_json) == first.card.model_dump()
+
+
+def test_render_matches_plain_serialization_and_keeps_the_cite_guard(make_resource):
+    rows = [make_resource(name="a"), make_resource(name="b")]
+    synth = Synthesis(answer_text="Try these.", cite_ids=[str(rows[1].id), "made-up", str(rows[0].id)])
+
+    resp = server._finish("sid", synth, rows).model_copy(update={"session_id": "other"})
+    body = json.loads(server._render(resp).body)
+
+    assert body == json.loads(resp.model_dump_json())
+    assert body["session_id"] == "other"
+    assert [c["name"] for c in body["cards"]] == ["b", "a"]
+    assert [s["title"] for s in body["sources"]] == ["b", "a"]
@@ -0,0 +1,98 @@
+# tests/test_dates.py — the deterministic date pre-pass in front of the LLM.
+# It may only answer when it is sure; everything else escalates. Like
+# test_decide, the number that must stay at zero is false "valid".
+
+import asyncio
+from datetime import date
+
+from verifier import extract
+from verifier.dates import extract_local
+from verifier.decide import decide_status
+from verifier.schema import DateExtraction, DatedFact
+
+TODAY = date(2026, 6, 1)
+RESOURCE = "NYS Dream Act"
+
+# (page text, expected decision, whether the pre-pass may answer it alone)
+PAGES = [
+    ("NYS Dream Act deadline: March 1, 2027.", "valid", True),
+    ("NYS Dream Act applications are due Feb. 1, 2026. Award letters follow in April.", "stale", True),
+    ("The NYS Dream Act application opens January 5, 2027 and is due Mar. 1, 2027.", "valid", True),
+    ("The NYS Dream Act application is accepted on a rolling basis.", "valid", True),
+    # Only a past cycle's deadline, an opening date, an event or an update: no deadline.
+    ("The 2025-26 NYS Dream Act application was due March 1, 2026.", "unverifiable", False),
+    ("The NYS Dream Act application opens October 1, 2026.", "unverifiable", False),
+    ("Join our NYS Dream Act info session on July 10, 2026 to learn more.", "unverifiable", False),
+    ("Page last updated May 1, 2026.", "unverifiable", False),
+    # Ambiguous: no year, competing cues, implausibly far ahead, no cue at all.
+    ("Apply to the NYS Dream Act by March 1 to be considered.", "unverifiable", False),
+    ("NYS Dream Act webinar on the deadline: November 2, 2026.", "unverifiable", False),
+    ("NYS Dream Act deadline: 3/1/2035.", "unverifiable", False),
+    ("NYS Dream Act cycle\nMarch 1, 2027", "unverifiable", False),
+    ("", "unverifiable", False),
+    # Not anchored to the resource: the deadline may be another program's.
+    ("Deadline: March 1, 2027.", "unverifiable", False),
+    ("Smith Scholarship deadline: March 1, 2027.", "unverifiable", False),
+    # Multi-program aid pages: which deadline is ours is the model's call.
+    ("Smith Scholarship deadline: March 1, 2027. NYS Dream Act deadline: February 1, 2026.", "unverifiable", False),
+    ("FAFSA deadline June 30, 2027. NYS Dream Act deadline: May 1, 2026.", "unverifiable", False),
+    ("NYS Dream Act priority deadline is 2/1/2027. Final deadline: 2027-03-15.", "valid", False),
+    # "due" that isn't a deadline, and programs on hold or ended.
+    ("Due to budget cuts, the NYS Dream Act is suspended until March 1, 2027.", "unverifiable", False),
+    ("NYS Dream Act award checks are due out April 15, 2027.", "unverifiable", False),
+    ("The NYS Dream Act deadline: March 1, 2027. Applications are paused.", "unverifiable", False),
+    ("The NYS Dream Act is no longer accepting applications on a rolling basis.", "unverifiable", False),
+    ("The NYS Dream Act does not review applications on a rolling basis.", "unverifiable", False),
+]
+
+
+def test_prepass_answers_only_plain_pages():
+    for text, _, confident in PAGES:
+        assert extract_local(text, RESOURCE, TODAY).confident is confident, text
+
+
+def test_prepass_roles_and_evidence():
+    text = "The NYS Dream Act application opens January 5, 2027 and is due Mar. 1, 2027."
+    facts = extract_local(text, RESOURCE, TODAY).facts
+    assert [(f.date, f.role) for f in facts] == [
+        (date(2027, 1, 5), "opens"), (date(2027, 3, 1), "final_deadline"),
+    ]
+    assert all("due Mar. 1, 2027" in f.evidence for f in facts)
+
+
+def test_prepass_false_valid_rate():
+    false_valid = 0
+    for text, expected, _ in PAGES:
+        local = extract_local(text, RESOURCE, TODAY)
+        if local.confident and decide_status(local.facts, TODAY).status == "valid" and expected != "valid":
+            false_valid += 1
+    assert false_valid == 0
+
+
+def test_extract_dates_escalates_only_when_unsure(monkeypatch):
+    calls = []
+
+    class FakeModel:
+        async def ainvoke(self, messages):
+            calls.append(messages)
+            return DateExtraction(dated_facts=[
+                DatedFact(date=date(2027, 3, 1), role="final_deadline", evidence="Apply by March 1"),
+            ])
+
+    class FakeLLM:
+        def with_structured_output(self, schema):
+            return FakeModel()
+
+    monkeypatch.setattr(extract, "_get_llm", lambda: FakeLLM())
+
+    plain = asyncio.run(extract.extract_dates("NYS Dream Act deadline: March 1, 2027.", RESOURCE))
+    assert plain.dated_facts[0].date == date(2027, 3, 1) and calls == []
+
+    unsure = asyncio.run(extract.extract_dates("Apply by March 1 to be considered.", RESOURCE))
+    assert len(calls) == 1 and unsure.dated_facts[0].evidence == "Apply by March 1"
+
+    other = asyncio.run(extract.extract_dates(
+        "Smith Scholarship deadline: March 1, 2027. NYS Dream Act deadline: February 1, 2026.", RESOURCE
+    ))
+    assert len(calls) == 2 and "Resource: NYS Dream Act" in calls[1][1][1]
+    assert other.dated_facts[0].evidence == "Apply by March 1"
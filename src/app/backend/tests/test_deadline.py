@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+from serving import deadline as budget
+
+
+def test_deadline_caps_each_stage_by_what_is_left():
+    now = [100.0]
+    d = budget.Deadline(budget=5.0, clock=lambda: now[0])
+
+    assert d.timeout("route") == min(budget.STAGE_TIMEOUTS["route"], 5.0)
+    now[0] += 4.5
+    assert d.timeout("synth") == pytest.approx(0.5)
+    now[0] += 1
+    assert d.remaining() == 0.0
+
+
+def test_call_raises_timeout_instead_of_waiting():
+    async def slow():
+        await asyncio.sleep(1)
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(budget.call("route", slow, budget.Deadline(budget=0.05)))
+
+
+def test_hedged_call_takes_the_faster_second_request(monkeypatch):
+    monkeypatch.setattr(budget, "HEDGE_REQUESTS", True)
+    monkeypatch.setattr(budget, "windows", budget.defaultdict(budget.LatencyWindow))
+    for _ in range(budget.HEDGE_MIN_SAMPLES):
+        budget.windows["synth"].record(0.01)
+    delays = [1.0, 0.0]
+    started = []
+
+    async def provider():
+        started.append(1)
+        await asyncio.sleep(delays[len(started) - 1])
+        return f"answer {len(started)}"
+
+    before = budget.HEDGES.value(stage="synth")
+    result = asyncio.run(budget.call("synth", provider, budget.Deadline(budget=5.0)))
+
+    assert result == "answer 2"
+    assert len(started) == 2
+    assert budget.HEDGES.value(stage="synth") == before + 1
+
+
+def test_stream_stops_at_the_deadline():
+    async def chunks():
+        yield "first"
+        await asyncio.sleep(1)
+        yield "late"
+
+    async def run():
+        got = []
+        with pytest.raises(TimeoutError):
+            async for chunk in budget.stream("synth", chunks(), budget.Deadline(budget=0.05)):
+                got.append(chunk)
+        return got
+
+    assert asyncio.run(run()) == ["first"]
+
+
+def test_fallback_answer_uses_retrieved_rows_then_school_defaults():
+    from datetime import datetime, timezone
+    from uuid import uuid4
+
+    import server
+    from agent import DEFAULT_CARDS_GENERAL
+    from bank.models import Resource
+
+    now = datetime(2026, 6, 1, tzinfo=timezone.utc)
+    rows = [
+        Resource(id=uuid4(), name=f"r{i}", url=f"https://example.edu/{i}", created_at=now, updated_at=now)
+        for i in range(5)
+    ]
+
+    from_rows = server._fallback_answer("sid", "ccny", rows)
+    from_defaults = server._fallback_answer("sid", "bmcc", [])
+
+    assert [c.name for c in from_rows.cards] == ["r0", "r1", "r2"]
+    assert from_rows.answer_text == server.FALLBACK_TEXT
+    assert [c.name for c in from_defaults.cards] == [c.name for c in DEFAULT_CARDS_GENERAL]
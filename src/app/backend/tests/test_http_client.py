@@ -0,0 +1,55 @@
+import asyncio
+
+import httpx
+
+from verifier import http_client
+from verifier.liveness import check_liveness
+
+
+def test_liveness_reuses_the_shared_client_and_falls_back_to_get(monkeypatch):
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append((request.method, request.headers["user-agent"]))
+        return httpx.Response(405 if request.method == "HEAD" else 200)
+
+    async def run():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler), headers=http_client.REQUEST_HEADERS)
+        monkeypatch.setattr(http_client, "_client", client)
+        first = await check_liveness("https://www.ccny.cuny.edu/immigrants")
+        second = await check_liveness("https://www.ccny.cuny.edu/financialaid")
+        assert http_client.get_client() is client
+        await http_client.close_client()
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert first == (True, "https://www.ccny.cuny.edu/immigrants")
+    assert second[0] is True
+    assert [m for m, _ in seen] == ["HEAD", "GET", "HEAD", "GET"]
+    assert all("DreamersAgentVerifier" in ua for _, ua in seen)
+    assert http_client._client is None
+
+
+def test_host_slots_cap_concurrency_per_host_only(monkeypatch):
+    monkeypatch.setattr(http_client, "PER_HOST_CONNECTIONS", 2)
+    active: dict[str, int] = {}
+    peak: dict[str, int] = {}
+
+    async def hit(url: str, host: str) -> None:
+        async with http_client.host_slot(url):
+            active[host] = active.get(host, 0) + 1
+            peak[host] = max(peak.get(host, 0), active[host])
+            await asyncio.sleep(0.01)
+            active[host] -= 1
+
+    async def run():
+        await asyncio.gather(
+            *(hit(f"https://hesc.ny.gov/{i}", "hesc") for i in range(6)),
+            *(hit(f"https://example.edu/{i}", "edu") for i in range(2)),
+        )
+        await http_client.close_client()
+
+    asyncio.run(run())
+
+    assert peak == {"hesc": 2, "edu": 2}
@@ -0,0 +1,22 @@
+from serving.hybrid import HybridWeights, rank
+
+
+def test_rank_blends_similarity_tags_and_tier(make_resource):
+    close = make_resource(name="close", tags=["general"])
+    tagged = make_resource(name="tagged", tags=["in-state-tuition"])
+    official_tagged = make_resource(name="official-tagged", tags=["in-state-tuition"], source_tier=0)
+    unrelated = make_resource(name="unrelated", tags=["work-authorization"])
+    candidates = [(close, 0.1), (tagged, 0.5), (official_tagged, 0.5), (unrelated, 0.95)]
+
+    ranked = rank(candidates, ["in-state-tuition"], limit=5, weights=HybridWeights())
+
+    assert [r.name for r in ranked] == ["official-tagged", "tagged", "close"]
+
+
+def test_rank_keeps_unembedded_rows_only_on_tag_match(make_resource):
+    tagged = make_resource(name="tagged", tags=["daca"])
+    untagged = make_resource(name="untagged", tags=["general"])
+
+    ranked = rank([(tagged, None), (untagged, None)], ["daca"], limit=5, weights=HybridWeights())
+
+    assert [r.name for r in ranked] == ["tagged"]
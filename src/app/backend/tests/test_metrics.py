@@ -0,0 +1,38 @@
+import pytest
+
+from serving import metrics
+
+
+def test_histogram_renders_cumulative_buckets():
+    h = metrics.Histogram("t_seconds", "test", ("stage",), buckets=(0.1, 1.0))
+    h.observe(0.05, stage="route")
+    h.observe(0.5, stage="route")
+    h.observe(3.0, stage="route")
+
+    text = h.render()
+
+    assert "# TYPE t_seconds histogram" in text
+    assert 't_seconds_bucket{stage="route",le="0.1"} 1' in text
+    assert 't_seconds_bucket{stage="route",le="1"} 2' in text
+    assert 't_seconds_bucket{stage="route",le="+Inf"} 3' in text
+    assert 't_seconds_count{stage="route"} 3' in text
+
+
+def test_request_labels_follow_the_path_and_record_errors():
+    before_ok = metrics.REQUESTS.value(endpoint="test", path="bank", cache="hit", outcome="ok")
+    before_err = metrics.REQUESTS.value(endpoint="test", path="legacy", cache="none", outcome="error")
+
+    with metrics.request("test"):
+        with metrics.stage("route"):
+            metrics.tag(path="bank")
+        metrics.tag(cache="hit")
+    with pytest.raises(RuntimeError):
+        with metrics.request("test"):
+            metrics.tag(path="legacy")
+            raise RuntimeError("agent down")
+    metrics.tag(path="ignored")  # outside a turn: no-op
+
+    assert metrics.REQUESTS.value(endpoint="test", path="bank", cache="hit", outcome="ok") == before_ok + 1
+    assert metrics.REQUESTS.value(endpoint="test", path="legacy", cache="none", outcome="error") == before_err + 1
+    assert metrics.REQUEST_SECONDS.count(endpoint="test", path="bank", cache="hit") >= 1
+    assert 'chat_stage_seconds_count{stage="route"}' in metrics.render()
@@ -1,4 +1,10 @@
+import asyncio
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from bank import repository
 from bank.repository import _strip_nul
+from bank.snapshot import ResourceSnapshot
 
 
 def test_strip_nul_recurses_through_verification_payload():
@@ -21,3 +27,120 @@ def test_strip_nul_recurses_through_verification_payload():
             }
         ],
     }
+
+
+def test_get_active_resources_reads_live_snapshot(monkeypatch, make_resource):
+    row = make_resource(name="Dream Act", url="https://hesc.ny.gov/dream", tags=["financial-aid"])
+    # No pool: any Postgres access would fail, so a result proves the snapshot served it.
+    monkeypatch.setattr(repository, "_pool", None)
+    monkeypatch.setattr(repository, "_snapshot", ResourceSnapshot([row]))
+
+    assert asyncio.run(repository.get_active_resources(tags=["financial-aid"])) == [row]
+
+
+class _FakeConn:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    async def fetch(self, sql, *args):
+        self.calls.append((sql, args))
+        return self.rows
+
+
+class _FakePool:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def acquire(self):
+        pool = self
+
+        class _Acquire:
+            async def __aenter__(self):
+                return pool.conn
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return _Acquire()
+
+
+def test_pending_cursor_round_trips_and_rejects_garbage():
+    created = datetime(2026, 9, 1, 12, 30, tzinfo=timezone.utc)
+    rid = uuid4()
+    cursor = repository.encode_cursor(created, rid)
+
+    assert repository.decode_cursor(cursor) == (created, rid)
+    for bad in ("not-a-cursor", "", repository.encode_cursor(created, rid)[:-3]):
+        try:
+            repository.decode_cursor(bad)
+        except ValueError:
+            continue
+        raise AssertionError(f"accepted {bad!r}")
+
+
+def test_list_pending_pages_by_keyset_with_filters(monkeypatch):
+    base = datetime(2026, 9, 1, tzinfo=timezone.utc)
+    rows = [
+        {"id": uuid4(), "name": f"r{i}", "url": f"https://example.org/{i}",
+         "tags": ["daca"], "added_by": "discovery", "created_at": base}
+        for i in range(3)
+    ]
+    conn = _FakeConn(rows)
+    monkeypatch.setattr(repository, "_pool", _FakePool(conn))
+    after = repository.encode_cursor(base, uuid4())
+
+    items, next_cursor = asyncio.run(repository.list_pending(
+        limit=2, cursor=after, added_by="discovery", tag="daca"
+    ))
+
+    # One extra row fetched means there is a next page, starting after the last item.
+    assert [i.name for i in items] == ["r0", "r1"]
+    assert repository.decode_cursor(next_cursor) == (base, rows[1]["id"])
+    sql, args = conn.calls[0]
+    assert "verification" not in sql
+    assert "(created_at, id) > ($3, $4)" in sql and "limit $5" in sql
+    assert args[:2] == ("discovery", ["daca"]) and args[-1] == 3
+
+    conn.rows = rows[:2]
+    assert asyncio.run(repository.list_pending(limit=2))[1] is None
+
+
+def test_plan_rows_reads_explain_json():
+    assert repository.plan_rows('[{"Plan": {"Node Type": "Seq Scan", "Plan Rows": 1234}}]') == 1234
+
+
+def test_bulk_approve_is_one_statement_over_ids_and_filters(monkeypatch):
+    conn = _FakeConn([])
+    monkeypatch.setattr(repository, "_pool", _FakePool(conn))
+    ids = [uuid4(), uuid4()]
+
+    asyncio.run(repository.approve_many(ids=ids, tier=3))
+
+    (sql, args), = conn.calls
+    assert sql.startswith("update resource_bank set status = 'unverified'")
+    assert "status = 'pending_review' and source_tier = $1 and id = any($2::uuid[])" in sql
+    assert "returning" in sql and args == (3, ids)
+
+
+def test_bulk_reject_by_filter_is_capped_oldest_first(monkeypatch):
+    conn = _FakeConn([])
+    monkeypatch.setattr(repository, "_pool", _FakePool(conn))
+
+    asyncio.run(repository.reject_many(added_by="discovery", limit=500))
+
+    (sql, args), = conn.calls
+    assert sql.startswith("delete from resource_bank where id in (select id from resource_bank where")
+    assert "order by created_at, id limit $2 for update)" in sql and args == ("discovery", 500)
+
+
+def test_ranked_resources_is_one_query_when_the_snapshot_is_off(monkeypatch):
+    conn = _FakeConn([])
+    monkeypatch.setattr(repository, "_pool", _FakePool(conn))
+    monkeypatch.setattr(repository, "_snapshot", None)
+
+    assert asyncio.run(repository.ranked_resources(["daca"], limit=5)) == []
+
+    (sql, args), = conn.calls
+    # No tag predicate in WHERE: non-matching rows backfill the same query.
+    assert "&&" not in sql and args[0] == ["daca"] and args[-1] == 5
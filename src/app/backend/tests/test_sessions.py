@@ -0,0 +1,39 @@
+import asyncio
+
+from serving import sessions
+from serving.sessions import MemorySessionStore
+
+
+def test_memory_store_keeps_only_sessions_with_state(monkeypatch):
+    store = MemorySessionStore(maxsize=2, ttl=60)
+    monkeypatch.setattr(sessions, "memory_store", store)
+    monkeypatch.setenv("SESSION_STORE", "memory")
+
+    async def run():
+        fresh = await sessions.load_state("s1")
+        asked = {**fresh, "pending_residency": True, "orig_query": "I'm undocumented, aid?"}
+        await sessions.save_state("s1", asked, fresh)
+        reloaded = await sessions.load_state("s1")
+        answered = {**reloaded, "pending_residency": False, "orig_query": None}
+        await sessions.save_state("s1", answered, reloaded)
+        return fresh, reloaded
+
+    fresh, reloaded = asyncio.run(run())
+
+    assert fresh == sessions.DEFAULT_STATE
+    assert reloaded["pending_residency"] is True
+    assert reloaded["orig_query"] == "I'm undocumented, aid?"
+    # Back at defaults -> deleted, so memory doesn't grow with finished sessions.
+    assert len(store) == 0
+
+
+def test_memory_store_is_bounded():
+    store = MemorySessionStore(maxsize=2, ttl=60)
+
+    async def run():
+        for sid in ("a", "b", "c"):
+            await store.save(sid, {"pending_residency": True})
+        return await store.load("a"), await store.load("c")
+
+    assert asyncio.run(run()) == (None, {"pending_residency": True})
+    assert len(store) == 2
@@ -0,0 +1,50 @@
+import asyncio
+
+from serving.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_run():
+    flight = SingleFlight()
+    runs = []
+
+    async def work():
+        runs.append(1)
+        await asyncio.sleep(0.01)
+        return "answer"
+
+    async def run():
+        results = await asyncio.gather(*(flight.do("dream act", work) for _ in range(5)))
+        later = await flight.do("dream act", work)
+        return results, later
+
+    results, later = asyncio.run(run())
+
+    assert results == ["answer"] * 5
+    assert later == "answer"
+    assert len(runs) == 2  # the key is released once the first run finishes
+    assert (flight.started, flight.coalesced, len(flight)) == (2, 4, 0)
+
+
+def test_failures_reach_every_waiter_and_cancel_is_isolated():
+    flight = SingleFlight()
+
+    async def boom():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("router down")
+
+    async def slow():
+        await asyncio.sleep(0.02)
+        return "ok"
+
+    async def run():
+        failed = await asyncio.gather(*(flight.do("k", boom) for _ in range(3)), return_exceptions=True)
+        first = asyncio.ensure_future(flight.do("s", slow))
+        second = asyncio.ensure_future(flight.do("s", slow))
+        await asyncio.sleep(0)
+        first.cancel()
+        return failed, await second
+
+    failed, survivor = asyncio.run(run())
+
+    assert all(isinstance(e, RuntimeError) for e in failed)
+    assert survivor == "ok"
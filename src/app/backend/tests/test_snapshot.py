@@ -0,0 +1,42 @@
+from bank.snapshot import ResourceSnapshot
+
+
+def test_query_matches_serving_order_and_tag_overlap(make_resource):
+    old_official = make_resource(name="old-official", tags=["scholarship"], source_tier=0, age_days=30)
+    new_official = make_resource(name="new-official", tags=["in-state-tuition"], source_tier=0, age_days=1)
+    both = make_resource(name="both", tags=["scholarship", "daca"], source_tier=1)
+    web = make_resource(name="web", tags=["daca"], source_tier=2)
+    snap = ResourceSnapshot([web, both, old_official, new_official])
+
+    assert [r.name for r in snap.query(None)] == ["new-official", "old-official", "both", "web"]
+    assert [r.name for r in snap.query(["scholarship", "daca"])] == ["old-official", "both", "web"]
+    assert [r.name for r in snap.query(["scholarship", "daca"], limit=1)] == ["old-official"]
+    assert snap.query(["work-authorization"]) == []
+
+
+def test_only_servable_rows_are_kept(make_resource):
+    stale = make_resource(name="stale", tags=["scholarship"], status="stale")
+    blank = make_resource(name="blank", tags=["scholarship"], url="  ")
+    valid = make_resource(name="valid", tags=["scholarship"])
+    snap = ResourceSnapshot([stale, blank, valid])
+
+    assert len(snap) == 1
+    version = snap.version
+    snap.upsert(valid.model_copy(update={"status": "stale"}))
+    assert snap.query(["scholarship"]) == []
+    assert snap.version != version
+
+
+def test_ranked_puts_tag_overlap_first_and_backfills_in_serving_order(make_resource):
+    one_tag = make_resource(name="one-tag", tags=["scholarship"], source_tier=0, age_days=30)
+    two_tags = make_resource(name="two-tags", tags=["scholarship", "daca"], source_tier=2)
+    official = make_resource(name="official", tags=["in-state-tuition"], source_tier=0, age_days=1)
+    web = make_resource(name="web", tags=["work-authorization"], source_tier=2, age_days=2)
+    snap = ResourceSnapshot([web, official, two_tags, one_tag])
+
+    ranked = snap.ranked(["scholarship", "daca"])
+    assert [r.name for r in ranked] == ["two-tags", "one-tag", "official", "web"]
+    assert [r.name for r in snap.ranked(["scholarship", "daca"], limit=2)] == ["two-tags", "one-tag"]
+    # No matching tag at all still serves something, in tier-then-recency order.
+    assert [r.name for r in snap.ranked(["visa"], limit=2)] == ["official", "one-tag"]
+    assert [r.name for r in snap.ranked(None)] == [r.name for r in snap.query(None)]
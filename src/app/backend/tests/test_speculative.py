@@ -0,0 +1,42 @@
+import asyncio
+
+from bank import repository
+from serving.keywords import guess_tags
+from serving.speculative import SpeculativeRetrieval
+
+
+def test_guess_tags_uses_fixed_vocabulary_in_order():
+    assert guess_tags("How do I get in-state tuition with DACA?") == ["in-state-tuition", "daca"]
+    assert guess_tags("Any scholarships for undocumented students? I can't file FAFSA") == [
+        "scholarship", "undocumented", "financial-aid",
+    ]
+    assert guess_tags("hello there") == []
+
+
+def test_speculative_fetch_reuses_matching_tag_set(monkeypatch):
+    calls = []
+
+    async def fake_ranked_resources(tags=None, limit=8, weights=None):
+        calls.append(tags)
+        return [f"rows for {tags}"]
+
+    monkeypatch.setattr(repository, "ranked_resources", fake_ranked_resources)
+
+    async def run():
+        spec = SpeculativeRetrieval("daca scholarships")
+        await asyncio.sleep(0)
+        started = list(calls)
+        same_set = await spec.fetch(["daca", "scholarship"])
+        fallback = await spec.fetch(None)
+        miss = await spec.fetch(["financial-aid"])
+        spec.cancel()
+        return started, same_set, fallback, miss
+
+    started, same_set, fallback, miss = asyncio.run(run())
+
+    # Only the guessed tag set is speculated: the ranked query backfills itself.
+    assert started == [["scholarship", "daca"]]
+    assert same_set == ["rows for ['scholarship', 'daca']"]
+    assert fallback == ["rows for None"]
+    assert miss == ["rows for ['financial-aid']"]
+    assert len(calls) == 3
@@ -0,0 +1,96 @@
+import json
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+BACKEND = Path(__file__).resolve().parent.parent
+HEAVY = ("langchain_openai", "langchain_core", "openai")
+
+
+def _import_profile(module: str) -> tuple[list[str], list[tuple[int, str]]]:
+    """Import `module` in a fresh interpreter under -X importtime; return the
+    heavy modules it loaded and (cumulative µs, module) for every import."""
+    code = (
+        f"import json, sys; import {module}; "
+        f"print(json.dumps(sorted(m for m in sys.modules if m.split('.')[0] in {HEAVY!r})))"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=BACKEND, capture_output=True, text=True, timeout=120, check=True,
+    )
+    profile = []
+    for line in proc.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            if cumulative.strip().isdigit():
+                profile.append((int(cumulative), name.strip()))
+    return json.loads(proc.stdout.strip().splitlines()[-1]), profile
+
+
+def test_server_import_leaves_llm_clients_unloaded():
+    loaded, profile = _import_profile("server")
+    slowest = sorted(profile, reverse=True)[:10]
+    report = "\n".join(f"{us / 1000:8.1f} ms  {name}" for us, name in slowest)
+
+    assert loaded == [], f"server imported {loaded}; slowest imports:\n{report}"
+    assert any(name == "server" for _, name in profile)
+
+
+def _fresh_agent(monkeypatch, build):
+    import server
+    from bank import repository
+
+    monkeypatch.setattr(server, "Agent", build)
+    monkeypatch.setattr(server, "_agent", None)
+    monkeypatch.setattr(server, "AGENT_ERROR", None)
+    monkeypatch.setattr(server, "_agent_failed_at", 0.0)
+    monkeypatch.setattr(repository, "pool_ready", lambda: False)
+    return server
+
+
+def test_agent_is_built_once_across_threads(monkeypatch):
+    builds = []
+
+    def build():
+        builds.append(threading.get_ident())
+        time.sleep(0.05)
+        return object()
+
+    server = _fresh_agent(monkeypatch, build)
+    assert TestClient(server.app).get("/health").json()["legacy_agent"] == "not_loaded"
+
+    threads = [threading.Thread(target=server._get_agent) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(builds) == 1
+    health = TestClient(server.app).get("/health").json()
+    assert health["ok"] and health["legacy_agent"] == "loaded"
+
+
+def test_failed_agent_build_is_retried_after_backoff(monkeypatch):
+    attempts = []
+
+    def build():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("OPENAI_API_KEY is not set")
+        return object()
+
+    server = _fresh_agent(monkeypatch, build)
+    monkeypatch.setattr(server, "AGENT_RETRY_SECONDS", 3600.0)
+
+    assert server._get_agent() is None and server._get_agent() is None
+    assert len(attempts) == 1
+    health = TestClient(server.app).get("/health").json()
+    assert not health["ok"] and health["legacy_agent"] == "failed"
+    assert health["legacy_agent_error"] == "OPENAI_API_KEY is not set"
+
+    monkeypatch.setattr(server, "AGENT_RETRY_SECONDS", 0.0)
+    assert server._get_agent() is not None and server.AGENT_ERROR is None
@@ -0,0 +1,122 @@
+import asyncio
+import json
+
+from fastapi.testclient import TestClient
+
+import server
+from bank import repository
+from serving import answer_cache as answers
+from serving import deadline as budget
+from serving import retrieval
+from serving import sessions
+from serving import synthesize as synth_mod
+from serving.schema import QueryRoute
+
+
+class FakeStreamingModel:
+    def __init__(self, chunks, delay=0.0):
+        self.chunks, self.delay = chunks, delay
+
+    async def astream(self, messages):
+        for chunk in self.chunks:
+            await asyncio.sleep(self.delay)
+            yield chunk
+
+
+class FakeLLM:
+    def __init__(self, model):
+        self.model = model
+
+    def with_structured_output(self, schema):
+        return self.model
+
+
+def _client(monkeypatch, rows, model):
+    """/chat/stream against a fake bank and router, a fake streaming LLM and
+    in-memory sessions; the answer cache is off."""
+
+    async def fake_route(message):
+        return QueryRoute(tags=["daca"], needs_resources=True)
+
+    async def fake_retrieve(tags):
+        return rows
+
+    saved = {}
+
+    async def load_state(session_id):
+        return {**sessions.DEFAULT_STATE, **saved.get(session_id, {})}
+
+    async def save_state(session_id, state, previous):
+        saved[session_id] = state
+
+    monkeypatch.setattr(repository, "pool_ready", lambda: True)
+    monkeypatch.setattr(server, "SINGLE_CALL", False)
+    monkeypatch.setattr(server, "route_query", fake_route)
+    monkeypatch.setattr(retrieval, "retrieve", fake_retrieve)
+    monkeypatch.setattr(answers, "answer_cache", answers.AnswerCache(maxsize=0))
+    monkeypatch.setattr(synth_mod, "_get_llm", lambda: FakeLLM(model))
+    monkeypatch.setattr(sessions, "load_state", load_state)
+    monkeypatch.setattr(sessions, "save_state", save_state)
+    return TestClient(server.app), saved
+
+
+def _events(client, message, session_id="sid"):
+    resp = client.post("/chat/stream", json={"session_id": session_id, "message": message})
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    events = []
+    for block in resp.text.strip().split("\n\n"):
+        event, data = block.split("\n", 1)
+        events.append((event.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+    return events
+
+
+def test_stream_sends_tokens_then_cards_as_cite_ids_complete(monkeypatch, make_resource):
+    rows = [make_resource(name="a", tags=["daca"]), make_resource(name="b", tags=["daca"])]
+    model = FakeStreamingModel([
+        {"answer_text": "You"},
+        {"answer_text": "You can", "cite_ids": ["r"]},
+        {"answer_text": "You can apply.", "cite_ids": ["r2"]},
+        {"answer_text": "You can apply. Good luck.", "cite_ids": ["r2", "r1", "r7"]},
+    ])
+    client, _ = _client(monkeypatch, rows, model)
+
+    events = _events(client, "Which scholarships can I apply to?")
+
+    assert [e for e, _ in events] == ["session", "token", "token", "token", "card", "token", "card", "done"]
+    assert events[0][1] == {"session_id": "sid"}
+    assert "".join(d["text"] for e, d in events if e == "token") == "You can apply. Good luck."
+    assert [d["name"] for e, d in events if e == "card"] == ["b", "a"]
+    done = events[-1][1]
+    assert done["session_id"] == "sid" and done["answer_text"] == "You can apply. Good luck."
+    assert [c["name"] for c in done["cards"]] == ["b", "a"]
+
+
+def test_stream_short_circuits_arrive_as_one_event(monkeypatch, make_resource):
+    def fail(*args, **kwargs):
+        raise AssertionError("no synthesis for a short-circuit")
+
+    client, saved = _client(monkeypatch, [make_resource(name="a")], None)
+    monkeypatch.setattr(server, "synthesize_stream", fail)
+
+    ask = _events(client, "I'm undocumented, can I get financial aid?", session_id="new")
+    assert [e for e, _ in ask] == ["session", "ask", "done"]
+    assert "in-state" in ask[1][1]["ask"] and ask[2][1]["ask"] == ask[1][1]["ask"]
+    assert saved["new"]["pending_residency"] is True
+
+    closing = _events(client, "thanks!")
+    assert [e for e, _ in closing] == ["session", "answer", "done"]
+    assert closing[1][1]["answer_text"] == server._friendly_closing() == closing[2][1]["answer_text"]
+
+
+def test_stream_falls_back_to_cards_when_synthesis_times_out(monkeypatch, make_resource):
+    rows = [make_resource(name=n, tags=["daca"]) for n in "abcd"]
+    client, _ = _client(monkeypatch, rows, FakeStreamingModel([{"answer_text": "late"}], delay=1.0))
+    monkeypatch.setitem(budget.STAGE_TIMEOUTS, "synth", 0.05)
+
+    events = _events(client, "Which scholarships can I apply to?")
+
+    assert [e for e, _ in events] == ["session", "answer", "done"]
+    answer = events[1][1]
+    assert answer["answer_text"] == server.FALLBACK_TEXT
+    assert [c["name"] for c in answer["cards"]] == ["a", "b", "c"]
+    assert events[2][1] == answer
@@ -0,0 +1,143 @@
+import asyncio
+
+import server
+from bank import repository
+from serving import answer_cache as answers
+from serving import retrieval
+from serving import synthesize as synth_mod
+from serving.keywords import guess_tags
+from serving.schema import RoutedSynthesis, Synthesis
+
+
+class FakeModel:
+    def __init__(self, result=None, chunks=()):
+        self.result, self.chunks = result, chunks
+        self.messages = None
+
+    async def ainvoke(self, messages):
+        self.messages = messages
+        return self.result
+
+    async def astream(self, messages):
+        self.messages = messages
+        for chunk in self.chunks:
+            yield chunk
+
+
+class FakeLLM:
+    def __init__(self, model):
+        self.model = model
+
+    def with_structured_output(self, schema):
+        return self.model
+
+
+def test_format_uses_aliases_and_drops_urls_and_off_route_tags(make_resource):
+    rows = [
+        make_resource(name=f"res{i}", description="Helps with tuition. " * 40, tags=["daca", "scholarships"])
+        for i in range(12)
+    ]
+
+    block = synth_mod._format_resources(rows, tags=["daca"], budget=100_000)
+
+    assert block.text.startswith("[r01] res0")
+    assert "https://" not in block.text and str(rows[0].id) not in block.text
+    assert "daca" in block.text and "scholarships" not in block.text
+    assert all(len(line) < synth_mod.DESCRIPTION_CHARS + 80 for line in block.text.splitlines())
+    assert block.resolve(["r12", "r1", "bogus"]) == [str(rows[11].id), "r1", "bogus"]
+
+
+def test_format_stays_within_budget_dropping_lowest_ranked(make_resource):
+    rows = [make_resource(name=f"res{i}", description="x " * 200) for i in range(20)]
+
+    block = synth_mod._format_resources(rows, budget=300)
+
+    assert block.tokens <= 300
+    assert block.dropped > 0
+    assert len(block.aliases) == 20 - block.dropped
+    assert block.tokens == sum(synth_mod.estimate_tokens(l) + 1 for l in block.text.splitlines())
+
+
+def test_synthesize_and_stream_map_aliases_back(monkeypatch, make_resource):
+    rows = [make_resource(name="a"), make_resource(name="b")]
+    model = FakeModel(
+        result=Synthesis(answer_text="ok", cite_ids=["r2"]),
+        chunks=[{"answer_text": "o", "cite_ids": ["r"]}, {"answer_text": "ok", "cite_ids": ["r2"]}],
+    )
+    monkeypatch.setattr(synth_mod, "_get_llm", lambda: FakeLLM(model))
+
+    synth = asyncio.run(synth_mod.synthesize("q", rows))
+
+    async def collect():
+        return [p async for p in synth_mod.synthesize_stream("q", rows)]
+
+    partials = asyncio.run(collect())
+
+    assert synth.cite_ids == [str(rows[1].id)]
+    assert "[r1] a" in model.messages[1][1]
+    assert partials[0]["cite_ids"] == ["r"]
+    assert partials[-1]["cite_ids"] == [str(rows[1].id)]
+
+
+def _single_call(monkeypatch, rows, routed):
+    """PIPELINE_MODE=single against a fake bank, a fake structured LLM
+    returning `routed`, and a fresh answer cache (returned)."""
+    cache = answers.AnswerCache(maxsize=8)
+
+    async def fake_retrieve(tags):
+        return rows
+
+    async def fake_embed(message):
+        return [1.0, 0.0]
+
+    async def fake_version():
+        return "v1"
+
+    monkeypatch.setattr(server, "SINGLE_CALL", True)
+    monkeypatch.setattr(repository, "pool_ready", lambda: True)
+    monkeypatch.setattr(retrieval, "retrieve", fake_retrieve)
+    monkeypatch.setattr(server, "_embed_query", fake_embed)
+    monkeypatch.setattr(answers, "bank_version", fake_version)
+    monkeypatch.setattr(answers, "answer_cache", cache)
+    monkeypatch.setattr(synth_mod, "_get_llm", lambda: FakeLLM(FakeModel(result=routed)))
+    return cache
+
+
+def test_single_call_greeting_gets_the_two_call_reply(monkeypatch, make_resource):
+    routed = RoutedSynthesis(needs_resources=False, tags=[], answer_text="Hey! Ask me anything.", cite_ids=[])
+    cache = _single_call(monkeypatch, [make_resource(name="a")], routed)
+
+    resp = asyncio.run(server._answer_once("sid", "hello there!", None, None, None))
+
+    assert resp.answer_text == server._friendly_closing()
+    assert resp.cards == [] and resp.sources == []
+    assert cache.stats()["entries"] == 0
+
+
+def test_single_call_keeps_the_cite_guard_and_caches_under_the_lookup_key(monkeypatch, make_resource):
+    rows = [make_resource(name="a", tags=["daca"]), make_resource(name="b", tags=["financial-aid"])]
+    routed = RoutedSynthesis(
+        needs_resources=True, tags=["financial-aid"], answer_text="Try b.", cite_ids=["r2", "r9"],
+    )
+    cache = _single_call(monkeypatch, rows, routed)
+    calls = []
+    route_and_synthesize = server.route_and_synthesize
+
+    async def counted(*args, **kwargs):
+        calls.append(args[0])
+        return await route_and_synthesize(*args, **kwargs)
+
+    monkeypatch.setattr(server, "route_and_synthesize", counted)
+    message = "What help is there for DACA students?"
+    guessed = guess_tags(message)
+    assert guessed and "financial-aid" not in guessed
+
+    first = asyncio.run(server._answer_once("sid", message, True, None, None))
+    again = asyncio.run(server._answer_once("sid", message, True, None, None))
+
+    # Only ids the model cited that resolve to a retrieved row become cards.
+    assert [c.name for c in first.cards] == ["b"] and first.answer_text == "Try b."
+    # The model routed elsewhere than the guess, yet the repeat is a cache hit.
+    assert len(calls) == 1 and again.answer_text == "Try b." and cache.hits == 1
+    key = answers.AnswerCache.key(guessed, "ccny", True, server._context_note(True, "ccny", None))
+    assert list(cache._buckets) == [key]
@@ -0,0 +1,81 @@
+import asyncio
+import time
+
+import httpx
+
+from verifier import batch, http_client
+
+
+def test_hosts_are_spaced_and_capped_while_distinct_hosts_overlap(monkeypatch, make_resource):
+    starts: list[tuple[str, float]] = []
+    active: dict[str, int] = {}
+    peak: dict[str, int] = {}
+
+    async def fake_verify_and_store(r):
+        host = http_client.host_of(r.url)
+        starts.append((host, time.monotonic()))
+        active[host] = active.get(host, 0) + 1
+        peak[host] = max(peak.get(host, 0), active[host])
+        await asyncio.sleep(0.1)
+        active[host] -= 1
+
+    monkeypatch.setattr(batch, "verify_and_store", fake_verify_and_store)
+    due = [make_resource(url=f"https://www.ccny.cuny.edu/{i}") for i in range(4)]
+    due += [make_resource(url=f"https://hesc.ny.gov/{i}") for i in range(2)]
+    due += [make_resource(url="https://example.org/")]
+
+    deferred = asyncio.run(batch.verify_resources(due, concurrency=10, per_host=2, interval=0.02))
+
+    assert deferred == 0 and len(starts) == 7
+    assert peak == {"www.ccny.cuny.edu": 2, "hesc.ny.gov": 2, "example.org": 1}
+    # Only lower bounds on time: a loaded runner makes gaps longer, never shorter.
+    ccny = [t for host, t in starts if host == "www.ccny.cuny.edu"]
+    assert all(b - a >= 0.015 for a, b in zip(ccny, ccny[1:]))
+    # Every host's first start comes before any host's second: none waits behind another.
+    assert {host for host, _ in starts[:3]} == set(peak)
+
+
+def test_host_spacing_holds_when_other_hosts_fill_every_global_slot(monkeypatch, make_resource):
+    starts: list[tuple[str, float]] = []
+
+    async def fake_verify_and_store(r):
+        host = http_client.host_of(r.url)
+        starts.append((host, time.monotonic()))
+        await asyncio.sleep(0.3 if host != "a.edu" else 0)
+
+    monkeypatch.setattr(batch, "verify_and_store", fake_verify_and_store)
+    due = [make_resource(url="https://b.edu/"), make_resource(url="https://c.edu/")]
+    due += [make_resource(url=f"https://a.edu/{i}") for i in range(2)]
+
+    asyncio.run(batch.verify_resources(due, concurrency=2, per_host=2, interval=0.1))
+
+    # a.edu waited on the semaphore far longer than its interval; its two
+    # fetches must still be an interval apart, not back to back.
+    a = [t for host, t in starts if host == "a.edu"]
+    assert len(a) == 2 and a[1] - a[0] >= 0.095
+
+
+def test_retry_after_backs_the_host_off_and_defers_long_waits(monkeypatch, make_resource):
+    resp = httpx.Response(429, headers={"retry-after": "600"})
+    assert http_client.retry_after_seconds(resp) == 600
+    assert http_client.retry_after_seconds(httpx.Response(429, headers={"retry-after": "soon"})) is None
+
+    verified = []
+
+    async def fake_verify_and_store(r):
+        verified.append(r.url)
+
+    monkeypatch.setattr(batch, "verify_and_store", fake_verify_and_store)
+    monkeypatch.setattr(http_client, "MAX_RETRY_AFTER", 120)
+
+    async def run():
+        http_client.back_off("hesc.ny.gov", 600)
+        due = [make_resource(url=f"https://hesc.ny.gov/{i}") for i in range(3)]
+        due.append(make_resource(url="https://example.org/"))
+        deferred = await batch.verify_resources(due, per_host=1, interval=0)
+        await http_client.close_client()
+        return deferred
+
+    assert asyncio.run(run()) == 3
+    assert verified == ["https://example.org/"]
+    assert http_client.host_ready_in("hesc.ny.gov") == 0
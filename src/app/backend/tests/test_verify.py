@@ -0,0 +1,126 @@
+import asyncio
+from datetime import date, timedelta
+
+import httpx
+
+from verifier import http_client, verify
+from verifier.schema import DateExtraction, DatedFact
+
+URL = "https://www.hesc.ny.gov/dream-act"
+
+
+def test_unchanged_page_reuses_stored_facts_without_extraction(monkeypatch, make_resource):
+    deadline = date.today() + timedelta(days=30)
+    page = f"<html><body><p>Applications due {deadline:%B %d, %Y}.</p></body></html>"
+    served = {"etag": '"v1"', "body": page}
+    requests = []
+    extractions = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append((request.method, request.headers.get("if-none-match")))
+        if request.method == "HEAD":
+            return httpx.Response(200)
+        if served["etag"] and request.headers.get("if-none-match") == served["etag"]:
+            return httpx.Response(304, headers={"etag": served["etag"]})
+        headers = {"etag": served["etag"]} if served["etag"] else {}
+        return httpx.Response(200, text=served["body"], headers=headers)
+
+    async def fake_extract(text, name):
+        extractions.append(text)
+        return DateExtraction(dated_facts=[
+            DatedFact(date=deadline, role="final_deadline", evidence=text),
+        ])
+
+    monkeypatch.setattr(verify, "extract_dates", fake_extract)
+    resource = make_resource(name="NYS Dream Act", url=URL, tags=["financial-aid"], status="unverified")
+
+    async def run():
+        monkeypatch.setattr(http_client, "_client", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+        results = []
+        current = resource
+        # 1: first look, extracted. 2: 304. 3: no ETag any more, same text -> hash hit.
+        for step in range(3):
+            if step == 2:
+                served["etag"] = None
+            result = await verify.verify_resource(current)
+            results.append(result)
+            current = current.model_copy(update={"verification": result.model_dump(mode="json")})
+        await http_client.close_client()
+        return results
+
+    first, not_modified, same_hash = asyncio.run(run())
+
+    assert len(extractions) == 1
+    # One GET per run answers liveness and carries the body: no HEAD first.
+    assert requests == [("GET", None), ("GET", '"v1"'), ("GET", '"v1"')]
+    assert first.status == not_modified.status == same_hash.status == "valid"
+    assert not_modified.selected_deadline == same_hash.selected_deadline == deadline
+    assert "unchanged" in not_modified.reason and "unchanged" in same_hash.reason
+    assert not_modified.page.content_hash == first.page.content_hash == same_hash.page.content_hash
+    assert same_hash.page.etag is None
+
+
+def test_liveness_comes_from_the_single_get_and_evergreen_stays_on_head(monkeypatch, make_resource):
+    methods = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        methods.append((request.method, request.url.path))
+        return httpx.Response(404 if request.url.path == "/gone" else 200)
+
+    async def fail_extract(text, name):
+        raise AssertionError("a dead page is never extracted")
+
+    monkeypatch.setattr(verify, "extract_dates", fail_extract)
+
+    def resource(path, tags):
+        return make_resource(name=path, url=f"https://www.ccny.cuny.edu{path}", tags=tags, status="unverified")
+
+    async def run():
+        monkeypatch.setattr(http_client, "_client", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+        dead = await verify.verify_resource(resource("/gone", ["scholarship"]))
+        evergreen = await verify.verify_resource(resource("/legal", ["legal"]))
+        await http_client.close_client()
+        return dead, evergreen
+
+    dead, evergreen = asyncio.run(run())
+
+    assert (dead.status, dead.reason) == ("stale", "dead link")
+    assert evergreen.status == "valid"
+    assert methods == [("GET", "/gone"), ("HEAD", "/legal")]
+
+
+def test_rate_limited_fetch_keeps_the_stored_status(monkeypatch, make_resource):
+    from bank import repository
+    from verifier import batch
+
+    writes = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/busy":
+            return httpx.Response(503, headers={"retry-after": "0"})
+        return httpx.Response(429)
+
+    async def fail_extract(text, name):
+        raise AssertionError("a rate-limited page is never extracted")
+
+    async def set_status(*args, **kwargs):
+        writes.append(args)
+
+    monkeypatch.setattr(verify, "extract_dates", fail_extract)
+    monkeypatch.setattr(repository, "set_status", set_status)
+    rows = [
+        make_resource(name="dream", url=URL, tags=["financial-aid"]),
+        make_resource(name="legal", url="https://www.ccny.cuny.edu/legal", tags=["legal"]),
+        make_resource(name="busy", url="https://www.ccny.cuny.edu/busy", tags=["scholarship"]),
+    ]
+
+    async def run():
+        monkeypatch.setattr(http_client, "_client", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+        for r in rows:
+            await batch.verify_and_store(r)
+        await http_client.close_client()
+
+    asyncio.run(run())
+
+    assert writes == []
+    assert [r.status for r in rows] == ["valid", "valid", "valid"]
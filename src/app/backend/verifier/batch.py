@@ -1,36 +1,101 @@
-# verifier/batch.py — Semaphore(5) caps simultaneous workers (don't hammer
-# servers / hit rate limits). gather runs all due resources, waits for all.
-# model_dump(mode="json") converts the result (dates included) to a JSON-safe
-# dict for the jsonb column.
+# verifier/batch.py — verify every due resource, politely per host.
+#
+# Due resources are grouped by host. Each host gets PER_HOST_CONCURRENCY
+# lanes, and starts on one host are at least HOST_INTERVAL seconds apart, so
+# ten resources on ccny.cuny.edu trickle in while distinct hosts run side by
+# side, up to CONCURRENCY at once. A host that answered 429/503 with
+# Retry-After (recorded by verifier/http_client.py) is waited out; if it asked
+# for more than HTTP_MAX_RETRY_AFTER_SECONDS, its remaining resources are left
+# for the next run (they stay due). model_dump(mode="json") converts the
+# result (dates included) to a JSON-safe dict for the jsonb column.
 
 from __future__ import annotations
 
 import asyncio
+import time
+from collections import deque
 
 from bank import repository
+from bank.models import Resource
+from settings import env_float, env_int
+from verifier import http_client
+from verifier.liveness import Deferred
 from verifier.verify import verify_resource
 
+CONCURRENCY = env_int("VERIFY_CONCURRENCY", 32, minimum=1, maximum=256)
+PER_HOST_CONCURRENCY = env_int("VERIFY_PER_HOST_CONCURRENCY", 2, minimum=1, maximum=16)
+HOST_INTERVAL = env_float("VERIFY_HOST_INTERVAL_SECONDS", 1.0, minimum=0.0, maximum=60.0)
+
+
+async def verify_and_store(r: Resource) -> None:
+    try:
+        result = await verify_resource(r)
+    except Deferred as e:
+        print(f"[verifier] {r.name}: deferred — {e}, keeping {r.status}")
+        return
+    except Exception as e:
+        print(f"[verifier] {r.name}: error — {e}")
+        return
+    await repository.set_status(
+        r.id,
+        result.status,
+        verification=result.model_dump(mode="json"),
+        last_verified_at=result.checked_at,
+        deadline=result.selected_deadline,
+    )
+    print(f"[verifier] {r.name}: {result.status} ({result.reason})")
+
+
+def group_by_host(resources: list[Resource]) -> dict[str, deque[Resource]]:
+    groups: dict[str, deque[Resource]] = {}
+    for r in resources:
+        groups.setdefault(http_client.host_of(r.url), deque()).append(r)
+    return groups
 
-async def run_batch(concurrency: int = 5) -> None:
-    due = await repository.resources_due_for_verification(max_age_hours=24)
 
+async def verify_resources(
+    resources: list[Resource],
+    concurrency: int = CONCURRENCY,
+    per_host: int = PER_HOST_CONCURRENCY,
+    interval: float = HOST_INTERVAL,
+) -> int:
+    """Verify `resources` under the per-host schedule; returns how many were
+    deferred to the next run because their host asked to be left alone."""
     sem = asyncio.Semaphore(concurrency)
+    deferred = 0
 
-    async def worker(r):
-        async with sem:
-            try:
-                result = await verify_resource(r)
-            except Exception as e:
-                print(f"[verifier] {r.name}: error — {e}")
-                return
-            await repository.set_status(
-                r.id,
-                result.status,
-                verification=result.model_dump(mode="json"),
-                last_verified_at=result.checked_at,
-                deadline=result.selected_deadline,
-            )
-            print(f"[verifier] {r.name}: {result.status} ({result.reason})")
-
-    await asyncio.gather(*(worker(r) for r in due))
-    print(f"[verifier] checked {len(due)} resources")
+    async def lane(host: str, queue: deque[Resource], next_start: list[float]) -> None:
+        nonlocal deferred
+        while queue:
+            r = queue.popleft()
+            while True:
+                wait = max(next_start[0] - time.monotonic(), http_client.host_ready_in(host))
+                if wait > http_client.MAX_RETRY_AFTER:
+                    deferred += len(queue) + 1
+                    print(f"[verifier] {host}: Retry-After {wait:.0f}s, deferring {len(queue) + 1}")
+                    queue.clear()
+                    return
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                async with sem:
+                    # Claim the host's slot only once a global one is held: a
+                    # claim made before queueing on `sem` may be long past by
+                    # the time it is granted. Not due yet: give it back, wait.
+                    if next_start[0] > time.monotonic() or http_client.host_ready_in(host):
+                        continue
+                    next_start[0] = time.monotonic() + interval
+                    await verify_and_store(r)
+                break
+
+    lanes = []
+    for host, queue in group_by_host(resources).items():
+        next_start = [0.0]  # shared by the host's lanes
+        lanes.extend(lane(host, queue, next_start) for _ in range(min(per_host, len(queue))))
+    await asyncio.gather(*lanes)
+    return deferred
+
+
+async def run_batch(concurrency: int = CONCURRENCY) -> None:
+    due = await repository.resources_due_for_verification(max_age_hours=24)
+    deferred = await verify_resources(due, concurrency)
+    print(f"[verifier] checked {len(due) - deferred} resources ({deferred} deferred)")
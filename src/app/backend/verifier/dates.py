@@ -0,0 +1,190 @@
+# verifier/dates.py — deterministic date extraction, run before the LLM.
+#
+# Most deadline pages state their dates plainly ("Deadline: March 1, 2027").
+# Date regexes find every explicit date; the words just before each one (back
+# to the previous date or the start of its sentence) give its role, and the
+# sentence is the evidence. Pure code: no I/O, no LLM.
+#
+# The confidence gate keeps decide_status's zero-false-valid guarantee: a
+# result is trusted only if it has a deadline (or rolling) fact and no date is
+# ambiguous — cues of competing roles in one window ("webinar on the
+# deadline"), a deadline cue on a date without a year, a deadline implausibly
+# far ahead, a page saying the program is suspended or closed, a negated
+# rolling basis. Like the LLM prompt, it is anchored to the resource: aid pages
+# list several programs, so a page with more than one deadline date, or a
+# deadline whose sentence doesn't name the resource, is not ours to pick
+# from. Anything else goes to the LLM, as every page used to.
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from datetime import date
+
+from verifier.schema import DatedFact
+
+DEADLINE_ROLES = {"final_deadline", "priority_deadline", "rolling"}
+WINDOW_CHARS = 80
+EVIDENCE_CHARS = 300
+MAX_YEARS_AHEAD = 2
+
+_MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+_MONTH = (
+    r"(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|"
+    r"aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)"
+)
+_ORD = r"(?:st|nd|rd|th)?"
+_DATE_PATTERNS = [
+    # March 1, 2027 / Mar. 1st 2027 / March 1 (no year: kept to flag ambiguity)
+    re.compile(rf"\b(?P<month>{_MONTH})\.?\s+(?P<day>\d{{1,2}}){_ORD}\b(?:,?\s+(?P<year>\d{{4}})\b)?", re.I),
+    # 1 March 2027 / 1st of March, 2027
+    re.compile(rf"\b(?P<day>\d{{1,2}}){_ORD}\s+(?:of\s+)?(?P<month>{_MONTH})\.?,?\s+(?P<year>\d{{4}})\b", re.I),
+    # 3/1/2027 (US order)
+    re.compile(r"\b(?P<month>\d{1,2})/(?P<day>\d{1,2})/(?P<year>\d{4})\b"),
+    # 2027-03-01
+    re.compile(r"\b(?P<year>\d{4})-(?P<month>\d{2})-(?P<day>\d{2})\b"),
+]
+
+# Role cues, matched in the window before a date.
+_CUES = {
+    "prior_cycle": re.compile(
+        r"\b(?:was|were)\s+(?:due|closed)\b|\blast year\b|\b(?:previous|prior|past)\s+(?:year|cycle|deadline)", re.I
+    ),
+    "priority_deadline": re.compile(r"\bpriority\b", re.I),
+    # "due" only right before the date or as "due by/on/date" — never "due to
+    # budget cuts" or "checks are due out".
+    "final_deadline": re.compile(
+        r"\b(?:deadlines?|closes?|closing|no later than|must be (?:received|submitted|postmarked)"
+        r"|last day to (?:apply|submit)|(?:apply|submit(?:ted)?|postmarked) by)\b"
+        r"|\bdue(?:\s+(?:by|on|date)\b|\s*:|\s*$)",
+        re.I,
+    ),
+    "opens": re.compile(r"\b(?:opens?|opening|begins?|beginning|starting|launch(?:es)?)\b", re.I),
+    "last_updated": re.compile(r"\b(?:updated|last modified|revised|posted)\b", re.I),
+    "event": re.compile(
+        r"\b(?:webinar|info(?:rmation)? session|workshop|orientation|event|fair|meeting|ceremony)\b", re.I
+    ),
+}
+_ROLLING = re.compile(r"\brolling (?:basis|admissions?|deadline|review)\b", re.I)
+# A program on hold or ended: whatever dates the page carries, what they mean
+# for the resource is the model's call.
+_SUSPENDED = re.compile(
+    r"\b(?:suspended|closed|no longer|not (?:accepting|available|open)|paused|discontinued|ended"
+    r"|cancell?ed|on hold)\b",
+    re.I,
+)
+_NEGATION = re.compile(r"\b(?:not|no longer|discontinued|ended)\b", re.I)
+# A new sentence starts with a capital: "Mar. 1" is not a sentence break.
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+(?=[A-Z\"“(])|\n+")
+_WORD = re.compile(r"[a-z0-9]+")
+_NAME_STOPWORDS = {"a", "an", "and", "at", "for", "in", "of", "on", "the", "to"}
+
+
+@dataclass(frozen=True)
+class LocalExtraction:
+    facts: list[DatedFact]
+    confident: bool  # passed the gate: safe to decide on without the LLM
+
+
+@dataclass(frozen=True)
+class _Match:
+    start: int
+    end: int
+    value: date | None  # None: no year written
+
+
+def _to_date(m: re.Match) -> date | None:
+    month = m.group("month")
+    month = int(month) if month.isdigit() else _MONTHS[month[:3].lower()]
+    if m.group("year") is None:
+        return None
+    try:
+        return date(int(m.group("year")), month, int(m.group("day")))
+    except ValueError:
+        return None
+
+
+def _find_dates(sentence: str) -> list[_Match]:
+    found: list[_Match] = []
+    for pattern in _DATE_PATTERNS:
+        for m in pattern.finditer(sentence):
+            if any(m.start() < f.end and f.start < m.end() for f in found):
+                continue
+            if m.group("year") is not None and _to_date(m) is None:
+                continue  # not a real date (Feb 30)
+            found.append(_Match(m.start(), m.end(), _to_date(m)))
+    return sorted(found, key=lambda f: f.start)
+
+
+def _role(window: str) -> tuple[str, bool]:
+    """(role, ambiguous) from the cues in the text just before a date."""
+    cues = {name for name, pattern in _CUES.items() if pattern.search(window)}
+    # Refinements rather than conflicts: "priority deadline", "was due".
+    if "prior_cycle" in cues:
+        cues -= {"final_deadline", "priority_deadline"}
+    if "priority_deadline" in cues:
+        cues.discard("final_deadline")
+    if not cues:
+        return "other", False
+    if len(cues) > 1:
+        return "other", True
+    return cues.pop(), False
+
+
+def _sentences(text: str) -> list[str]:
+    return [s.strip() for s in _SENTENCE_END.split(text) if s.strip()]
+
+
+def _evidence(sentence: str, start: int, end: int) -> str:
+    """The sentence, or the part of a long one (a flattened table) around the date."""
+    if len(sentence) <= EVIDENCE_CHARS:
+        return sentence
+    lo = max(0, start - (EVIDENCE_CHARS - (end - start)) * 2 // 3)
+    return sentence[lo:lo + EVIDENCE_CHARS].strip()
+
+
+def _names(evidence: str, name_words: set[str]) -> bool:
+    """Whether the evidence mentions every significant word of the resource name."""
+    return bool(name_words) and name_words <= set(_WORD.findall(evidence.lower()))
+
+
+def extract_local(text: str, resource_name: str, today: date | None = None) -> LocalExtraction:
+    today = today or date.today()
+    name_words = set(_WORD.findall(resource_name.lower())) - _NAME_STOPWORDS
+    facts: list[DatedFact] = []
+    ambiguous = False
+    for sentence in _sentences(text):
+        rolling = _ROLLING.search(sentence)
+        if rolling:
+            # "no longer accepting applications on a rolling basis"
+            ambiguous = ambiguous or bool(_NEGATION.search(sentence))
+            evidence = _evidence(sentence, rolling.start(), rolling.end())
+            facts.append(DatedFact(date=None, role="rolling", evidence=evidence))
+        previous_end = 0
+        for match in _find_dates(sentence):
+            window = sentence[max(previous_end, match.start - WINDOW_CHARS):match.start]
+            previous_end = match.end
+            role, unclear = _role(window)
+            if match.value is None:
+                # "Apply by March 1": which year is a guess; let the model read it.
+                ambiguous = ambiguous or role in DEADLINE_ROLES or unclear
+                continue
+            if role in DEADLINE_ROLES and match.value.year > today.year + MAX_YEARS_AHEAD:
+                unclear = True
+            ambiguous = ambiguous or unclear
+            evidence = _evidence(sentence, match.start, match.end)
+            facts.append(DatedFact(date=match.value, role=role, evidence=evidence))
+    deadlines = [f for f in facts if f.role in DEADLINE_ROLES]
+    # Suspended or closed anywhere on the page: the deadline may not apply.
+    if deadlines and _SUSPENDED.search(text):
+        ambiguous = True
+    # Several programs' deadlines on one page, or one that may be another's.
+    if len({f.date for f in deadlines if f.date is not None}) > 1:
+        ambiguous = True
+    if any(not _names(f.evidence, name_words) for f in deadlines):
+        ambiguous = True
+    confident = not ambiguous and bool(deadlines)
+    return LocalExtraction(facts, confident)
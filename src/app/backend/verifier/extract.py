@@ -1,14 +1,20 @@
 # verifier/extract.py — extract every date with role + evidence
 # (disambiguation by structure, not by making the model choose).
 # "Never infer" guards against fabricated dates; anchoring to resource_name
-# separates this resource's dates from unrelated ones.
+# separates this resource's dates from unrelated ones. The deterministic
+# pre-pass (verifier/dates.py), anchored the same way, answers first; only
+# pages it isn't confident about reach the model. DATE_PREPASS=0 sends every page to the model.
 
 from __future__ import annotations
 
 from langchain_openai import ChatOpenAI
 
+from settings import env_flag
+from verifier.dates import extract_local
 from verifier.schema import DateExtraction
 
+DATE_PREPASS = env_flag("DATE_PREPASS", True)
+
 _llm: ChatOpenAI | None = None
 
 
@@ -27,6 +33,10 @@ EXTRACT_SYSTEM = (
 
 
 async def extract_dates(text: str, resource_name: str) -> DateExtraction:
+    if DATE_PREPASS:
+        local = extract_local(text, resource_name)
+        if local.confident:
+            return DateExtraction(dated_facts=local.facts)
     model = _get_llm().with_structured_output(DateExtraction)
     return await model.ainvoke([
         ("system", EXTRACT_SYSTEM),
@@ -1,16 +1,17 @@
 # verifier/fetch.py — fetch_text downloads the page, strips noisy tags, and
 # returns readable text. locate keeps only lines near deadline/eligibility
-# keywords (the "narrow the input" step).
+# keywords (the "narrow the input" step). fetch_page is the verifier's
+# conditional variant: it sends the last run's ETag / Last-Modified back.
 # Later upgrades: Firecrawl for JS-heavy pages, semantic locate via embeddings.
 
 from __future__ import annotations
 
-import httpx
+import hashlib
+from dataclasses import dataclass
+
 from bs4 import BeautifulSoup
 
-REQUEST_HEADERS = {
-    "user-agent": "Mozilla/5.0 (compatible; DreamersAgentVerifier/1.0; +https://dreamersagent.org)",
-}
+from verifier import http_client
 
 KEYWORDS = (
     "deadline", "due", "apply", "application", "eligib",
@@ -18,15 +19,59 @@ KEYWORDS = (
 )
 
 
-async def fetch_text(url: str) -> str:
-    async with httpx.AsyncClient(follow_redirects=True, timeout=15, headers=REQUEST_HEADERS) as client:
-        resp = await client.get(url)
-    soup = BeautifulSoup(resp.text, "html.parser")
+@dataclass(frozen=True)
+class Page:
+    url: str          # after redirects
+    status_code: int
+    text: str | None  # None when the server answered 304 Not Modified
+    etag: str | None = None
+    last_modified: str | None = None
+    retry_after: float | None = None  # seconds, when the server sent Retry-After
+
+
+def html_to_text(html: str) -> str:
+    soup = BeautifulSoup(html, "html.parser")
     for tag in soup(["script", "style", "nav", "footer", "header", "noscript"]):
         tag.decompose()
     return soup.get_text(" ", strip=True)
 
 
+async def fetch_text(url: str) -> str:
+    resp = await http_client.request("GET", url, timeout=15)
+    return html_to_text(resp.text)
+
+
+async def fetch_page(url: str, etag: str | None = None, last_modified: str | None = None) -> Page:
+    """GET with If-None-Match / If-Modified-Since from the last run. A 304
+    costs no body; validators the server didn't resend are kept."""
+    headers = {}
+    if etag:
+        headers["if-none-match"] = etag
+    if last_modified:
+        headers["if-modified-since"] = last_modified
+    resp = await http_client.request("GET", url, headers=headers, timeout=15)
+    if resp.status_code == 304:
+        return Page(
+            url=str(resp.url),
+            status_code=304,
+            text=None,
+            etag=resp.headers.get("etag") or etag,
+            last_modified=resp.headers.get("last-modified") or last_modified,
+        )
+    return Page(
+        url=str(resp.url),
+        status_code=resp.status_code,
+        text=html_to_text(resp.text),
+        etag=resp.headers.get("etag"),
+        last_modified=resp.headers.get("last-modified"),
+        retry_after=http_client.retry_after_seconds(resp),
+    )
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
 def locate(text: str) -> str:
     lines = [ln for ln in text.split("\n") if any(k in ln.lower() for k in KEYWORDS)]
     return "\n".join(lines) or text[:4000]
@@ -0,0 +1,145 @@
+# verifier/http_client.py — one pooled httpx.AsyncClient for every outbound
+# fetch (verifier liveness + page fetches, discovery hubs + Brave search).
+#
+# Opening a client per call pays DNS, TCP and TLS again for every URL; many
+# resources live on the same few hosts (ccny.cuny.edu, hesc.ny.gov), so one
+# shared client keeps their connections alive for the whole run. Lifecycle
+# mirrors repository's pool: the job entrypoints call init_client/close_client
+# around the run. get_client() also opens it lazily, so one-off callers (the
+# server's verify-on-approve) work too; the server closes it on shutdown.
+#
+# HTTP/2 is used when the optional `h2` package is installed (pip install
+# h2, or httpx[http2]) unless HTTP2=0. PER_HOST_CONNECTIONS caps concurrent
+# requests to one host, so a batch can't open a burst of connections to it.
+# A 429/503 with Retry-After backs the whole host off: later requests to it
+# wait (up to MAX_RETRY_AFTER), and verifier/batch.py defers its resources.
+
+from __future__ import annotations
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator
+from urllib.parse import urlsplit
+
+import httpx
+
+from settings import env_flag, env_int
+
+REQUEST_HEADERS = {
+    "user-agent": "Mozilla/5.0 (compatible; DreamersAgentVerifier/1.0; +https://dreamersagent.org)",
+}
+MAX_CONNECTIONS = env_int("HTTP_MAX_CONNECTIONS", 100, minimum=1, maximum=1000)
+MAX_KEEPALIVE = env_int("HTTP_MAX_KEEPALIVE_CONNECTIONS", 20, minimum=0, maximum=1000)
+PER_HOST_CONNECTIONS = env_int("HTTP_PER_HOST_CONNECTIONS", 4, minimum=1, maximum=100)
+MAX_RETRY_AFTER = env_int("HTTP_MAX_RETRY_AFTER_SECONDS", 120, minimum=0, maximum=3600)
+DEFAULT_TIMEOUT = 15
+BACKOFF_STATUS_CODES = {429, 503}
+
+_client: httpx.AsyncClient | None = None
+# Per-host request slots. asyncio primitives belong to one event loop, so
+# these are dropped with the client (Lambda runs a new loop per invocation).
+_host_slots: dict[str, asyncio.Semaphore] = {}
+# host -> time.monotonic() before which it asked not to be contacted.
+_not_before: dict[str, float] = {}
+
+
+def http2_enabled() -> bool:
+    if not env_flag("HTTP2", True):
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _build() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        follow_redirects=True,
+        timeout=DEFAULT_TIMEOUT,
+        headers=REQUEST_HEADERS,
+        http2=http2_enabled(),
+        limits=httpx.Limits(
+            max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_KEEPALIVE
+        ),
+    )
+
+
+def init_client() -> None:
+    """Open the shared client once at job start."""
+    global _client
+    if _client is None:
+        _client = _build()
+
+
+def get_client() -> httpx.AsyncClient:
+    init_client()
+    return _client
+
+
+async def close_client() -> None:
+    global _client
+    client, _client = _client, None
+    _host_slots.clear()
+    _not_before.clear()
+    if client is not None:
+        await client.aclose()
+
+
+def host_of(url: str) -> str:
+    return (urlsplit(url).hostname or "").lower()
+
+
+def retry_after_seconds(resp: httpx.Response) -> float | None:
+    """Retry-After as seconds from now (delta-seconds or an HTTP date)."""
+    value = resp.headers.get("retry-after", "").strip()
+    if not value:
+        return None
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def back_off(host: str, seconds: float) -> None:
+    _not_before[host] = max(_not_before.get(host, 0.0), time.monotonic() + seconds)
+
+
+def host_ready_in(host: str) -> float:
+    """Seconds until the host's Retry-After has passed (0 when it never asked)."""
+    return max(0.0, _not_before.get(host, 0.0) - time.monotonic())
+
+
+@asynccontextmanager
+async def host_slot(url: str) -> AsyncIterator[None]:
+    host = host_of(url)
+    slot = _host_slots.get(host)
+    if slot is None:
+        slot = _host_slots[host] = asyncio.Semaphore(PER_HOST_CONNECTIONS)
+    async with slot:
+        yield
+
+
+async def request(method: str, url: str, **kwargs) -> httpx.Response:
+    """client.request on the shared client, within the host's slots and after
+    its Retry-After. The body is read before returning, so the connection is
+    back in the pool."""
+    host = host_of(url)
+    async with host_slot(url):
+        wait = host_ready_in(host)
+        if wait:
+            await asyncio.sleep(min(wait, MAX_RETRY_AFTER))
+        resp = await get_client().request(method, url, **kwargs)
+    if resp.status_code in BACKOFF_STATUS_CODES:
+        seconds = retry_after_seconds(resp)
+        if seconds:
+            back_off(host, seconds)
+    return resp
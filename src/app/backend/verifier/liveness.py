@@ -1,15 +1,39 @@
 # verifier/liveness.py — cheap HEAD first, falling back to GET; follows
-# redirects; 10s timeout; network errors count as dead.
+# redirects; 10s timeout; network errors count as dead. Requests go through
+# the shared pooled client (verifier/http_client.py).
 # Returns (alive, final_url). A dead link short-circuits to `stale`.
+# Only evergreen resources use it: deadline-bearing ones need the body anyway,
+# so verify.py judges liveness from that single GET with is_alive.
+#
+# A rate limit (429, or 503 with Retry-After) says nothing about the page, so
+# it raises Deferred: the caller keeps the stored status and the next run
+# checks again, after http_client has waited out the host.
 
 from __future__ import annotations
 
 import httpx
 
-RESTRICTED_STATUS_CODES = {401, 403, 429}
-REQUEST_HEADERS = {
-    "user-agent": "Mozilla/5.0 (compatible; DreamersAgentVerifier/1.0; +https://dreamersagent.org)",
-}
+from verifier import http_client
+
+RESTRICTED_STATUS_CODES = {401, 403}
+
+
+class Deferred(Exception):
+    """The host asked us to come back later; no verdict on this run."""
+
+
+def is_alive(status_code: int) -> bool:
+    """Restricted pages (login walls) exist; they aren't dead."""
+    return status_code < 400 or status_code in RESTRICTED_STATUS_CODES
+
+
+def is_rate_limited(status_code: int, retry_after: float | None) -> bool:
+    return status_code == 429 or (status_code == 503 and retry_after is not None)
+
+
+def _check_rate_limit(resp: httpx.Response) -> None:
+    if is_rate_limited(resp.status_code, http_client.retry_after_seconds(resp)):
+        raise Deferred(f"rate limited (HTTP {resp.status_code})")
 
 
 async def check_liveness(url: str) -> tuple[bool, str]:
@@ -17,12 +41,13 @@ async def check_liveness(url: str) -> tuple[bool, str]:
         return False, url
 
     try:
-        async with httpx.AsyncClient(follow_redirects=True, timeout=10, headers=REQUEST_HEADERS) as client:
-            resp = await client.head(url)
-            if resp.status_code in RESTRICTED_STATUS_CODES:
-                return True, str(resp.url)
-            if resp.status_code >= 400:
-                resp = await client.get(url)  # some servers reject HEAD
-            return resp.status_code < 400 or resp.status_code in RESTRICTED_STATUS_CODES, str(resp.url)
+        resp = await http_client.request("HEAD", url, timeout=10)
+        _check_rate_limit(resp)
+        if resp.status_code in RESTRICTED_STATUS_CODES:
+            return True, str(resp.url)
+        if resp.status_code >= 400:
+            resp = await http_client.request("GET", url, timeout=10)  # some servers reject HEAD
+            _check_rate_limit(resp)
+        return is_alive(resp.status_code), str(resp.url)
     except httpx.HTTPError:
         return False, url
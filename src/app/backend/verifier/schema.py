@@ -31,6 +31,15 @@ class DateExtraction(BaseModel):
     dated_facts: list[DatedFact]
 
 
+class PageSnapshot(BaseModel):
+    """Cache validators for the page the dated_facts came from: the next run
+    sends a conditional GET and skips extraction when nothing changed."""
+    url: str
+    etag: str | None = None
+    last_modified: str | None = None
+    content_hash: str
+
+
 class VerificationResult(BaseModel):
     """What we compute & store."""
     status: Literal["valid", "stale", "unverifiable"]
@@ -39,3 +48,4 @@ class VerificationResult(BaseModel):
     selected_deadline: date | None
     confidence: float
     checked_at: datetime
+    page: PageSnapshot | None = None
@@ -2,18 +2,35 @@
 #
 # Dead -> stale. Evergreen (no deadline-bearing tags) -> valid if the link is
 # live (the semantic "still accurate" check is the last refinement).
-# Deadline-bearing -> fetch -> locate -> extract -> decide.
+# Deadline-bearing -> fetch -> locate -> extract -> decide, where the fetch is
+# one GET that also answers liveness (no HEAD first: the body is needed anyway).
+#
+# The page fetch is conditional on the last run's ETag / Last-Modified, and the
+# located text is hashed. A 304 or an unchanged hash skips extraction (the LLM
+# call): the stored dated_facts are decided again against today's date, which
+# is all that can change for an unchanged page. The validators live in the
+# verification jsonb (VerificationResult.page), next to the facts they vouch for.
+#
+# A rate-limited fetch raises liveness.Deferred instead of returning a result:
+# it is no evidence about the page, so batch.py leaves the stored status alone.
 
 from __future__ import annotations
 
 from datetime import date, datetime, timezone
 
+from dataclasses import dataclass
+
+import httpx
+from pydantic import ValidationError
+
 from bank.models import Resource
 from verifier.decide import decide_status
 from verifier.extract import extract_dates
-from verifier.fetch import fetch_text, locate
-from verifier.liveness import check_liveness
-from verifier.schema import VerificationResult
+from verifier.fetch import content_hash, fetch_page, locate
+from verifier.liveness import (
+    RESTRICTED_STATUS_CODES, Deferred, check_liveness, is_alive, is_rate_limited,
+)
+from verifier.schema import DatedFact, PageSnapshot, VerificationResult
 
 DEADLINE_BEARING_TAGS = {"scholarship", "financial-aid"}
 
@@ -22,20 +39,77 @@ def is_deadline_bearing(resource: Resource) -> bool:
     return bool(set(resource.tags) & DEADLINE_BEARING_TAGS)
 
 
+@dataclass(frozen=True)
+class _Prior:
+    page: PageSnapshot
+    facts: list[DatedFact]
+
+
+def _prior(resource: Resource, url: str) -> _Prior | None:
+    """The last run's page validators and facts, if they were for this URL."""
+    stored = resource.verification or {}
+    if not stored.get("page"):
+        return None
+    try:
+        page = PageSnapshot(**stored["page"])
+        facts = [DatedFact(**f) for f in stored.get("dated_facts") or []]
+    except (TypeError, ValidationError):
+        return None
+    return _Prior(page, facts) if page.url == url else None
+
+
+def _dead() -> VerificationResult:
+    return VerificationResult(
+        status="stale", reason="dead link",
+        dated_facts=[], selected_deadline=None, confidence=1.0,
+        checked_at=datetime.now(timezone.utc),
+    )
+
+
 async def verify_resource(resource: Resource) -> VerificationResult:
-    alive, final_url = await check_liveness(resource.url)
-    if not alive:
-        return VerificationResult(
-            status="stale", reason="dead link",
-            dated_facts=[], selected_deadline=None, confidence=1.0,
-            checked_at=datetime.now(timezone.utc),
-        )
     if not is_deadline_bearing(resource):
+        alive, _ = await check_liveness(resource.url)
+        if not alive:
+            return _dead()
         return VerificationResult(
             status="valid", reason="evergreen resource, link is live",
             dated_facts=[], selected_deadline=None, confidence=0.8,
             checked_at=datetime.now(timezone.utc),
         )
-    text = locate(await fetch_text(final_url))
-    extraction = await extract_dates(text, resource.name)
-    return decide_status(extraction.dated_facts, date.today())
+    if not resource.url.strip():
+        return _dead()
+    prior = _prior(resource, resource.url)
+    try:
+        if prior:
+            page = await fetch_page(resource.url, prior.page.etag, prior.page.last_modified)
+        else:
+            page = await fetch_page(resource.url)
+    except httpx.HTTPError:
+        return _dead()
+    if is_rate_limited(page.status_code, page.retry_after):
+        raise Deferred(f"rate limited (HTTP {page.status_code})")
+    if not is_alive(page.status_code):
+        return _dead()
+    if page.status_code in RESTRICTED_STATUS_CODES:
+        # Live, but what came back is a login wall, not the page.
+        return VerificationResult(
+            status="unverifiable", reason=f"link is live but restricted (HTTP {page.status_code})",
+            dated_facts=[], selected_deadline=None, confidence=0.5,
+            checked_at=datetime.now(timezone.utc),
+        )
+    if page.text is None and prior:
+        text, digest = None, prior.page.content_hash  # 304 Not Modified
+    else:
+        text = locate(page.text or "")
+        digest = content_hash(text)
+    snapshot = PageSnapshot(
+        url=resource.url, etag=page.etag, last_modified=page.last_modified, content_hash=digest
+    )
+    if prior and digest == prior.page.content_hash:
+        result = decide_status(prior.facts, date.today())
+        result.reason += " (page unchanged since last check)"
+    else:
+        extraction = await extract_dates(text, resource.name)
+        result = decide_status(extraction.dated_facts, date.today())
+    result.page = snapshot
+    return result
@@ -0,0 +1,25 @@
+-- Serving keeps an in-process snapshot of servable resource_bank rows
+-- (bank/snapshot.py). Every write announces the changed row id on the
+-- resource_bank_changed channel so each server process can re-read just that
+-- row instead of querying the table on every chat turn.
+-- Requires a session-mode connection (LISTEN does not work through a
+-- transaction pooler).
+
+create or replace function public.notify_resource_bank_change()
+returns trigger
+language plpgsql
+as $$
+begin
+  perform pg_notify(
+    'resource_bank_changed',
+    json_build_object('op', tg_op, 'id', coalesce(new.id, old.id))::text
+  );
+  return null;
+end;
+$$;
+
+drop trigger if exists trg_resource_bank_notify on public.resource_bank;
+create trigger trg_resource_bank_notify
+  after insert or update or delete on public.resource_bank
+  for each row
+  execute function public.notify_resource_bank_change();
@@ -0,0 +1,17 @@
+-- Shared chat session state for the residency follow-up flow
+-- (pending_residency / orig_query / school_code), so a follow-up turn that
+-- lands on a different server worker still finds its question.
+-- UNLOGGED: sessions are short-lived and disposable, so skip the WAL cost;
+-- the table is emptied after a crash, which only restarts a conversation.
+
+create unlogged table if not exists public.chat_sessions (
+  id          text primary key,
+  state       jsonb not null,
+  expires_at  timestamptz not null
+);
+
+create index if not exists chat_sessions_expires_at_idx on public.chat_sessions (expires_at);
+
+-- Holds raw student messages: only the backend (table owner) reads it;
+-- nothing is exposed through the public API.
+alter table public.chat_sessions enable row level security;
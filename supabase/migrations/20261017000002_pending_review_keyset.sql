@@ -0,0 +1,8 @@
+-- Keyset pagination for the admin review queue (repository.list_pending):
+-- pages walk (created_at, id) from the last row seen, so any page is an index
+-- range scan instead of a sort of the whole queue. Partial: pending_review is
+-- a small slice of the bank, and only the review queue reads it this way.
+
+create index if not exists resource_bank_pending_idx
+  on public.resource_bank (created_at, id)
+  where status = 'pending_review';